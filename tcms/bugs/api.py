@@ -4,6 +4,7 @@ from modernrpc.core import REQUEST_KEY, rpc_method
 
 from tcms.bugs.models import Bug
 from tcms.management.models import Tag
+from tcms.rpc import utils
 from tcms.rpc.decorators import permissions_required
 
 __all__ = (
@@ -73,20 +74,31 @@ def remove(query):
 
 @permissions_required("bugs.view_bug")
 @rpc_method(name="Bug.filter")
-def filter(query):  # pylint: disable=redefined-builtin
+def filter(  # pylint: disable=redefined-builtin
+    query, fields=None, limit=None, after=None
+):
     """
-    .. function:: RPC Bug.filter(query)
+    .. function:: RPC Bug.filter(query, fields, limit, after)
 
         Get list of bugs.
 
         :param query: Field lookups for :class:`tcms.bugs.models.Bug`
         :type query: dict
+        :param fields: Optional list of field names to return, defaults to all.
+                       The primary key is always returned!
+        :type fields: list(str)
+        :param limit: Optional maximum number of records to return
+        :type limit: int
+        :param after: Optional primary key of the last record from the previous
+                      page. When paginating results are ordered by primary key
+        :type after: int
         :return: List of serialized :class:`tcms.bugs.models.Bug` objects.
         :rtype: list
+        :raises ValueError: if *fields* contains unknown field names
     """
-    result = (
-        Bug.objects.filter(**query)
-        .values(
+    return utils.values_page(
+        Bug.objects.filter(**query).distinct(),
+        [
             "pk",
             "summary",
             "created_at",
@@ -98,7 +110,8 @@ def filter(query):  # pylint: disable=redefined-builtin
             "severity__name",
             "severity__color",
             "severity__icon",
-        )
-        .distinct()
+        ],
+        fields,
+        limit,
+        after,
     )
-    return list(result)
@@ -122,3 +122,18 @@ class TestFilter(APITestCase):
     def test_filter_non_existing(self):
         result = self.rpc_client.Bug.filter({"pk": -99})
         self.assertEqual(len(result), 0)
+
+    def test_filter_with_fields_and_limit(self):
+        result = self.rpc_client.Bug.filter({"status": True}, ["summary"], 1)
+        self.assertEqual(1, len(result))
+        self.assertEqual({"pk", "summary"}, set(result[0].keys()))
+        self.assertEqual(self.another_bug.pk, result[0]["pk"])
+
+        result = self.rpc_client.Bug.filter({"status": True}, [], 1, result[0]["pk"])
+        self.assertEqual(1, len(result))
+        self.assertEqual(self.yet_another_bug.pk, result[0]["pk"])
+        self.assertIn("severity__name", result[0])
+
+    def test_filter_with_unknown_fields(self):
+        with self.assertRaisesRegex(XmlRPCFault, "Unknown fields: reporter__password"):
+            self.rpc_client.Bug.filter({}, ["summary", "reporter__password"])
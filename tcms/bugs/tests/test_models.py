@@ -41,9 +41,10 @@ class TestSendMailOnNewComment(BaseCaseRun):
     @patch("tcms.core.utils.mailto.send_mail")
     def test_email_sent_when_bug_closed(self, send_mail):
         bug = BugFactory(assignee=self.assignee, reporter=self.tester)
-        self.client.post(
-            self.url, {"bug": bug.pk, "text": "", "action": "close"}, follow=True
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                self.url, {"bug": bug.pk, "text": "", "action": "close"}, follow=True
+            )
 
         expected_body = render_to_string(
             "email/post_bug_save/email.txt",
@@ -73,9 +74,10 @@ class TestSendMailOnNewComment(BaseCaseRun):
         bug = BugFactory(assignee=self.assignee, reporter=self.tester)
         bug.status = False
         bug.save()
-        self.client.post(
-            self.url, {"bug": bug.pk, "text": "", "action": "reopen"}, follow=True
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                self.url, {"bug": bug.pk, "text": "", "action": "reopen"}, follow=True
+            )
 
         expected_body = render_to_string(
             "email/post_bug_save/email.txt",
@@ -106,7 +108,8 @@ class TestSendMailOnNewComment(BaseCaseRun):
         commenter = UserFactory()
         tracker = UserFactory()
         add_comment([bug], _("*bug created*"), tracker)
-        add_comment([bug], _("*bug created*"), commenter)
+        with self.captureOnCommitCallbacks(execute=True):
+            add_comment([bug], _("*bug created*"), commenter)
 
         expected_body = render_to_string(
             "email/post_bug_save/email.txt",
@@ -0,0 +1,31 @@
+# pylint: disable=wrong-import-position
+import unittest
+
+from django.conf import settings
+
+if "tcms.bugs.apps.AppConfig" not in settings.INSTALLED_APPS:
+    raise unittest.SkipTest("tcms.bugs is disabled")
+
+from django.test import TestCase  # noqa: E402
+
+from tcms.bugs.models import Bug  # noqa: E402
+from tcms.bugs.tests.factory import BugFactory  # noqa: E402
+from tcms.core import search  # noqa: E402
+from tcms.core.models import SearchTerm  # noqa: E402
+
+
+class TestBugSearch(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.bug = BugFactory(summary="Crash on release")
+
+    def test_bugs_are_searched(self):
+        self.assertEqual(
+            [(self.bug.pk, 2)],
+            search.search(Bug.objects.all(), "release crash"),
+        )
+
+    def test_deleted_bugs_are_removed(self):
+        self.bug.delete()
+
+        self.assertFalse(SearchTerm.objects.filter(model="bugs.Bug").exists())
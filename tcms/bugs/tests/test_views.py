@@ -10,7 +10,7 @@ if "tcms.bugs.apps.AppConfig" not in settings.INSTALLED_APPS:
 from django.template.loader import render_to_string  # noqa: E402
 from django.urls import reverse  # noqa: E402
 from django.utils.translation import gettext_lazy as _  # noqa: E402
-from mock import patch  # noqa: E402
+from mock import ANY, patch  # noqa: E402
 
 from tcms.bugs.models import Bug  # noqa: E402
 from tcms.bugs.tests.factory import BugFactory  # noqa: E402
@@ -116,7 +116,8 @@ class TestNewBug(LoggedInTestCase):
     def test_create_new_bug(self, send_mail):
         initial_bug_count = Bug.objects.count()
 
-        response = self.client.post(self.url, self.post_data)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, self.post_data)
 
         bug_created = Bug.objects.last()
         self.assertRedirects(
@@ -133,7 +134,8 @@ class TestNewBug(LoggedInTestCase):
     def test_new_bug_assignee_inferred_from_components(self, send_mail):
         comp = ComponentFactory(initial_owner=UserFactory(), product=self.product)
 
-        self.client.post(self.url, self.post_data, follow=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, self.post_data, follow=True)
 
         bug = Bug.objects.last()
         self.assertEqual(bug.summary, self.summary)
@@ -156,6 +158,7 @@ class TestNewBug(LoggedInTestCase):
             settings.DEFAULT_FROM_EMAIL,
             expected_recipients,
             fail_silently=False,
+            connection=ANY,
         )
 
 
@@ -7,6 +7,7 @@ class AppConfig(DjangoAppConfig):
     name = "tcms.core"
 
     def ready(self):
-        from tcms.core import checks
+        from tcms.core import checks, search
 
         register(checks.check_installation_id)
+        search.connect_signals()
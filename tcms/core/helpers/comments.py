@@ -6,14 +6,20 @@ of objects.
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
+from django.db import connection
 from django.db.models.signals import post_save
 from django.utils import timezone
 from django_comments.models import Comment
 
+COMMENTS_BATCH_SIZE = 500
+
 
 def add_comment(objs, comments, user, submit_date=None):
     """
-    Add django.comment for an object.
+    Add the same django.comment to multiple objects. Comments are
+    created with a single ``INSERT`` statement where the database can
+    return the primary keys of bulk inserted rows. Afterwards ``post_save``
+    is sent for every object with ``called_from_add_comment=True``.
 
     :param objs: List of object to which to add comments
     :type objs: list
@@ -36,21 +42,45 @@ def add_comment(objs, comments, user, submit_date=None):
         comments = 'stupid comments by Homer'
         add_comment([testrun,], comments, testuser)
     """
-    site = Site.objects.get(pk=settings.SITE_ID)
+    # Site objects are cached by Django, ContentType objects are
+    # cached here too b/c usually all objects are of the same type
+    site = Site.objects.get_current()
+    submit_date = submit_date or timezone.now()
+    content_types = {}
+
     created = []
     for obj in objs:
-        content_type = ContentType.objects.get_for_model(model=obj.__class__)
-        comment = Comment.objects.create(
-            content_type=content_type,
-            site=site,
-            object_pk=obj.pk,
-            user=user,
-            comment=comments,
-            submit_date=submit_date or timezone.now(),
-            user_email=user.email,
-            user_name=user.username,
+        model = obj.__class__
+        if model not in content_types:
+            content_types[model] = ContentType.objects.get_for_model(model)
+
+        created.append(
+            Comment(
+                content_type=content_types[model],
+                site=site,
+                object_pk=obj.pk,
+                user=user,
+                comment=comments,
+                submit_date=submit_date,
+                user_email=user.email,
+                user_name=user.username,
+            )
         )
-        created.append(comment)
+
+    # primary keys of the new comments are required by callers
+    if connection.features.can_return_rows_from_bulk_insert:
+        Comment.objects.bulk_create(  # pylint: disable=bulk-create-used
+            created, batch_size=COMMENTS_BATCH_SIZE
+        )
+    else:
+        for comment in created:
+            comment.save()
+
+    # post_save is still sent once per object, not once per batch, b/c its
+    # receivers need the instance: a historical record is written for each
+    # object, bug notifications go to the people involved with each bug and
+    # plugins rely on called_from_add_comment for the same reason
+    for obj in objs:
         post_save.send(
             created=False,
             instance=obj,
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Functions that help resolve who should receive email notifications
+about changes to objects.
+"""
+import functools
+
+from django.contrib.auth import get_user_model
+from django.db.models import BooleanField, ExpressionWrapper, Q, Subquery
+from simple_history.models import HistoricalRecords
+
+CACHE_ATTRIBUTE = "notification_recipients_cache"
+
+
+def cached_per_request(*key_fields):
+    """
+    Cache the result of ``function(instance)`` on the request which is
+    being processed by the current thread, if any. The request is exposed
+    by simple_history.middleware.HistoryRequestMiddleware!
+
+    ``key_fields`` are attributes of ``instance`` which select recipients,
+    e.g. ``default_tester_id``. Changing them doesn't return stale results.
+    Other changes, e.g. to CCs or email settings, must call :func:`forget`
+    or :func:`clear_request_cache`. The cache is also cleared after every
+    RPC call which is part of a batch.
+    """
+
+    def decorator(function):  # pylint: disable=nested-function-found
+        key_prefix = f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(instance):  # pylint: disable=nested-function-found
+            request = getattr(HistoricalRecords.context, "request", None)
+            if request is None:
+                return function(instance)
+
+            cache = request.__dict__.setdefault(CACHE_ATTRIBUTE, {})
+            key = (
+                key_prefix,
+                instance._meta.label,
+                instance.pk,
+                tuple(getattr(instance, field) for field in key_fields),
+            )
+            if key not in cache:
+                cache[key] = function(instance)
+            # callers may modify the result
+            return list(cache[key])
+
+        return wrapper
+
+    return decorator
+
+
+def forget(instance):
+    """
+    Forget recipients cached by :func:`cached_per_request` for ``instance``
+    during the request which is being processed by the current thread.
+    """
+    request = getattr(HistoricalRecords.context, "request", None)
+    cache = getattr(request, CACHE_ATTRIBUTE, {})
+    for key in list(cache):
+        if key[1:3] == (instance._meta.label, instance.pk):
+            del cache[key]
+
+
+def clear_request_cache(request):
+    """
+    Forget recipients cached by :func:`cached_per_request` for ``request``.
+    """
+    if hasattr(request, CACHE_ATTRIBUTE):
+        delattr(request, CACHE_ATTRIBUTE)
+
+
+def notification_recipients(instance, conditions):
+    """
+    Resolve the distinct email addresses of users matching any of
+    ``conditions`` using a single query. The author of the last change
+    to ``instance`` is excluded.
+
+    :param instance: Object which has history
+    :type instance: :class:`django.db.models.Model`
+    :param conditions: Filters for the user model, usually built from
+                       ``pk=`` and ``pk__in=<sub-query>``
+    :type conditions: list of :class:`django.db.models.Q`
+    :return: List of email addresses
+    :rtype: list
+    """
+    if not conditions:
+        return []
+
+    query = Q()
+    for condition in conditions:
+        query |= condition
+
+    last_editor = instance.history.order_by("-history_date", "-history_id").values(
+        "history_user"
+    )[:1]
+
+    recipients = set()
+    last_editor_emails = set()
+    for email, is_last_editor in (
+        get_user_model()
+        .objects.filter(query)
+        .exclude(email="")
+        .annotate(
+            is_last_editor=ExpressionWrapper(
+                Q(pk=Subquery(last_editor)), output_field=BooleanField()
+            )
+        )
+        .values_list("email", "is_last_editor")
+        .distinct()
+    ):
+        recipients.add(email)
+        if is_last_editor:
+            last_editor_emails.add(email)
+
+    # don't email author of last change
+    return list(recipients - last_editor_emails)
@@ -1,12 +1,19 @@
 # pylint: disable=unused-argument, no-self-use, avoid-list-comprehension
 import difflib
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
 from django.db.models import signals
 from django.http import HttpResponseRedirect
 from django.template.defaultfilters import safe
+from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
 from simple_history.admin import SimpleHistoryAdmin
 from simple_history.models import HistoricalRecords
+from simple_history.signals import post_create_historical_record
 
 from tcms.core.templatetags.extra_filters import bleach_input
 
@@ -16,12 +23,30 @@ def diff_objects(old_instance, new_instance, fields):
     Diff two objects by examining the given fields and
     return a string.
     """
-    full_diff = []
+    return diff_values(
+        field_values(old_instance, fields), field_values(new_instance, fields)
+    )
 
+
+def field_values(instance, fields):
+    """
+    Return a dictionary of attname -> value for the given fields.
+    """
+    values = {}
     for field in fields:
+        values[field.attname] = getattr(instance, field.attname)
+    return values
+
+
+def diff_values(old_values, new_values):
+    """
+    Diff two dictionaries of field values and return a string.
+    """
+    full_diff = []
+
+    for attname, old_value in old_values.items():
         field_diff = []
-        old_value = getattr(old_instance, field.attname)
-        new_value = getattr(new_instance, field.attname)
+        new_value = new_values[attname]
 
         # clean stored XSS
         if isinstance(old_value, str):
@@ -32,8 +57,8 @@ def diff_objects(old_instance, new_instance, fields):
         for line in difflib.unified_diff(
             str(old_value).split("\n"),
             str(new_value).split("\n"),
-            fromfile=field.attname,
-            tofile=field.attname,
+            fromfile=attname,
+            tofile=attname,
             lineterm="",
         ):
             field_diff.append(line)
@@ -42,6 +67,51 @@ def diff_objects(old_instance, new_instance, fields):
     return "\n".join(full_diff)
 
 
+def write_change_reason(history_model, history_id, old_values, new_values):
+    """
+    Calculate the changelog for a historical record which has
+    already been saved. Executed in the background when
+    ``settings.HISTORY_DIFF_ASYNC`` is enabled!
+    """
+    # pylint: disable=objects-update-used
+    apps.get_model(history_model).objects.filter(pk=history_id).update(
+        history_change_reason=diff_values(old_values, new_values)
+    )
+
+
+class LocalExecutor(ThreadPoolExecutor):
+    """
+    In-process fallback for background changelog calculation.
+    Jobs are executed one after another in a single thread.
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=1, thread_name_prefix="history-diff")
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(self._close_connections_after, fn, *args, **kwargs)
+
+    @staticmethod
+    def _close_connections_after(function, *args, **kwargs):
+        try:
+            return function(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+
+@functools.lru_cache(maxsize=None)
+def diff_executor():
+    """
+    Return the executor for background changelog calculation. A dotted
+    path to a factory returning a ``concurrent.futures.Executor`` can be
+    configured via ``settings.HISTORY_DIFF_EXECUTOR``.
+    """
+    if settings.HISTORY_DIFF_EXECUTOR:
+        return import_string(settings.HISTORY_DIFF_EXECUTOR)()
+
+    return LocalExecutor()
+
+
 def history_email_for(instance, title):
     """
     Generate the subject and email body that is sent via
@@ -49,6 +119,13 @@ def history_email_for(instance, title):
     """
     history = instance.history.latest()
 
+    diff = history.history_change_reason
+    # changelog is still being calculated in the background
+    # pylint: disable=protected-access
+    pending_diff = getattr(instance._state, "history_diff", None)
+    if not diff and pending_diff:
+        diff = diff_values(*pending_diff)
+
     subject = _("UPDATE: %(model_name)s #%(pk)d - %(title)s") % {
         "model_name": instance.__class__.__name__,
         "pk": instance.pk,
@@ -68,7 +145,7 @@ For more information:
         % {
             "history_date": history.history_date.strftime("%c"),
             "username": getattr(history.history_user, "username", ""),
-            "diff": history.history_change_reason,
+            "diff": diff,
             "instance_url": instance.get_full_url(),
         }
     )
@@ -82,18 +159,76 @@ class KiwiHistoricalRecords(HistoricalRecords):
     a crude changelog until upstream introduces their new interface.
     """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._attnames_cache = {}
+
+    def _attnames(self, instance):
+        model = instance.__class__
+        if model not in self._attnames_cache:
+            attnames = []
+            for field in self.fields_included(instance):
+                attnames.append(field.attname)
+            self._attnames_cache[model] = attnames
+        return self._attnames_cache[model]
+
+    def remember_loaded_state(self, instance, **kwargs):
+        """
+        Keep a shallow copy of field values as they were loaded from the
+        database so that we don't need to query for the previous version
+        before saving! Called for every loaded object so the copy isn't
+        filtered here, see :meth:`pre_save`.
+        """
+        state = instance.__dict__.copy()
+        del state["_state"]
+        # the previous version of a saved object isn't part of its state
+        state.pop("previous", None)
+        # kept outside of instance.__dict__ which holds only field values
+        instance._state.loaded_fields = state  # pylint: disable=protected-access
+
     def pre_save(self, instance, **kwargs):
         """
         Signal handlers don't have access to the previous version of
-        an object so we have to load it from the database!
+        an object so we reconstruct it from the loaded state, falling back
+        to loading it from the database!
         """
         if kwargs.get("raw", False):
             return
 
-        if instance.pk and hasattr(instance, "history"):
+        if not instance.pk or not hasattr(instance, "history"):
+            return
+
+        # pylint: disable=protected-access
+        state = getattr(instance._state, "loaded_fields", None)
+        if instance._state.adding or state is None:
+            state = None
+        elif state.get(instance._meta.pk.attname) != instance.pk:
+            # saved while post_save signals were muted, state is stale
+            state = None
+        else:
+            for attname in self._attnames(instance):
+                # value was loaded after the object was initialized
+                if attname not in state and attname in instance.__dict__:
+                    state = None
+                    break
+
+        if state is None:
             instance.previous = instance.__class__.objects.filter(
                 pk=instance.pk
             ).first()
+            return
+
+        # a new object, not a copy of instance, so that previous versions
+        # aren't chained together and related objects aren't shared
+        field_names = []
+        values = []
+        for field in instance._meta.concrete_fields:
+            if field.attname in state:
+                field_names.append(field.attname)
+                values.append(state[field.attname])
+        instance.previous = instance.__class__.from_db(
+            instance._state.db, field_names, values
+        )
 
     def post_save(self, instance, created, using=None, **kwargs):
         """
@@ -103,22 +238,79 @@ class KiwiHistoricalRecords(HistoricalRecords):
         if kwargs.get("raw", False):
             return
 
+        # pylint: disable=protected-access
+        instance._state.history_diff = None
+
         if hasattr(instance, "previous") and instance.previous:
+            changed_fields = []
+            for field in self.fields_included(instance):
+                # deferred fields haven't been loaded and can't be changed
+                if field.attname not in instance.__dict__:
+                    continue
+
+                if getattr(instance.previous, field.attname) != getattr(
+                    instance, field.attname
+                ):
+                    changed_fields.append(field)
+
             # note: simple_history.utils.update_change_reason() performs an extra
             # DB query so it is better to use the private field instead!
             # In older simple_history version this field wasn't private but was renamed
             # in 2.10.0 hence the pylint disable!
-            instance._change_reason = diff_objects(  # pylint: disable=protected-access
-                instance.previous, instance, self.fields_included(instance)
-            )
+            if settings.HISTORY_DIFF_ASYNC:
+                # see schedule_change_reason()
+                instance._state.history_diff = (
+                    field_values(instance.previous, changed_fields),
+                    field_values(instance, changed_fields),
+                )
+                instance._change_reason = ""
+            else:
+                instance._change_reason = diff_objects(
+                    instance.previous, instance, changed_fields
+                )
         super().post_save(instance, created, using, **kwargs)
 
+        # the object is now in sync with the database
+        self.remember_loaded_state(instance)
+
+    def schedule_change_reason(self, instance, history_instance, **kwargs):
+        """
+        Calculate the changelog in the background once the historical
+        record has been committed to the database.
+        """
+        # pylint: disable=protected-access
+        pending_diff = getattr(instance._state, "history_diff", None)
+        if not pending_diff:
+            return
+
+        transaction.on_commit(
+            functools.partial(
+                diff_executor().submit,
+                write_change_reason,
+                history_instance._meta.label,
+                history_instance.pk,
+                *pending_diff,
+            ),
+            using=kwargs.get("using"),
+        )
+
     def finalize(self, sender, **kwargs):
         """
-        Connect the pre_save signal handler after calling the inherited method.
+        Connect the pre_save, post_init and post_create_historical_record
+        signal handlers after calling the inherited method.
         """
         super().finalize(sender, **kwargs)
+        # called for every model class, not only the one being tracked
+        if self.cls is not sender:
+            return
+
+        post_create_historical_record.connect(
+            self.schedule_change_reason,
+            sender=getattr(sender, self.manager_name).model,
+            weak=False,
+        )
         signals.pre_save.connect(self.pre_save, sender=sender, weak=False)
+        signals.post_init.connect(self.remember_loaded_state, sender=sender, weak=False)
 
 
 class ReadOnlyHistoryAdmin(SimpleHistoryAdmin):
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from tcms.issuetracker.base import COMMENT_QUEUE
+
+
+class Command(BaseCommand):
+    help = (
+        "Add queued test executions to defects in external bug trackers, "
+        "including previously failed ones which are due for a retry. "
+        "Can be executed periodically."
+    )
+
+    def handle(self, *args, **kwargs):
+        posted = COMMENT_QUEUE.flush()
+        self.stdout.write(f"{posted} comment(s) posted.")
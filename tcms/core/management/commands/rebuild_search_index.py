@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from tcms.core import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Index test cases, test plans, test runs and bugs for full-text search. "
+        "An interrupted rebuild is resumed, afterwards only objects changed "
+        "since the previous run are indexed. Can be executed periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            help="app_label.ModelName to index, may be repeated. Defaults to all",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of objects indexed in a single transaction",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of batches indexed in parallel",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Reindex all objects, ignoring previous progress",
+        )
+        parser.add_argument(
+            "--since",
+            help="Reindex only objects changed since this date/time",
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs["batch_size"] < 1 or kwargs["workers"] < 1:
+            raise CommandError("--batch-size and --workers must be positive")
+
+        since = None
+        if kwargs["since"]:
+            since = parse_datetime(kwargs["since"])
+            if since is None:
+                raise CommandError(f"Invalid date/time: {kwargs['since']}")
+            if settings.USE_TZ and timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        models = {}
+        for model in search.searchable_models():
+            models[model._meta.label] = model
+
+        labels = kwargs["models"] or list(models)
+        for label in labels:
+            if label not in models:
+                raise CommandError(f"{label} is not indexed for search")
+
+        for label in labels:
+            indexed = search.rebuild(
+                models[label],
+                batch_size=kwargs["batch_size"],
+                workers=kwargs["workers"],
+                full=kwargs["full"],
+                since=since,
+            )
+            self.stdout.write(f"{label}: {indexed} object(s) indexed.")
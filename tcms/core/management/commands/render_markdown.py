@@ -0,0 +1,74 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+MODELS = ("testcases.TestCase", "testplans.TestPlan", "testruns.TestRun")
+
+
+def render_in_batches(model, batch_size, everything=False):
+    """
+    Store the rendered HTML of Markdown fields for objects of ``model``,
+    ``batch_size`` objects per transaction.
+
+    :param model: Model using :class:`tcms.core.models.base.RenderedMarkdownMixin`
+    :type model: :class:`django.db.models.Model`
+    :param batch_size: Number of objects updated in a single transaction
+    :type batch_size: int
+    :param everything: Render all objects, not only those which
+                       haven't been rendered before
+    :type everything: bool
+    :return: The number of rendered objects
+    :rtype: int
+    """
+    queryset = model.objects.only("pk", *model.html_fields).order_by("pk")
+    if not everything:
+        not_rendered = Q()
+        for html_field in model.html_fields.values():
+            not_rendered |= Q(**{f"{html_field}__isnull": True})
+        queryset = queryset.filter(not_rendered)
+
+    rendered = 0
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return rendered
+
+        for instance in batch:
+            instance.render_markdown()
+
+        # bulk_update() doesn't send signals nor does it record history
+        with transaction.atomic():
+            model.objects.bulk_update(batch, list(model.html_fields.values()))
+
+        rendered += len(batch)
+        last_pk = batch[-1].pk
+
+
+class Command(BaseCommand):
+    help = (
+        "Store the rendered HTML of test case and test plan texts and test run "
+        "notes which haven't been rendered yet, e.g. after upgrading."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of objects updated in a single transaction",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            dest="everything",
+            help="Render all objects again, e.g. after changing Markdown extensions",
+        )
+
+    def handle(self, *args, **kwargs):
+        for label in MODELS:
+            rendered = render_in_batches(
+                apps.get_model(label), kwargs["batch_size"], kwargs["everything"]
+            )
+            self.stdout.write(f"{label}: {rendered} object(s) rendered.")
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from tcms.rpc.api.bug import run_pending_report_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Report issues requested via Bug.report_async which are still pending "
+        "and finish jobs which have been interrupted. Can be executed periodically."
+    )
+
+    def handle(self, *args, **kwargs):
+        reported, interrupted = run_pending_report_jobs()
+        self.stdout.write(
+            f"{reported} issue(s) reported, {interrupted} interrupted job(s) finished."
+        )
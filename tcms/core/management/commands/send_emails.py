@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from tcms.core.utils.mailto import send_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued email notifications, including previously failed ones "
+        "which are due for a retry. Can be executed periodically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of messages sent over a single connection",
+        )
+
+    def handle(self, *args, **kwargs):
+        sent = send_pending(batch_size=kwargs["batch_size"])
+        self.stdout.write(f"{sent} email(s) sent.")
@@ -27,6 +27,7 @@ migrate
 refresh_permissions
 delete_stale_attachments
 delete_stale_comments
+render_markdown
             """
         )
 
@@ -54,4 +55,7 @@ delete_stale_comments
             "delete_stale_comments", verbosity=kwargs["verbosity"], answer=answer
         )
 
+        self.stdout.write("\n5. Rendering Markdown:")
+        call_command("render_markdown", verbosity=kwargs["verbosity"])
+
         self.stdout.write("Done.")
@@ -0,0 +1,91 @@
+# Generated by Django 4.1.7 on 2026-10-17 08:53
+
+from django.db import migrations, models
+
+# must match tcms.core.search.POSTGRESQL_CONFIG
+POSTGRESQL_INDEX = (
+    "CREATE INDEX core_searchdocument_fts ON core_searchdocument "
+    "USING GIN (to_tsvector('simple'::regconfig, COALESCE(document, '')))"
+)
+MYSQL_INDEX = (
+    "CREATE FULLTEXT INDEX core_searchdocument_fts ON core_searchdocument (document)"
+)
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRESQL_INDEX)
+    elif vendor == "mysql":
+        schema_editor.execute(MYSQL_INDEX)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX core_searchdocument_fts")
+    elif vendor == "mysql":
+        schema_editor.execute(
+            "DROP INDEX core_searchdocument_fts ON core_searchdocument"
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_pendingnotification"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=100)),
+                ("object_pk", models.IntegerField()),
+                ("document", models.TextField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64)),
+                ("model", models.CharField(max_length=100)),
+                ("object_pk", models.IntegerField()),
+                ("weight", models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="searchterm",
+            index=models.Index(
+                fields=["model", "term"], name="core_search_model_c3c9b2_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="searchterm",
+            index=models.Index(
+                fields=["model", "object_pk"], name="core_search_model_6d339c_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="searchdocument",
+            unique_together={("model", "object_pk")},
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
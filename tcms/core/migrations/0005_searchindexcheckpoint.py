@@ -0,0 +1,30 @@
+# Generated by Django 4.1.7 on 2026-10-17 09:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchIndexCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=100, unique=True)),
+                ("last_pk", models.IntegerField(default=0)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("indexed_until", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -2,4 +2,11 @@
 
 from django.contrib.auth import get_user_model
 
+from tcms.core.models.outbox import OutgoingEmail, PendingNotification  # noqa: F401
+from tcms.core.models.search import (  # noqa: F401
+    SearchDocument,
+    SearchIndexCheckpoint,
+    SearchTerm,
+)
+
 get_user_model()._meta.ordering = ["username"]
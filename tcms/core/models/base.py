@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
+import logging
+
 from django.conf import settings
 from django.contrib.sites.models import Site
 
+from tcms.core.templatetags.extra_filters import markdown2html
 from tcms.core.utils import request_host_link
 
+logger = logging.getLogger(__name__)
+
 
 class UrlMixin:  # pylint: disable=too-few-public-methods
     """Mixin class for getting full URL"""
@@ -13,3 +18,41 @@ class UrlMixin:  # pylint: disable=too-few-public-methods
         host_link = request_host_link(None, site.domain)
         _absolute_url = self._get_absolute_url().strip("/")
         return f"{host_link}/{_absolute_url}/"
+
+
+class RenderedMarkdownMixin:  # pylint: disable=too-few-public-methods
+    """
+    Mixin class for models which store the rendered HTML of their Markdown
+    fields. It is updated before saving, see
+    :func:`tcms.signals.pre_save_render_markdown`.
+    """
+
+    # Markdown field -> field which stores its rendered HTML
+    html_fields = {}
+
+    def render_markdown(self, fields=None):
+        """
+        Update the HTML of Markdown ``fields``, defaults to all of them.
+        ``fields`` is usually ``update_fields`` passed to ``save()``. When it
+        contains a Markdown field but not the field which stores its HTML
+        a warning is logged and the HTML is saved separately, it would be
+        stale otherwise!
+        """
+        for field, html_field in self.html_fields.items():
+            if fields is not None and field not in fields:
+                continue
+
+            html = str(markdown2html(getattr(self, field)))
+            setattr(self, html_field, html)
+
+            if fields is not None and html_field not in fields:
+                logger.warning(
+                    "update_fields for %s contains '%s' but not '%s'",
+                    self._meta.label,  # pylint: disable=no-member
+                    field,
+                    html_field,
+                )
+                # pylint: disable=objects-update-used,no-member
+                type(self)._default_manager.filter(pk=self.pk).update(
+                    **{html_field: html}
+                )
@@ -0,0 +1,46 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutgoingEmail(models.Model):
+    """
+    Email notifications waiting to be delivered. Rows are removed
+    once the message has been sent, see :mod:`tcms.core.utils.mailto`.
+    """
+
+    subject = models.TextField()
+    body = models.TextField()
+    sender = models.CharField(max_length=255)
+    # one address per line
+    recipients = models.TextField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    send_after = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return self.subject
+
+
+class PendingNotification(models.Model):
+    """
+    Notifications buffered when ``settings.EMAIL_DIGEST_MINUTES`` is
+    enabled. They are combined into a single email per recipient and
+    recipients are resolved only once per object, see
+    :func:`tcms.core.utils.mailto.send_digests`.
+    """
+
+    # app_label.ModelName of the object which has been changed
+    model = models.CharField(max_length=100)
+    object_pk = models.IntegerField()
+    # dotted path to a function returning the list of recipients for an object
+    # or the name of a method of the object which does the same
+    recipients_getter = models.CharField(max_length=255)
+
+    subject = models.TextField()
+    body = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.subject
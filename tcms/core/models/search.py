@@ -0,0 +1,61 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of an object. Used by the database native full-text
+    search backends, see :mod:`tcms.core.search`.
+    """
+
+    # app_label.ModelName of the indexed object
+    model = models.CharField(max_length=100)
+    object_pk = models.IntegerField()
+    document = models.TextField()
+
+    class Meta:
+        unique_together = ("model", "object_pk")
+
+    def __str__(self):
+        return f"{self.model}:{self.object_pk}"
+
+
+class SearchTerm(models.Model):
+    """
+    Inverted index used when the database doesn't support full-text
+    search. There is one row for every distinct term of an object,
+    see :class:`tcms.core.search.InvertedIndexBackend`.
+    """
+
+    term = models.CharField(max_length=64)
+    # app_label.ModelName of the indexed object
+    model = models.CharField(max_length=100)
+    object_pk = models.IntegerField()
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["model", "term"]),
+            models.Index(fields=["model", "object_pk"]),
+        ]
+
+    def __str__(self):
+        return self.term
+
+
+class SearchIndexCheckpoint(models.Model):
+    """
+    Progress of ``manage.py rebuild_search_index`` for a model, used to
+    resume an interrupted rebuild and to catch up with later changes.
+    """
+
+    # app_label.ModelName of the indexed objects
+    model = models.CharField(max_length=100, unique=True)
+    # objects up to this primary key have been indexed by the current full pass
+    last_pk = models.IntegerField(default=0)
+    # when the current full pass was started
+    started_at = models.DateTimeField(null=True, blank=True)
+    # changes made before this time are in the index
+    indexed_until = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.model
@@ -0,0 +1,493 @@
+# -*- coding: utf-8 -*-
+"""
+Full-text search for test cases, test plans, test runs and bugs.
+
+The index is kept up to date when objects are saved or deleted. The backend
+is selected via ``settings.SEARCH_BACKEND``. By default PostgreSQL and
+MySQL/MariaDB use their native full-text indexes while other databases use
+an inverted index stored in :class:`tcms.core.models.SearchTerm`.
+
+Objects changed without sending signals, e.g. via bulk operations, and
+objects which existed before the index are indexed with
+``manage.py rebuild_search_index``.
+"""
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, FloatField, Subquery, Sum
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from tcms.core.models import SearchDocument, SearchIndexCheckpoint, SearchTerm
+
+# app_label.ModelName -> {field name: weight}
+SEARCHABLE_FIELDS = {
+    "testcases.TestCase": {"summary": 3, "text": 1, "notes": 1},
+    "testplans.TestPlan": {"name": 3, "text": 1},
+    "testruns.TestRun": {"summary": 3, "notes": 1},
+    "bugs.Bug": {"summary": 1},
+}
+
+BACKENDS_BY_VENDOR = {
+    "postgresql": "tcms.core.search.PostgreSQLBackend",
+    "mysql": "tcms.core.search.MySQLBackend",
+}
+
+# text search configuration used by PostgreSQL, must match the index
+# created by migration core.0004_search
+POSTGRESQL_CONFIG = "simple"
+
+TERM_RE = re.compile(r"\w+")
+TERM_MAX_LENGTH = 64
+
+
+def tokenize(text):
+    """
+    Split ``text`` into lower case terms.
+    """
+    terms = []
+    for term in TERM_RE.findall((text or "").lower()):
+        terms.append(term[:TERM_MAX_LENGTH])
+    return terms
+
+
+def searchable_models():
+    """
+    :return: The installed models which are indexed
+    :rtype: list
+    """
+    models = []
+    for label in SEARCHABLE_FIELDS:
+        try:
+            models.append(apps.get_model(label))
+        except LookupError:
+            # tcms.bugs may be disabled
+            continue
+    return models
+
+
+class SearchBackend:
+    """
+    Base class for search backends.
+    """
+
+    def index(self, instance):
+        """
+        Add ``instance`` to the index or refresh its entry.
+        """
+        self.index_many(type(instance), [instance])
+
+    def index_many(self, model, instances):
+        """
+        Add ``instances`` of ``model`` to the index or refresh their entries.
+        """
+        raise NotImplementedError()
+
+    def remove(self, model, pks):
+        """
+        Remove objects of ``model`` with primary keys ``pks`` from the index.
+        """
+        raise NotImplementedError()
+
+    def search(self, queryset, text, limit):
+        """
+        :param queryset: Objects which are eligible as results
+        :type queryset: :class:`django.db.models.QuerySet`
+        :param text: Search terms
+        :type text: str
+        :param limit: Maximum number of results
+        :type limit: int
+        :return: List of ``(pk, rank)`` ordered by relevance
+        :rtype: list(tuple)
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def fields(instance):
+        return SEARCHABLE_FIELDS[instance._meta.label]
+
+
+class DocumentBackend(SearchBackend):  # pylint: disable=abstract-method
+    """
+    Base class for backends which use a database native full-text index
+    over :class:`tcms.core.models.SearchDocument`.
+    """
+
+    def index_many(self, model, instances):
+        # keyed by primary key b/c a row can't be upserted twice by one statement
+        documents = {}
+        for instance in instances:
+            text = []
+            for field in self.fields(instance):
+                text.append(getattr(instance, field) or "")
+
+            documents[instance.pk] = SearchDocument(
+                model=model._meta.label,
+                object_pk=instance.pk,
+                document="\n".join(text),
+            )
+
+        # concurrent saves of the same object, or saves while the index is
+        # rebuilt, may insert the same document. Update it instead of failing
+        # with IntegrityError inside the post_save handler
+        unique_fields = None
+        if connection.features.supports_update_conflicts_with_target:
+            unique_fields = ["model", "object_pk"]
+
+        SearchDocument.objects.bulk_create(  # pylint: disable=bulk-create-used
+            documents.values(),
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=["document"],
+        )
+
+    def remove(self, model, pks):
+        SearchDocument.objects.filter(
+            model=model._meta.label, object_pk__in=pks
+        ).delete()
+
+    @staticmethod
+    def documents(queryset):
+        return SearchDocument.objects.filter(
+            model=queryset.model._meta.label,
+            object_pk__in=Subquery(queryset.values("pk")),
+        )
+
+
+class PostgreSQLBackend(DocumentBackend):
+    """
+    Uses a GIN index over the ``tsvector`` of documents.
+    """
+
+    def search(self, queryset, text, limit):
+        # pylint: disable=import-outside-toplevel
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector("document", config=POSTGRESQL_CONFIG)
+        query = SearchQuery(text, config=POSTGRESQL_CONFIG, search_type="websearch")
+
+        return list(
+            self.documents(queryset)
+            .annotate(vector=vector, rank=SearchRank(vector, query))
+            .filter(vector=query)
+            .order_by("-rank", "object_pk")
+            .values_list("object_pk", "rank")[:limit]
+        )
+
+
+class MySQLBackend(DocumentBackend):
+    """
+    Uses a ``FULLTEXT`` index over documents. Like the other backends
+    results must contain all of the search terms.
+    """
+
+    @staticmethod
+    def boolean_query(text):
+        """
+        :return: Query for ``MATCH ... AGAINST (... IN BOOLEAN MODE)``
+                 which requires all terms in ``text``
+        :rtype: str
+        """
+        terms = []
+        for term in tokenize(text):
+            terms.append(f"+{term}")
+        return " ".join(terms)
+
+    def search(self, queryset, text, limit):
+        query = self.boolean_query(text)
+        if not query:
+            return []
+
+        rank = RawSQL(
+            "MATCH (document) AGAINST (%s IN BOOLEAN MODE)",
+            (query,),
+            output_field=FloatField(),
+        )
+
+        return list(
+            self.documents(queryset)
+            .annotate(rank=rank)
+            .filter(rank__gt=0)
+            .order_by("-rank", "object_pk")
+            .values_list("object_pk", "rank")[:limit]
+        )
+
+
+class InvertedIndexBackend(SearchBackend):
+    """
+    Stores the terms of every object in :class:`tcms.core.models.SearchTerm`.
+    Results contain all of the search terms and are ranked by how many times
+    they appear in each object, with some fields weighted higher.
+
+    Terms are replaced by deleting and inserting them. This backend is the
+    default only for SQLite, which serializes writes, so concurrent saves
+    of the same object can't interleave.
+    """
+
+    def index_many(self, model, instances):
+        terms = []
+        pks = []
+        for instance in instances:
+            weights = Counter()
+            for field, weight in self.fields(instance).items():
+                for term in tokenize(getattr(instance, field)):
+                    weights[term] += weight
+
+            pks.append(instance.pk)
+            for term, weight in weights.items():
+                terms.append(
+                    SearchTerm(
+                        term=term,
+                        model=model._meta.label,
+                        object_pk=instance.pk,
+                        weight=weight,
+                    )
+                )
+
+        self.remove(model, pks)
+        SearchTerm.objects.bulk_create(terms)  # pylint: disable=bulk-create-used
+
+    def remove(self, model, pks):
+        SearchTerm.objects.filter(model=model._meta.label, object_pk__in=pks).delete()
+
+    def search(self, queryset, text, limit):
+        terms = set(tokenize(text))
+        if not terms:
+            return []
+
+        return list(
+            SearchTerm.objects.filter(
+                model=queryset.model._meta.label,
+                term__in=terms,
+                object_pk__in=Subquery(queryset.values("pk")),
+            )
+            .values("object_pk")
+            .annotate(matched=Count("term"), rank=Sum("weight"))
+            .filter(matched=len(terms))
+            .order_by("-rank", "object_pk")
+            .values_list("object_pk", "rank")[:limit]
+        )
+
+
+def get_backend():
+    backend = settings.SEARCH_BACKEND or BACKENDS_BY_VENDOR.get(
+        connection.vendor, "tcms.core.search.InvertedIndexBackend"
+    )
+    return import_string(backend)()
+
+
+def search(queryset, text, limit=20):
+    """
+    Full-text search among ``queryset``.
+
+    :return: List of ``(pk, rank)`` ordered by relevance
+    :rtype: list(tuple)
+    """
+    return get_backend().search(queryset, text, limit)
+
+
+def changed_since(model, since):
+    """
+    Primary keys of ``model`` objects which have been created, updated or
+    deleted since ``since`` according to their history. For models without
+    history only objects created since then are returned!
+    """
+    if hasattr(model, "history"):
+        return (
+            model.history.filter(history_date__gte=since)
+            .order_by("id")
+            .values_list("id", flat=True)
+            .distinct()
+        )
+
+    return (
+        model.objects.filter(created_at__gte=since)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def _batches(pks, batch_size):
+    batch = []
+    for pk in pks:
+        batch.append(pk)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _index_batch(model, pks):
+    """
+    Refresh the index entries of objects with primary keys ``pks``.
+    Entries of objects which don't exist anymore are removed.
+    """
+    backend = get_backend()
+    fields = SEARCHABLE_FIELDS[model._meta.label]
+
+    with transaction.atomic():
+        instances = list(model.objects.filter(pk__in=pks).only("pk", *fields))
+
+        deleted = set(pks)
+        for instance in instances:
+            deleted.discard(instance.pk)
+        if deleted:
+            backend.remove(model, deleted)
+
+        backend.index_many(model, instances)
+
+    return len(instances)
+
+
+def _index_batch_in_thread(model, pks):
+    try:
+        return _index_batch(model, pks)
+    finally:
+        close_old_connections()
+
+
+def _index_round(model, batches, executor):
+    if executor is None:
+        indexed = _index_batch(model, batches[0])
+    else:
+        indexed = sum(executor.map(_index_batch_in_thread, repeat(model), batches))
+
+    return indexed, batches[-1][-1]
+
+
+def _index_rounds(model, pks, batch_size, workers):
+    """
+    Index objects with primary keys ``pks`` in batches of ``batch_size``,
+    up to ``workers`` batches in parallel. Yields the number of indexed
+    objects and the last primary key after each round of batches.
+    """
+    executor = None
+    if workers > 1:
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="search-index"
+        )
+
+    try:
+        batches = []
+        for batch in _batches(pks, batch_size):
+            batches.append(batch)
+            if len(batches) == workers:
+                yield _index_round(model, batches, executor)
+                batches = []
+
+        if batches:
+            yield _index_round(model, batches, executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def rebuild(model, batch_size=500, workers=1, full=False, since=None):
+    """
+    Reindex objects of ``model`` in small transactions so that tables
+    aren't locked for long. Progress is recorded in
+    :class:`tcms.core.models.SearchIndexCheckpoint`:
+
+    - the first run indexes all objects ordered by primary key. An
+      interrupted run is resumed after the last indexed batch;
+    - once all objects have been indexed following runs only reindex
+      objects changed since the previous run, see :func:`changed_since`.
+
+    :param model: One of the models in ``SEARCHABLE_FIELDS``
+    :type model: :class:`django.db.models.Model`
+    :param batch_size: Number of objects indexed in a single transaction
+    :type batch_size: int
+    :param workers: Number of batches indexed in parallel
+    :type workers: int
+    :param full: Reindex all objects, ignoring previous progress
+    :type full: bool
+    :param since: Reindex only objects changed since this time
+    :type since: datetime
+    :return: The number of indexed objects
+    :rtype: int
+    """
+    # SQLite allows a single writer at a time
+    if connection.vendor == "sqlite":
+        workers = 1
+
+    checkpoint, _ = SearchIndexCheckpoint.objects.get_or_create(model=model._meta.label)
+    run_started_at = timezone.now()
+    indexed = 0
+
+    if full:
+        checkpoint.last_pk = 0
+        checkpoint.started_at = None
+    elif since is None and not checkpoint.last_pk:
+        since = checkpoint.indexed_until
+
+    if since is not None:
+        for count, _last_pk in _index_rounds(
+            model,
+            changed_since(model, since).iterator(chunk_size=batch_size),
+            batch_size,
+            workers,
+        ):
+            indexed += count
+
+        if checkpoint.indexed_until is None or since <= checkpoint.indexed_until:
+            checkpoint.indexed_until = run_started_at
+            checkpoint.save()
+        return indexed
+
+    if checkpoint.started_at is None:
+        checkpoint.started_at = run_started_at
+    checkpoint.save()
+
+    pks = (
+        model.objects.filter(pk__gt=checkpoint.last_pk)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+        .iterator(chunk_size=batch_size)
+    )
+    for count, last_pk in _index_rounds(model, pks, batch_size, workers):
+        indexed += count
+        checkpoint.last_pk = last_pk
+        checkpoint.save()
+
+    # changes made during the full pass are caught up with by the next run
+    checkpoint.indexed_until = checkpoint.started_at
+    checkpoint.last_pk = 0
+    checkpoint.started_at = None
+    checkpoint.save()
+
+    return indexed
+
+
+def handle_post_save(  # pylint: disable=unused-argument
+    sender, instance, raw=False, **_kwargs
+):
+    # objects loaded from fixtures are indexed by rebuilding the index,
+    # comments are not indexed so adding them doesn't change anything
+    if raw or _kwargs.get("called_from_add_comment"):
+        return
+    get_backend().index(instance)
+
+
+def handle_post_delete(sender, instance, **_kwargs):
+    get_backend().remove(sender, [instance.pk])
+
+
+def connect_signals():
+    for model in searchable_models():
+        post_save.connect(
+            handle_post_save, sender=model, dispatch_uid=f"search:{model._meta.label}"
+        )
+        post_delete.connect(
+            handle_post_delete,
+            sender=model,
+            dispatch_uid=f"search:{model._meta.label}",
+        )
@@ -2,15 +2,101 @@
     Custom template tag filters.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+
 import bleach
 import markdown
 from bleach_allowlist import markdown_attrs, markdown_tags, print_attrs, print_tags
 from django import template
+from django.conf import settings
 from django.contrib.messages import constants as messages
+from django.core.cache import cache
 from django.utils.safestring import mark_safe
 
 register = template.Library()
 
+# change when the output of markdown2html() changes to ignore cached HTML
+MARKDOWN_CACHE_VERSION = 1
+
+MARKDOWN_EXTENSIONS = [
+    "markdown.extensions.codehilite",
+    "markdown.extensions.fenced_code",
+    "markdown.extensions.nl2br",
+    "markdown.extensions.sane_lists",
+    "markdown.extensions.tables",
+    "tcms.utils.markdown",
+]
+
+
+class RenderedMarkdownCache:
+    """
+    Sanitized HTML keyed by the hash of its Markdown source. Up to
+    ``settings.MARKDOWN_CACHE_SIZE`` recently used items are kept in
+    memory in front of the Django cache, where items are stored for
+    ``settings.MARKDOWN_CACHE_TIMEOUT`` seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recent = OrderedDict()
+
+    @staticmethod
+    def key(md_str):
+        digest = hashlib.sha256(md_str.encode()).hexdigest()
+        return f"markdown2html:{MARKDOWN_CACHE_VERSION}:{digest}"
+
+    def _remember(self, key, html):
+        with self._lock:
+            self._recent[key] = html
+            self._recent.move_to_end(key)
+            while len(self._recent) > settings.MARKDOWN_CACHE_SIZE:
+                self._recent.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._recent:
+                self._recent.move_to_end(key)
+                return self._recent[key]
+
+        html = cache.get(key)
+        if html is not None:
+            self._remember(key, html)
+        return html
+
+    def set(self, key, html):
+        cache.set(key, html, settings.MARKDOWN_CACHE_TIMEOUT)
+        self._remember(key, html)
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+
+    def __contains__(self, key):
+        return key in self._recent
+
+    def __len__(self):
+        return len(self._recent)
+
+
+MARKDOWN_CACHE = RenderedMarkdownCache()
+
+_thread_data = threading.local()
+
+
+def _markdown():
+    """
+    Markdown instances are expensive to create and are not thread-safe.
+    Reuse one per thread, reset before each conversion.
+    """
+    renderer = getattr(_thread_data, "markdown", None)
+    if renderer is None:
+        renderer = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        _thread_data.markdown = renderer
+
+    return renderer.reset()
+
 
 @register.filter(name="is_list")
 def is_list(variable):
@@ -28,24 +114,32 @@ def bleach_input(input_html):
 @register.filter(name="markdown2html")
 def markdown2html(md_str):
     """
-    Returns markdown string as HTML.
+    Returns markdown string as HTML. The result is cached,
+    see :class:`RenderedMarkdownCache`.
     """
     if md_str is None:
         md_str = ""
 
-    rendered_md = markdown.markdown(
-        md_str,
-        extensions=[
-            "markdown.extensions.codehilite",
-            "markdown.extensions.fenced_code",
-            "markdown.extensions.nl2br",
-            "markdown.extensions.sane_lists",
-            "markdown.extensions.tables",
-            "tcms.utils.markdown",
-        ],
-    )
+    key = MARKDOWN_CACHE.key(md_str)
+    html = MARKDOWN_CACHE.get(key)
+    if html is None:
+        html = bleach_input(_markdown().convert(md_str))
+        MARKDOWN_CACHE.set(key, html)
+
+    return mark_safe(html)  # nosec:B703:B308:blacklist
+
+
+@register.filter(name="rendered")
+def rendered(instance, field):
+    """
+    Returns the stored HTML of a Markdown field, see
+    :class:`tcms.core.models.base.RenderedMarkdownMixin`.
+    Objects which haven't been rendered yet are rendered now.
+    """
+    html = getattr(instance, instance.html_fields[field])
+    if html is None:
+        return markdown2html(getattr(instance, field))
 
-    html = bleach_input(rendered_md)
     return mark_safe(html)  # nosec:B703:B308:blacklist
 
 
@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import RequestFactory, TestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
 from django_comments.models import Comment
+from simple_history.models import HistoricalRecords
 
 from tcms.core.helpers.comments import add_comment
 from tcms.tests import BasePlanCase
-from tcms.tests.factories import UserFactory
+from tcms.tests.factories import TestExecutionFactory, TestRunFactory, UserFactory
 
 
 class TestAddComments(BasePlanCase):
@@ -33,3 +37,102 @@ class TestAddComments(BasePlanCase):
             self.assertEqual(self.reviewer.email, comment.user_email)
             self.assertTrue(comment.is_public)
             self.assertFalse(comment.is_removed)
+
+    @skipUnlessDBFeature("can_return_rows_from_bulk_insert")
+    def test_comments_are_created_in_bulk(self):
+        executions = []
+        for _i in range(10):
+            executions.append(TestExecutionFactory())
+        # warm up the Site and ContentType caches
+        add_comment(executions[:1], "warm up", self.reviewer)
+
+        with CaptureQueriesContext(connection) as context:
+            created = add_comment(executions, "same failure", self.reviewer)
+
+        insert = f"INSERT INTO {connection.ops.quote_name(Comment._meta.db_table)}"
+        inserts = []
+        for query in context.captured_queries:
+            if query["sql"].startswith(insert):
+                inserts.append(query)
+        self.assertEqual(1, len(inserts))
+
+        self.assertEqual(10, len(created))
+        for comment, execution in zip(created, executions):
+            self.assertIsNotNone(comment.pk)
+            self.assertEqual(execution.pk, comment.object_pk)
+
+
+class TestNotificationRecipients(TestCase):
+    """Test recipients.notification_recipients via TestRun.get_notify_addrs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_run = TestRunFactory()
+        cls.cc_user = UserFactory()
+        cls.test_run.add_cc(cls.cc_user)
+
+        cls.assignees = []
+        for _i in range(5):
+            execution = TestExecutionFactory(run=cls.test_run)
+            cls.assignees.append(execution.assignee.email)
+        # the same person assigned multiple times
+        TestExecutionFactory(run=cls.test_run, assignee=cls.test_run.manager)
+        TestExecutionFactory(run=cls.test_run, assignee=None)
+
+    def test_resolved_with_a_single_query(self):
+        with self.assertNumQueries(1):
+            recipients = self.test_run.get_notify_addrs()
+
+        self.assertEqual(
+            sorted(recipients),
+            sorted(
+                [
+                    self.test_run.manager.email,
+                    self.test_run.default_tester.email,
+                    self.cc_user.email,
+                ]
+                + self.assignees
+            ),
+        )
+
+    def test_author_of_last_change_is_excluded(self):
+        self.test_run.summary = "Updated by the manager"
+        # pylint: disable=protected-access
+        self.test_run._history_user = self.test_run.manager
+        self.test_run.save()
+
+        recipients = self.test_run.get_notify_addrs()
+
+        self.assertNotIn(self.test_run.manager.email, recipients)
+        self.assertIn(self.test_run.default_tester.email, recipients)
+
+    def test_cached_per_request(self):
+        HistoricalRecords.context.request = RequestFactory().get("/")
+        try:
+            with self.assertNumQueries(1):
+                first = self.test_run.get_notify_addrs()
+                second = self.test_run.get_notify_addrs()
+        finally:
+            del HistoricalRecords.context.request
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    def test_cache_is_invalidated_by_changes(self):
+        new_cc = UserFactory()
+        new_tester = UserFactory()
+
+        HistoricalRecords.context.request = RequestFactory().get("/")
+        try:
+            self.assertNotIn(new_cc.email, self.test_run.get_notify_addrs())
+
+            self.test_run.add_cc(new_cc)
+            self.assertIn(new_cc.email, self.test_run.get_notify_addrs())
+
+            self.test_run.remove_cc(new_cc)
+            self.assertNotIn(new_cc.email, self.test_run.get_notify_addrs())
+
+            self.test_run.default_tester = new_tester
+            self.assertIn(new_tester.email, self.test_run.get_notify_addrs())
+        finally:
+            del HistoricalRecords.context.request
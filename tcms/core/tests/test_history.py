@@ -1,7 +1,16 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=invalid-name, no-member
 
+from concurrent.futures import Executor, Future
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from tcms.core.history import LocalExecutor, diff_executor, history_email_for
+from tcms.testcases.models import TestCase
 from tcms.tests import BasePlanCase
+from tcms.tests.factories import TestCaseFactory
 
 
 class RemoveUserWhenThereIsHistory(BasePlanCase):
@@ -21,3 +30,101 @@ class RemoveUserWhenThereIsHistory(BasePlanCase):
         # when users are removed this is supposed to be set to None
         for history_record in self.case.history.all():
             self.assertIsNone(history_record.history_user)
+
+
+class TestHistoryUsesLoadedState(BasePlanCase):
+    def test_previous_version_is_not_queried(self):
+        case = TestCase.objects.get(pk=self.case.pk)
+        original_summary = case.summary
+        case.summary = "changed without loading the previous version"
+
+        with CaptureQueriesContext(connection) as context:
+            case.save()
+
+        for query in context.captured_queries:
+            self.assertFalse(
+                query["sql"].startswith('SELECT "testcases_testcase"."id"')
+            )
+
+        self.assertEqual(case.previous.summary, original_summary)
+        self.assertEqual(
+            case.history.latest().history_change_reason,
+            f"--- summary\n+++ summary\n@@ -1 +1 @@\n-{original_summary}\n+"
+            "changed without loading the previous version",
+        )
+
+    def test_consecutive_saves(self):
+        self.case.summary = "first"
+        self.case.save()
+        self.case.summary = "second"
+        self.case.save()
+
+        self.assertEqual(self.case.previous.summary, "first")
+        self.assertIn(
+            "-first\n+second", self.case.history.latest().history_change_reason
+        )
+        # previous versions aren't chained together
+        self.assertFalse(hasattr(self.case.previous, "previous"))
+        self.assertNotIn(
+            "previous",
+            self.case._state.loaded_fields,  # pylint: disable=protected-access
+        )
+
+    def test_deferred_fields_fall_back_to_database(self):
+        case = TestCase.objects.only("pk", "summary").get(pk=self.case.pk)
+        case.notes = "loaded after init"
+        case.save()
+
+        self.assertEqual(case.previous.notes, self.case.notes)
+        self.assertIn("+loaded after init", case.history.latest().history_change_reason)
+
+    def test_stale_state_falls_back_to_database(self):
+        # TestCaseFactory mutes post_save so the loaded state is from before
+        # the object was created
+        case = TestCaseFactory(summary="created without signals")
+        case.summary = "edited"
+        case.save()
+
+        self.assertEqual(case.previous.pk, case.pk)
+        self.assertEqual(
+            case.history.latest().history_change_reason,
+            "--- summary\n+++ summary\n@@ -1 +1 @@\n-created without signals\n+edited",
+        )
+
+
+class ImmediateExecutor(Executor):
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+@override_settings(
+    HISTORY_DIFF_ASYNC=True,
+    HISTORY_DIFF_EXECUTOR="tcms.core.tests.test_history.ImmediateExecutor",
+)
+class TestAsynchronousHistoryDiff(BasePlanCase):
+    def setUp(self):
+        super().setUp()
+        diff_executor.cache_clear()
+        self.addCleanup(diff_executor.cache_clear)
+
+    def test_change_reason_is_written_after_commit(self):
+        self.case.text = "line 1\nline 2"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.save()
+            self.assertEqual(self.case.history.latest().history_change_reason, "")
+
+            # emails sent before the background job has finished see the diff
+            _subject, body = history_email_for(self.case, self.case.summary)
+            self.assertIn("+line 1\n+line 2", body)
+
+        self.assertIn(
+            "+line 1\n+line 2", self.case.history.latest().history_change_reason
+        )
+
+    def test_local_executor_is_the_default(self):
+        with override_settings(HISTORY_DIFF_EXECUTOR=None):
+            diff_executor.cache_clear()
+            self.assertIsInstance(diff_executor(), LocalExecutor)
@@ -1,7 +1,18 @@
 # -*- coding: utf-8 -*-
+import threading
 import unittest
+from io import StringIO
+from unittest.mock import patch
 
-from tcms.core.templatetags.extra_filters import markdown2html
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from tcms.core.templatetags import extra_filters
+from tcms.core.templatetags.extra_filters import MARKDOWN_CACHE, markdown2html, rendered
+from tcms.testcases.models import TestCase as TestCaseModel
+from tcms.testruns.models import TestRun
+from tcms.tests.factories import TestCaseFactory, TestPlanFactory, TestRunFactory
 
 
 class TestMarkdownExtraFilters(unittest.TestCase):
@@ -108,3 +119,121 @@ def hello():
             """<p><em>hello</em> &lt;object&gt;&lt;link&gt;&lt;iframe&gt;<br>
 &lt;frame&gt;&lt;frameset&gt;&lt;embed&gt;</p>""",
         )
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "kiwitcms",
+            "TIMEOUT": 3600,
+        }
+    },
+    MARKDOWN_CACHE_SIZE=2,
+)
+class TestMarkdownCache(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        MARKDOWN_CACHE.clear()
+
+    def test_rendered_html_is_reused(self):
+        html = markdown2html("__cached__")
+
+        with patch.object(extra_filters, "_markdown") as renderer:
+            self.assertEqual(markdown2html("__cached__"), html)
+            # after a restart or from another process
+            MARKDOWN_CACHE.clear()
+            self.assertEqual(markdown2html("__cached__"), html)
+
+        renderer.assert_not_called()
+
+    def test_recently_used_items_are_kept_in_memory(self):
+        markdown2html("first")
+        markdown2html("second")
+        markdown2html("first")
+        markdown2html("third")
+
+        self.assertEqual(len(MARKDOWN_CACHE), 2)
+        self.assertIn(MARKDOWN_CACHE.key("first"), MARKDOWN_CACHE)
+        self.assertNotIn(MARKDOWN_CACHE.key("second"), MARKDOWN_CACHE)
+
+    def test_markdown_instance_is_reused_per_thread(self):
+        # pylint: disable=protected-access
+        renderer = extra_filters._markdown()
+        self.assertIs(renderer, extra_filters._markdown())
+
+        other_thread = []
+        thread = threading.Thread(
+            target=lambda: other_thread.append(extra_filters._markdown())
+        )
+        thread.start()
+        thread.join()
+        self.assertIsNot(renderer, other_thread[0])
+
+    def test_state_is_reset_between_conversions(self):
+        self.assertEqual(markdown2html("~~gone~~"), "<p><s>gone</s></p>")
+        self.assertEqual(markdown2html("plain"), "<p>plain</p>")
+
+
+class TestRenderedMarkdown(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_case = TestCaseFactory(text="__bold__")
+        cls.test_plan = TestPlanFactory(text="*plan*")
+        cls.test_run = TestRunFactory(notes="~~gone~~")
+
+    def test_html_is_stored_on_save(self):
+        self.assertEqual(self.test_case.text_html, "<p><strong>bold</strong></p>")
+        self.assertEqual(self.test_plan.text_html, "<p><em>plan</em></p>")
+        self.assertEqual(self.test_run.notes_html, "<p><s>gone</s></p>")
+
+        self.test_case.text = "changed"
+        self.test_case.save()
+        self.test_case.refresh_from_db()
+        self.assertEqual(self.test_case.text_html, "<p>changed</p>")
+
+        # not part of history
+        self.assertFalse(hasattr(self.test_case.history.first(), "text_html"))
+
+    def test_update_fields(self):
+        self.test_case.text = "changed"
+        self.test_case.save(update_fields=["text", "text_html"])
+        self.test_case.refresh_from_db()
+        self.assertEqual(self.test_case.text_html, "<p>changed</p>")
+
+        # the rendered HTML is saved separately
+        self.test_case.text = "changed again"
+        with self.assertLogs("tcms.core.models.base", level="WARNING") as logs:
+            self.test_case.save(update_fields=["text"])
+        self.assertIn("contains 'text' but not 'text_html'", logs.output[0])
+        self.test_case.refresh_from_db()
+        self.assertEqual(self.test_case.text_html, "<p>changed again</p>")
+
+    def test_rendered_filter(self):
+        self.assertEqual(
+            rendered(self.test_case, "text"), "<p><strong>bold</strong></p>"
+        )
+
+        # not rendered yet
+        self.test_case.text_html = None
+        with patch.object(extra_filters, "markdown2html") as render:
+            rendered(self.test_case, "text")
+        render.assert_called_once_with("__bold__")
+
+    def test_render_markdown_command(self):
+        # pylint: disable=objects-update-used
+        TestCaseModel.objects.update(text_html=None)
+        TestRun.objects.update(notes_html="stale")
+
+        out = StringIO()
+        call_command("render_markdown", "--batch-size", "1", stdout=out)
+
+        self.assertIn("testcases.TestCase: 1 object(s) rendered.", out.getvalue())
+        self.assertIn("testruns.TestRun: 0 object(s) rendered.", out.getvalue())
+        self.test_case.refresh_from_db()
+        self.assertEqual(self.test_case.text_html, "<p><strong>bold</strong></p>")
+
+        call_command("render_markdown", "--all", stdout=out)
+        self.test_run.refresh_from_db()
+        self.assertEqual(self.test_run.notes_html, "<p><s>gone</s></p>")
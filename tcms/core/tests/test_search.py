@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from tcms.core import search
+from tcms.core.models import SearchDocument, SearchIndexCheckpoint, SearchTerm
+from tcms.testcases.models import TestCase as TestCaseModel
+from tcms.testplans.models import TestPlan
+from tcms.tests.factories import TestCaseFactory, TestPlanFactory
+
+
+class TestTokenize(SimpleTestCase):
+    def test_words_are_lower_case(self):
+        self.assertEqual(
+            ["login", "fails", "with_sso", "2fa"],
+            search.tokenize("Login fails (with_SSO, 2FA)!"),
+        )
+
+    def test_empty_text(self):
+        self.assertEqual([], search.tokenize(None))
+
+
+class TestGetBackend(SimpleTestCase):
+    def test_fallback_for_sqlite(self):
+        self.assertIsInstance(search.get_backend(), search.InvertedIndexBackend)
+
+    @override_settings(SEARCH_BACKEND="tcms.core.search.PostgreSQLBackend")
+    def test_backend_from_settings(self):
+        self.assertIsInstance(search.get_backend(), search.PostgreSQLBackend)
+
+
+class TestMySQLBackend(SimpleTestCase):
+    def test_all_terms_are_required(self):
+        self.assertEqual(
+            "+login +fails +2fa",
+            search.MySQLBackend.boolean_query("Login fails (+2FA)"),
+        )
+
+    def test_no_terms(self):
+        self.assertEqual([], search.MySQLBackend().search(None, "+-*", 20))
+
+
+class TestDocumentBackend(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.plan = TestPlanFactory(name="Release plan", text="Release the release")
+
+    def test_existing_document_is_updated(self):
+        # e.g. inserted by a concurrent save of the same object
+        SearchDocument.objects.create(
+            model="testplans.TestPlan", object_pk=self.plan.pk, document="stale"
+        )
+
+        search.DocumentBackend().index_many(TestPlan, [self.plan, self.plan])
+
+        self.assertEqual(
+            ["Release plan\nRelease the release"],
+            list(
+                SearchDocument.objects.filter(
+                    model="testplans.TestPlan", object_pk=self.plan.pk
+                ).values_list("document", flat=True)
+            ),
+        )
+
+
+class TestInvertedIndexBackend(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.plan = TestPlanFactory(name="Release plan", text="Release the release")
+        # TestCaseFactory mutes post_save so index explicitly
+        cls.case = TestCaseFactory(summary="Crash on release")
+        cls.case.save()
+
+    def test_terms_are_weighted(self):
+        self.assertEqual(
+            {"release": 5, "plan": 3, "the": 1},
+            dict(
+                SearchTerm.objects.filter(
+                    model="testplans.TestPlan", object_pk=self.plan.pk
+                ).values_list("term", "weight")
+            ),
+        )
+
+    def test_models_are_searched_separately(self):
+        self.assertEqual(
+            [(self.plan.pk, 5)],
+            search.search(TestPlan.objects.all(), "release"),
+        )
+        self.assertEqual(
+            [(self.case.pk, 6)],
+            search.search(TestCaseModel.objects.all(), "release crash"),
+        )
+
+    def test_deleted_objects_are_removed(self):
+        self.plan.delete()
+
+        self.assertFalse(SearchTerm.objects.filter(model="testplans.TestPlan").exists())
+
+
+class TestRebuildSearchIndex(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # TestCaseFactory mutes post_save so these are not indexed
+        cls.cases = []
+        for summary in ("First login", "Second login", "Third login"):
+            cls.cases.append(TestCaseFactory(summary=summary))
+
+    @staticmethod
+    def rebuild(*args):
+        out = StringIO()
+        call_command(
+            "rebuild_search_index",
+            "--model",
+            "testcases.TestCase",
+            "--batch-size",
+            "2",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    @staticmethod
+    def found(text):
+        pks = []
+        for pk, _rank in search.search(TestCaseModel.objects.all(), text):
+            pks.append(pk)
+        return pks
+
+    def test_all_objects_are_indexed(self):
+        self.assertEqual([], self.found("login"))
+
+        self.assertIn("testcases.TestCase: 3 object(s) indexed.", self.rebuild())
+
+        self.assertEqual(3, len(self.found("login")))
+        checkpoint = SearchIndexCheckpoint.objects.get(model="testcases.TestCase")
+        self.assertEqual(0, checkpoint.last_pk)
+        self.assertIsNotNone(checkpoint.indexed_until)
+
+    def test_interrupted_rebuild_is_resumed(self):
+        SearchIndexCheckpoint.objects.create(
+            model="testcases.TestCase",
+            last_pk=self.cases[0].pk,
+            started_at=timezone.now(),
+        )
+
+        self.assertIn("2 object(s) indexed", self.rebuild())
+        self.assertEqual([self.cases[1].pk, self.cases[2].pk], self.found("login"))
+
+    def test_changes_are_caught_up_with(self):
+        self.rebuild()
+
+        # changes which haven't been indexed
+        with patch("tcms.core.search.get_backend"):
+            self.cases[0].summary = "First logout"
+            self.cases[0].save()
+            self.cases[1].delete()
+
+        # the deleted test case is removed from the index
+        self.assertIn("1 object(s) indexed", self.rebuild())
+        self.assertEqual([self.cases[2].pk], self.found("login"))
+        self.assertEqual([self.cases[0].pk], self.found("logout"))
+
+        self.assertIn("0 object(s) indexed", self.rebuild())
+        self.assertIn("2 object(s) indexed", self.rebuild("--full"))
+
+    def test_since(self):
+        self.assertIn("0 object(s) indexed", self.rebuild("--since", "2100-01-01"))
+
+    def test_invalid_arguments(self):
+        with self.assertRaisesRegex(CommandError, "Invalid date/time"):
+            self.rebuild("--since", "yesterday")
+
+        with self.assertRaisesRegex(CommandError, "is not indexed"):
+            call_command("rebuild_search_index", "--model", "testruns.TestExecution")
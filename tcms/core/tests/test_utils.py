@@ -1,14 +1,20 @@
-import unittest
-from unittest.mock import patch
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import ANY, patch
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core import mail
+from django.core.management import call_command
 from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
+from django.utils import timezone
 
-from tcms.core.utils.mailto import mailto
+from tcms.core.models import OutgoingEmail, PendingNotification
+from tcms.core.utils.mailto import mailto, send_digests, send_pending
+from tcms.tests.factories import TestCaseFactory
 
 
-class TestMailTo(unittest.TestCase):
+class TestMailTo(TestCase):
     def setUp(self):
         self.expected_subject = "Test Subject"
         self.expected_body = "Body text"
@@ -16,68 +22,66 @@ class TestMailTo(unittest.TestCase):
         self.expected_recipients = None
 
     @property
-    def expected_kwargs(self):
-        return {
-            "target": send_mail,
-            "args": (
-                settings.EMAIL_SUBJECT_PREFIX + self.expected_subject,
-                self.expected_body,
-                self.expected_sender,
-                self.expected_recipients,
-            ),
-            "kwargs": {"fail_silently": False},
-            "daemon": True,
-        }
+    def expected_args(self):
+        return (
+            settings.EMAIL_SUBJECT_PREFIX + self.expected_subject,
+            self.expected_body,
+            self.expected_sender,
+            self.expected_recipients,
+        )
+
+    def mailto(self, **kwargs):
+        with patch("tcms.core.utils.mailto.send_mail") as mock:
+            with self.captureOnCommitCallbacks(execute=True):
+                mailto(**kwargs)
+                # queued until the transaction is committed
+                self.assertFalse(mock.called)
 
-    @patch("threading.Thread")
-    def test_string_recipient(self, mock):
+        mock.assert_called_once_with(
+            *self.expected_args, fail_silently=False, connection=ANY
+        )
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    def test_string_recipient(self):
         self.expected_recipients = ["example@example.com"]
-        mailto(
+        self.mailto(
             template_name=None,
             subject="Test Subject",
             recipients="example@example.com",
             context="Body text",
         )
-        mock.assert_called_once_with(**self.expected_kwargs)
 
-    @patch("threading.Thread")
-    def test_duplicate_recipients(self, mock):
+    def test_duplicate_recipients(self):
         self.expected_recipients = ["example@example.com"]
-        mailto(
+        self.mailto(
             template_name=None,
             subject="Test Subject",
             recipients=["example@example.com", "example@example.com"],
             context="Body text",
         )
-        mock.assert_called_once_with(**self.expected_kwargs)
 
-    @patch("threading.Thread")
-    def test_cc_email(self, mock):
+    def test_cc_email(self):
         self.expected_recipients = ["example@example.com", "cc@example.com"]
-        mailto(
+        self.mailto(
             template_name=None,
             subject="Test Subject",
             recipients="example@example.com",
             context="Body text",
             cc=["cc@example.com"],
         )
-        mock.assert_called_once_with(**self.expected_kwargs)
 
     @patch("django.conf.settings.DEBUG", True)
     @patch("django.conf.settings.ADMINS", [("Admin", "admin@example.com")])
-    @patch("threading.Thread")
-    def test_admin_email_on_debug(self, mock):
+    def test_admin_email_on_debug(self):
         self.expected_recipients = ["example@example.com", "admin@example.com"]
-        mailto(
+        self.mailto(
             template_name=None,
             subject="Test Subject",
             recipients="example@example.com",
             context="Body text",
         )
-        mock.assert_called_once_with(**self.expected_kwargs)
 
-    @patch("threading.Thread")
-    def test_template(self, mock):
+    def test_template(self):
         template_name = "email/user_registered/notify_admins.txt"
         context = {
             "username": "username",
@@ -85,10 +89,152 @@ class TestMailTo(unittest.TestCase):
         }
         self.expected_body = render_to_string(template_name, context)
         self.expected_recipients = ["example@example.com"]
-        mailto(
+        self.mailto(
             template_name=template_name,
             subject="Test Subject",
             recipients=["example@example.com"],
             context=context,
         )
-        mock.assert_called_once_with(**self.expected_kwargs)
+
+
+class TestSendPending(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.due_while_sending = []
+
+    @staticmethod
+    def queue_emails(count):
+        for index in range(count):
+            OutgoingEmail.objects.create(
+                subject=f"Subject {index}",
+                body="Body text",
+                sender="kiwi@example.com",
+                recipients="first@example.com\nsecond@example.com",
+            )
+
+    def test_batch_reuses_single_connection(self):
+        self.queue_emails(5)
+
+        with patch(
+            "tcms.core.utils.mailto.get_connection", wraps=mail.get_connection
+        ) as get_connection:
+            self.assertEqual(send_pending(batch_size=3), 5)
+
+        # 2 batches
+        self.assertEqual(get_connection.call_count, 2)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(mail.outbox[0].to, ["first@example.com", "second@example.com"])
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    @patch("tcms.core.utils.mailto.send_mail", side_effect=OSError("Unreachable"))
+    def test_failed_messages_are_retried_later(self, _send_mail):
+        self.queue_emails(1)
+
+        self.assertEqual(send_pending(), 0)
+
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.last_error, "Unreachable")
+        self.assertGreater(email.send_after, email.created_at)
+
+        # not due for a retry yet
+        self.assertEqual(send_pending(), 0)
+        self.assertEqual(OutgoingEmail.objects.get().attempts, 1)
+
+    def record_due_emails(self, *_args, **_kwargs):
+        self.due_while_sending.append(
+            OutgoingEmail.objects.filter(send_after__lte=timezone.now()).count()
+        )
+
+    def test_messages_being_delivered_are_not_due(self):
+        self.queue_emails(1)
+
+        with patch(
+            "tcms.core.utils.mailto.send_mail", side_effect=self.record_due_emails
+        ):
+            self.assertEqual(send_pending(), 1)
+
+        # other workers skip the message while it is being delivered
+        self.assertEqual(self.due_while_sending, [0])
+
+    def test_send_emails_command(self):
+        self.queue_emails(2)
+
+        out = StringIO()
+        call_command("send_emails", stdout=out)
+
+        self.assertIn("2 email(s) sent", out.getvalue())
+        self.assertEqual(len(mail.outbox), 2)
+
+
+@override_settings(EMAIL_DIGEST_MINUTES=15)
+class TestSendDigests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = TestCaseFactory(summary="First")
+        cls.second = TestCaseFactory(
+            summary="Second",
+            author=cls.first.author,
+            default_tester=cls.first.default_tester,
+        )
+
+        for case in (cls.first, cls.second):
+            case.emailing.notify_on_case_update = True
+            case.emailing.auto_to_case_author = True
+            case.emailing.save()
+
+    def update_cases(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for case in (self.first, self.second):
+                case.summary = f"Updated {case.summary}"
+                case.save()
+
+    def test_notifications_are_buffered(self):
+        self.update_cases()
+
+        self.assertEqual(PendingNotification.objects.count(), 2)
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+        # digest window hasn't passed yet
+        self.assertEqual(send_digests(), 0)
+        self.assertEqual(PendingNotification.objects.count(), 2)
+
+    def test_single_email_per_recipient(self):
+        self.update_cases()
+        PendingNotification.objects.update(  # pylint: disable=objects-update-used
+            created_at=timezone.now() - timedelta(minutes=20)
+        )
+
+        # author & default tester
+        self.assertEqual(send_pending(), 2)
+
+        recipients = []
+        for email in mail.outbox:
+            recipients.extend(email.to)
+            self.assertIn("2 updates", email.subject)
+            self.assertIn("Updated First", email.body)
+            self.assertIn("Updated Second", email.body)
+        self.assertEqual(
+            sorted(recipients),
+            sorted([self.first.author.email, self.first.default_tester.email]),
+        )
+        self.assertFalse(PendingNotification.objects.exists())
+
+    def test_force(self):
+        self.update_cases()
+
+        self.assertEqual(send_digests(force=True), 2)
+        self.assertEqual(OutgoingEmail.objects.count(), 2)
+        self.assertFalse(PendingNotification.objects.exists())
+
+    def test_deleted_objects_are_skipped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.summary = "Updated First"
+            self.first.save()
+        PendingNotification.objects.update(  # pylint: disable=objects-update-used
+            object_pk=-1
+        )
+
+        self.assertEqual(send_digests(force=True), 0)
+        self.assertFalse(OutgoingEmail.objects.exists())
+        self.assertFalse(PendingNotification.objects.exists())
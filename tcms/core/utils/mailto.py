@@ -1,11 +1,26 @@
 # -*- coding: utf-8 -*-
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 
+from django.apps import apps
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import get_connection, send_mail
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
 from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
 from django.utils.translation import override
 
+from tcms.core.models import OutgoingEmail, PendingNotification
+
+DIGEST_SEPARATOR = "\n\n" + "-" * 70 + "\n\n"
+
+# messages which are being delivered aren't due again for this long
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
 
 @override(settings.LANGUAGE_CODE)
 def mailto(  # pylint: disable=invalid-name
@@ -28,7 +43,7 @@ def mailto(  # pylint: disable=invalid-name
 
     # if debugging then send to ADMINS as well
     if settings.DEBUG:
-        for _, admin_email in settings.ADMINS:
+        for _name, admin_email in settings.ADMINS:
             recipients.append(admin_email)
 
     # this is a workaround to allow passing body text directly
@@ -37,11 +52,268 @@ def mailto(  # pylint: disable=invalid-name
     else:
         body = context
 
-    sender = settings.DEFAULT_FROM_EMAIL
-    email_thread = threading.Thread(
-        target=send_mail,
-        args=(settings.EMAIL_SUBJECT_PREFIX + subject, body, sender, recipients),
-        kwargs={"fail_silently": False},
-        daemon=True,
+    OutgoingEmail.objects.create(
+        subject=settings.EMAIL_SUBJECT_PREFIX + subject,
+        body=body,
+        sender=settings.DEFAULT_FROM_EMAIL,
+        recipients="\n".join(filter(None, recipients)),
+    )
+    # don't send notifications about changes which are rolled back
+    transaction.on_commit(DELIVERY.schedule)
+
+
+@override(settings.LANGUAGE_CODE)
+def mail_digest(instance, recipients_getter, template_name, subject, context=None):
+    """
+    Buffer a notification about ``instance`` which will be sent as part
+    of a digest. ``recipients_getter`` is the dotted path to a function
+    which receives ``instance`` and returns a list of email addresses or
+    the name of such a method of ``instance``. It is called once per
+    object when the digest is sent!
+    """
+    # this is a workaround to allow passing body text directly
+    if template_name:
+        body = render_to_string(template_name, context)
+    else:
+        body = context
+
+    PendingNotification.objects.create(
+        model=instance._meta.label,
+        object_pk=instance.pk,
+        recipients_getter=recipients_getter,
+        subject=subject,
+        body=body,
+    )
+    transaction.on_commit(DELIVERY.schedule_digest)
+
+
+def _digest_recipients(notification):
+    instance = (
+        apps.get_model(notification.model)
+        .objects.filter(pk=notification.object_pk)
+        .first()
     )
-    email_thread.start()
+    # object has been deleted in the meantime
+    if instance is None:
+        return set()
+
+    if "." in notification.recipients_getter:
+        recipients = import_string(notification.recipients_getter)(instance)
+    else:
+        recipients = getattr(instance, notification.recipients_getter)()
+
+    return set(filter(None, recipients))
+
+
+@override(settings.LANGUAGE_CODE)
+def send_digests(force=False):
+    """
+    Combine buffered notifications into a single email per recipient
+    once the oldest of them is ``settings.EMAIL_DIGEST_MINUTES`` old.
+    The emails are queued into the outbox.
+
+    :param force: Don't wait for the digest window to pass
+    :type force: bool
+    :return: The number of queued emails
+    :rtype: int
+    """
+    with transaction.atomic():
+        notifications = PendingNotification.objects.order_by("pk")
+        if connection.features.has_select_for_update_skip_locked:
+            notifications = notifications.select_for_update(skip_locked=True)
+        notifications = list(notifications)
+
+        if not notifications:
+            return 0
+
+        window_start = timezone.now() - timedelta(minutes=settings.EMAIL_DIGEST_MINUTES)
+        if not force and notifications[0].created_at > window_start:
+            return 0
+
+        recipients_for = {}
+        digests = {}
+        notification_pks = []
+        for notification in notifications:
+            notification_pks.append(notification.pk)
+            key = (notification.model, notification.object_pk)
+            if key not in recipients_for:
+                recipients_for[key] = _digest_recipients(notification)
+
+            for recipient in recipients_for[key]:
+                digests.setdefault(recipient, []).append(notification)
+
+        for recipient, pending in sorted(digests.items()):
+            if len(pending) == 1:
+                subject = pending[0].subject
+            else:
+                subject = _("%(count)d updates") % {"count": len(pending)}
+
+            body = []
+            for notification in pending:
+                body.append(f"{notification.subject}\n\n{notification.body}")
+
+            OutgoingEmail.objects.create(
+                subject=settings.EMAIL_SUBJECT_PREFIX + subject,
+                body=DIGEST_SEPARATOR.join(body),
+                sender=settings.DEFAULT_FROM_EMAIL,
+                recipients=recipient,
+            )
+
+        PendingNotification.objects.filter(pk__in=notification_pks).delete()
+
+    return len(digests)
+
+
+def send_pending(batch_size=100):
+    """
+    Deliver queued emails, reusing a single connection to the
+    mail server for each batch. Failed messages are retried with
+    an exponential back-off until ``settings.EMAIL_OUTBOX_MAX_ATTEMPTS``.
+    Digests which are due are queued before that.
+
+    :return: The number of sent messages
+    :rtype: int
+    """
+    send_digests()
+    sent = 0
+
+    while True:
+        emails = _claim(batch_size)
+        if not emails:
+            return sent
+
+        # outside of a transaction, a slow mail server doesn't hold DB locks
+        sent += _deliver(emails)
+
+
+def _claim(batch_size):
+    """
+    Count a delivery attempt for up to ``batch_size`` messages which are due
+    and postpone them by ``CLAIM_TIMEOUT`` so that concurrent workers skip
+    them. Messages which are neither sent nor failed by then, e.g. because
+    the worker crashed, are due again!
+    """
+    with transaction.atomic():
+        emails = OutgoingEmail.objects.filter(
+            send_after__lte=timezone.now(),
+            attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        ).order_by("pk")
+
+        # concurrent workers don't deliver the same messages
+        if connection.features.has_select_for_update_skip_locked:
+            emails = emails.select_for_update(skip_locked=True)
+
+        emails = list(emails[:batch_size])
+        pks = []
+        for email in emails:
+            email.attempts += 1
+            pks.append(email.pk)
+
+        # pylint: disable=objects-update-used
+        OutgoingEmail.objects.filter(pk__in=pks).update(
+            attempts=F("attempts") + 1, send_after=timezone.now() + CLAIM_TIMEOUT
+        )
+
+    return emails
+
+
+def _deliver(emails):
+    sent = []
+
+    mail_connection = get_connection(fail_silently=False)
+    try:
+        mail_connection.open()
+    except Exception as err:  # pylint: disable=broad-except
+        for email in emails:
+            _delivery_failed(email, err)
+        return 0
+
+    try:
+        for email in emails:
+            try:
+                send_mail(
+                    email.subject,
+                    email.body,
+                    email.sender,
+                    email.recipients.split("\n"),
+                    fail_silently=False,
+                    connection=mail_connection,
+                )
+                sent.append(email.pk)
+            except Exception as err:  # pylint: disable=broad-except
+                _delivery_failed(email, err)
+    finally:
+        mail_connection.close()
+
+    OutgoingEmail.objects.filter(pk__in=sent).delete()
+    return len(sent)
+
+
+def _delivery_failed(email, error):
+    email.last_error = str(error)
+    email.send_after = timezone.now() + timedelta(minutes=2**email.attempts)
+    email.save()
+
+
+class DeliveryWorker:
+    """
+    Drain the outbox using a pool of ``settings.EMAIL_OUTBOX_WORKERS``
+    background threads. At most one drain is waiting to be started so
+    bulk operations don't pile up work. When the setting is 0 messages
+    are delivered synchronously instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiting = False
+        self._executor = None
+        self._digest_timer = None
+
+    def schedule_digest(self):
+        """
+        Drain the outbox once the digest window has passed. When
+        ``settings.EMAIL_OUTBOX_WORKERS`` is 0 digests are sent by the
+        next drain or ``manage.py send_emails`` instead.
+        """
+        if not settings.EMAIL_OUTBOX_WORKERS:
+            return
+
+        with self._lock:
+            if self._digest_timer and self._digest_timer.is_alive():
+                return
+
+            self._digest_timer = threading.Timer(
+                settings.EMAIL_DIGEST_MINUTES * 60, self.schedule
+            )
+            self._digest_timer.daemon = True
+            self._digest_timer.start()
+
+    def schedule(self):
+        if not settings.EMAIL_OUTBOX_WORKERS:
+            send_pending()
+            return
+
+        with self._lock:
+            if self._waiting:
+                return
+            self._waiting = True
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.EMAIL_OUTBOX_WORKERS,
+                    thread_name_prefix="outbox",
+                )
+
+        self._executor.submit(self._drain)
+
+    def _drain(self):
+        with self._lock:
+            self._waiting = False
+
+        try:
+            send_pending()
+        finally:
+            close_old_connections()
+
+
+DELIVERY = DeliveryWorker()
@@ -1,11 +1,66 @@
 # coding: utf-8
 import html
+import itertools
+import logging
 from datetime import timedelta
 
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from modernrpc.handlers import JSONRPCHandler, XMLRPCHandler
 
+from tcms.core.helpers import recipients
+
+# results with more rows are written to the client in chunks of this size
+STREAM_CHUNK_SIZE = 100
+
+logger = logging.getLogger(__name__)
+
+
+class AtomicBatchMixin:
+    """
+    Execute all calls from a batch, e.g. a JSON-RPC batch or XML-RPC
+    ``system.multicall``, inside one DB transaction. Every call runs inside
+    its own savepoint so that a failing call doesn't affect the rest of
+    the batch! Single calls are executed as usual.
+    """
+
+    in_batch = False
+
+    def is_batch_request(self):  # pylint: disable=no-self-use
+        return False
+
+    def execute_batch(self, function, *args):
+        self.in_batch = True
+        try:
+            with transaction.atomic():
+                return function(*args)
+        finally:
+            self.in_batch = False
+
+    def process_request(self):
+        if self.is_batch_request():
+            return self.execute_batch(super().process_request)
+        return super().process_request()
+
+    def execute_procedure(self, name, args=None, kwargs=None):
+        if name == "system.multicall" and not self.in_batch:
+            return self.execute_batch(super().execute_procedure, name, args, kwargs)
+
+        if not self.in_batch:
+            return super().execute_procedure(name, args, kwargs)
+
+        try:
+            with transaction.atomic():
+                return super().execute_procedure(name, args, kwargs)
+        finally:
+            # the next call in the batch may see different recipients
+            recipients.clear_request_cache(self.request)
+
+
+class KiwiTCMSJsonRpcHandler(AtomicBatchMixin, JSONRPCHandler):
+    def is_batch_request(self):
+        return self.request.body.lstrip()[:1] == b"["
 
-class KiwiTCMSJsonRpcHandler(JSONRPCHandler):
     @staticmethod
     def escape_dict(result_dict):
         for key, value in result_dict.items():
@@ -44,8 +99,63 @@ class KiwiTCMSJsonRpcHandler(JSONRPCHandler):
 
         return result
 
+    def stream_result(self, rows):
+        """
+        Serialize the response payload row by row so that the entire
+        result is never kept in memory as a single string.
+        """
+        request_id = self.dumps(self.request_id)
+        chunk = [f'{{"id": {request_id}, "jsonrpc": "2.0", "result": [']
+
+        for index, row in enumerate(rows):
+            data = self.dumps(row)
+            chunk.append(f", {data}" if index else data)
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield "".join(chunk)
+                chunk = []
+
+        chunk.append("]}")
+        yield "".join(chunk)
+
+    @staticmethod
+    def stream_remaining(chunks):
+        """
+        The status line and the beginning of the payload have been sent
+        already when serializing the remaining rows fails. A response can't
+        contain both ``result`` and ``error`` so the payload is left truncated.
+        Clients must treat a response which isn't valid JSON as an error!
+        """
+        try:
+            yield from chunks
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Streaming JSON-RPC result failed")
+
+    def result_success(self, data):
+        """
+        Results which are lists longer than ``STREAM_CHUNK_SIZE``, e.g. rows
+        returned by ``*.filter()`` methods, are serialized and sent to the client
+        in chunks instead of in one go!
+
+        The first chunk is serialized before the response is returned so that
+        errors there are reported as a regular JSON-RPC error.
+        """
+        if (
+            self.request_id is None
+            or not isinstance(data, list)
+            or len(data) <= STREAM_CHUNK_SIZE
+        ):
+            return super().result_success(data)
+
+        chunks = self.stream_result(data)
+        first_chunk = next(chunks)
+
+        return self.json_http_response(
+            itertools.chain([first_chunk], self.stream_remaining(chunks)),
+            http_response_cls=StreamingHttpResponse,
+        )
+
 
-class KiwiTCMSXmlRpcHandler(XMLRPCHandler):
+class KiwiTCMSXmlRpcHandler(AtomicBatchMixin, XMLRPCHandler):
     @staticmethod
     def escape_dict(result_dict):
         for key, value in result_dict.items():
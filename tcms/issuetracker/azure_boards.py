@@ -131,9 +131,9 @@ class AzureBoards(IssueTrackerType):
 
             return (None, url + "_workitems/create/Issue")
 
-    def post_comment(self, execution, bug_id):
+    def post_comment_text(self, bug_id, text):
         # NOTE: Posting comment is in preview state in API v6.0.
-        comment_body = {"text": markdown2html(self.text(execution))}
+        comment_body = {"text": markdown2html(text)}
         self.rpc.add_comment(bug_id, comment_body)
 
     def details(self, url):
@@ -1,11 +1,307 @@
+import logging
 import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
 from importlib import import_module
 
+from django.apps import apps
 from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
 from opengraph.opengraph import OpenGraph
 
 RE_ENDS_IN_INT = re.compile(r"[\d]+$")
 
+logger = logging.getLogger(__name__)
+
+# comments which are being posted aren't due again for this long
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+class ConnectionCache:
+    """
+    Thread-safe LRU cache for connections to external systems. At most
+    ``settings.EXTERNAL_ISSUE_RPC_CACHE_SIZE`` connections are kept and
+    each one expires after ``settings.EXTERNAL_ISSUE_RPC_CACHE_TTL`` seconds.
+    Connections are re-created when the configuration of the
+    ``BugSystem`` they were made for changes!
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (configuration, created_at, connection)
+        self._connections = OrderedDict()
+
+    @staticmethod
+    def _configuration(bug_system):
+        return (
+            bug_system.tracker_type,
+            bug_system.base_url,
+            bug_system.api_url,
+            bug_system.api_username,
+            bug_system.api_password,
+        )
+
+    def get(self, bug_system, connect):
+        """
+        Return the cached connection for ``bug_system`` or
+        create a new one by calling ``connect()``.
+        """
+        key = bug_system.pk or bug_system.base_url
+        configuration = self._configuration(bug_system)
+
+        with self._lock:
+            if key in self._connections:
+                cached_configuration, created_at, connection = self._connections[key]
+                if (
+                    cached_configuration == configuration
+                    and time.monotonic() - created_at
+                    < settings.EXTERNAL_ISSUE_RPC_CACHE_TTL
+                ):
+                    self._connections.move_to_end(key)
+                    return connection
+
+                del self._connections[key]
+
+        # connecting may be slow, don't block other threads
+        connection = connect()
+
+        with self._lock:
+            self._connections[key] = (configuration, time.monotonic(), connection)
+            self._connections.move_to_end(key)
+            while len(self._connections) > settings.EXTERNAL_ISSUE_RPC_CACHE_SIZE:
+                self._connections.popitem(last=False)
+
+        return connection
+
+    def clear(self):
+        with self._lock:
+            self._connections.clear()
+
+    def __len__(self):
+        return len(self._connections)
+
+
+class CircuitBreaker:
+    """
+    Stop contacting a bug tracker after
+    ``settings.EXTERNAL_ISSUE_CIRCUIT_BREAKER_THRESHOLD`` consecutive failures.
+    A single trial request is allowed every
+    ``settings.EXTERNAL_ISSUE_CIRCUIT_BREAKER_COOLDOWN`` seconds until
+    the bug tracker responds again!
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+
+    def allow(self, key):
+        with self._lock:
+            opened_at = self._opened_at.get(key)
+            if opened_at is None:
+                return True
+
+            if (
+                time.monotonic() - opened_at
+                >= settings.EXTERNAL_ISSUE_CIRCUIT_BREAKER_COOLDOWN
+            ):
+                # let a single request through
+                self._opened_at[key] = time.monotonic()
+                return True
+
+            return False
+
+    def success(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+            self._opened_at.pop(key, None)
+
+    def failure(self, key):
+        with self._lock:
+            self._failures[key] = self._failures.get(key, 0) + 1
+            if self._failures[key] >= settings.EXTERNAL_ISSUE_CIRCUIT_BREAKER_THRESHOLD:
+                self._opened_at[key] = time.monotonic()
+
+
+class HostLimiter:  # pylint: disable=too-few-public-methods
+    """
+    Allow no more than ``settings.EXTERNAL_ISSUE_DETAILS_PER_HOST``
+    concurrent requests to the same host, no matter how many threads
+    are making them!
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(
+                    settings.EXTERNAL_ISSUE_DETAILS_PER_HOST
+                )
+            return self._semaphores[host]
+
+
+class CommentQueue:
+    """
+    Collect test executions which are linked to the same defect during
+    ``settings.EXTERNAL_ISSUE_COMMENT_DELAY`` seconds and add them to the
+    issue tracker at once in a background thread. This results in a single
+    comment per defect. When the setting is 0 executions are added
+    immediately instead!
+
+    Pending executions are stored in the database so they aren't lost when
+    the process is restarted. Failed comments are retried with an exponential
+    back-off until ``settings.EXTERNAL_ISSUE_COMMENT_MAX_ATTEMPTS``, also
+    see ``manage.py post_issue_comments``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def add(self, tracker, execution, issue_url):
+        if not settings.EXTERNAL_ISSUE_COMMENT_DELAY:
+            tracker.add_testexecution_to_issue([execution], issue_url)
+            return
+
+        apps.get_model("testruns", "PendingIssueComment").objects.create(
+            execution=execution,
+            bug_system=tracker.bug_system,
+            issue_url=issue_url,
+        )
+        # the background thread can't see uncommitted executions
+        transaction.on_commit(self.schedule)
+
+    def schedule(self):
+        with self._lock:
+            if self._timer is not None:
+                return
+
+            self._timer = threading.Timer(
+                settings.EXTERNAL_ISSUE_COMMENT_DELAY, self._flush_in_background
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_in_background(self):
+        with self._lock:
+            self._timer = None
+
+        try:
+            self.flush()
+        finally:
+            close_old_connections()
+
+    def flush(self):
+        """
+        Add pending executions which are due to the issue tracker,
+        a single comment per defect.
+
+        :return: The number of posted comments
+        :rtype: int
+        """
+        pending = self._claim()
+        if not pending:
+            return 0
+
+        executions = (
+            apps.get_model("testruns", "TestExecution")
+            .objects.filter(pk__in=set(item.execution_id for item in pending))
+            .select_related("run", "case")
+            .in_bulk()
+        )
+        bug_systems = (
+            apps.get_model("testcases", "BugSystem")
+            .objects.filter(pk__in=set(item.bug_system_id for item in pending))
+            .in_bulk()
+        )
+
+        by_issue = OrderedDict()
+        for item in pending:
+            item.execution = executions[item.execution_id]
+            item.bug_system = bug_systems[item.bug_system_id]
+            by_issue.setdefault((item.bug_system_id, item.issue_url), []).append(item)
+
+        # outside of a transaction, a slow issue tracker doesn't hold DB locks
+        posted = 0
+        for (_bug_system, issue_url), items in by_issue.items():
+            if self._post(items, issue_url):
+                posted += 1
+
+        return posted
+
+    @staticmethod
+    def _claim():
+        """
+        Count an attempt for the pending comments which are due and postpone
+        them by ``CLAIM_TIMEOUT`` so that concurrent workers skip them.
+        Comments which are neither posted nor failed by then, e.g. because
+        the worker crashed, are due again!
+        """
+        pending_model = apps.get_model("testruns", "PendingIssueComment")
+
+        with transaction.atomic():
+            pending = pending_model.objects.filter(
+                send_after__lte=timezone.now(),
+                attempts__lt=settings.EXTERNAL_ISSUE_COMMENT_MAX_ATTEMPTS,
+            ).order_by("pk")
+
+            # concurrent workers don't post the same comments
+            if transaction.get_connection().features.has_select_for_update_skip_locked:
+                pending = pending.select_for_update(skip_locked=True)
+
+            pending = list(pending)
+            pks = []
+            for item in pending:
+                item.attempts += 1
+                pks.append(item.pk)
+
+            # pylint: disable=objects-update-used
+            pending_model.objects.filter(pk__in=pks).update(
+                attempts=F("attempts") + 1, send_after=timezone.now() + CLAIM_TIMEOUT
+            )
+
+        return pending
+
+    @staticmethod
+    def _post(items, issue_url):
+        bug_system = items[0].bug_system
+        executions = OrderedDict()
+        for item in items:
+            executions[item.execution_id] = item.execution
+
+        # one failing issue tracker doesn't prevent updating the rest
+        try:
+            tracker = import_string(bug_system.tracker_type)(bug_system, None)
+            tracker.add_testexecution_to_issue(list(executions.values()), issue_url)
+        except Exception as err:  # pylint: disable=broad-except
+            logger.exception(
+                "Adding test executions to %s via %s failed",
+                issue_url,
+                bug_system.name,
+            )
+            for item in items:
+                item.last_error = str(err)
+                item.send_after = timezone.now() + timedelta(minutes=2**item.attempts)
+                item.save(update_fields=["last_error", "send_after"])
+            return False
+
+        pks = []
+        for item in items:
+            pks.append(item.pk)
+        type(items[0]).objects.filter(pk__in=pks).delete()
+        return True
+
+
+COMMENT_QUEUE = CommentQueue()
+
 
 class IssueTrackerType:
     """
@@ -14,7 +310,7 @@ class IssueTrackerType:
     supports!
     """
 
-    rpc_cache = {}
+    rpc_cache = ConnectionCache()
 
     def __init__(self, bug_system, request):
         """
@@ -153,10 +449,26 @@ class IssueTrackerType:
         Usually this is implemented by adding a new comment pointing
         back to the TR/TE via the internal RPC object.
 
+        A single comment is posted for multiple executions if the
+        integration implements :meth:`post_comment_text`. Integrations
+        which override :meth:`post_comment`, including subclasses of the
+        built-in ones, are still called once per execution!
+
         :executions: - iterable of TestExecution objects
         :issue_url: - the URL of the existing defect
         """
         bug_id = self.bug_id_from_url(issue_url)
+        executions = list(executions)
+
+        if len(executions) > 1 and (
+            type(self).post_comment is IssueTrackerType.post_comment
+        ):
+            try:
+                self.post_comment_text(bug_id, self.text_many(executions))
+                return
+            except NotImplementedError:
+                pass
+
         for execution in executions:
             self.post_comment(execution, bug_id)
 
@@ -171,6 +483,28 @@ TR-{execution.run.pk}: {execution.run.summary}
 {execution.run.get_full_url()}
 TE-{execution.pk}: {execution.case.summary}"""
 
+    @classmethod
+    def text_many(cls, executions):
+        """
+        Returns the text of a single comment about
+        multiple executions, grouped by test run!
+        """
+        if len(executions) == 1:
+            return cls.text(executions[0])
+
+        runs = OrderedDict()
+        for execution in executions:
+            runs.setdefault(execution.run, []).append(execution)
+
+        lines = [f"---- Confirmed via {len(executions)} test executions ----"]
+        for run, run_executions in runs.items():
+            lines.append(f"TR-{run.pk}: {run.summary}")
+            lines.append(run.get_full_url())
+            for execution in run_executions:
+                lines.append(f"TE-{execution.pk}: {execution.case.summary}")
+
+        return "\n".join(lines)
+
     def post_comment(self, execution, bug_id):
         """
         :param execution: TestExecution object
@@ -178,6 +512,17 @@ TE-{execution.pk}: {execution.case.summary}"""
         :param bug_id: Unique defect identifier in the system. Usually an int.
         :type bug_id: int or str
         """
+        self.post_comment_text(bug_id, self.text(execution))
+
+    def post_comment_text(self, bug_id, text):
+        """
+        Post ``text`` as a new comment to the existing defect.
+
+        :param bug_id: Unique defect identifier in the system. Usually an int.
+        :type bug_id: int or str
+        :param text: The comment
+        :type text: str
+        """
         raise NotImplementedError()
 
     def is_adding_testcase_to_issue_disabled(self):  # pylint: disable=invalid-name
@@ -214,7 +559,4 @@ TE-{execution.pk}: {execution.case.summary}"""
         if self.is_adding_testcase_to_issue_disabled():
             return None
 
-        if self.bug_system.base_url not in self.rpc_cache:
-            self.rpc_cache[self.bug_system.base_url] = self._rpc_connection()
-
-        return self.rpc_cache[self.bug_system.base_url]
+        return self.rpc_cache.get(self.bug_system, self._rpc_connection)
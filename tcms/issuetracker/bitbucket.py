@@ -141,8 +141,8 @@ class BitBucket(IssueTrackerType):
 
             return (None, url + "issues/new")
 
-    def post_comment(self, execution, bug_id):
-        comment_body = {"content": {"raw": self.text(execution).replace("\n", "\n\n")}}
+    def post_comment_text(self, bug_id, text):
+        comment_body = {"content": {"raw": text.replace("\n", "\n\n")}}
         self.rpc.add_comment(bug_id, comment_body)
 
     def details(self, url):
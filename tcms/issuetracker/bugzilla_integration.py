@@ -101,7 +101,7 @@ class Bugzilla(base.IssueTrackerType):
 
         return (None, url + "enter_bug.cgi?" + urlencode(args, True))
 
-    def post_comment(self, execution, bug_id):
+    def post_comment_text(self, bug_id, text):
         self.rpc.update_bugs(
-            bug_id, {"comment": {"comment": self.text(execution), "is_private": False}}
+            bug_id, {"comment": {"comment": text, "is_private": False}}
         )
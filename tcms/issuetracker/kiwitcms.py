@@ -3,7 +3,7 @@
 # Licensed under the GPL 2.0: https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
 
 """
-    This module implements integration with Kiwi TCMS own bug tracking system!
+This module implements integration with Kiwi TCMS own bug tracking system!
 """
 
 from django.template.loader import render_to_string
@@ -11,6 +11,7 @@ from django.template.loader import render_to_string
 from tcms.bugs.models import Bug
 from tcms.bugs.views import New
 from tcms.core.contrib.linkreference.models import LinkReference
+from tcms.core.helpers.comments import add_comment
 from tcms.issuetracker.base import IssueTrackerType
 
 
@@ -49,6 +50,18 @@ class KiwiTCMS(IssueTrackerType):
 
         return result
 
+    def add_testexecution_to_issue(self, executions, issue_url):
+        """
+        Directly 'link' BUG and TE objects via their m2m
+        relationship.
+        """
+        try:
+            bug = Bug.objects.get(pk=self.bug_id_from_url(issue_url))
+        except Bug.DoesNotExist:
+            return
+
+        bug.executions.add(*executions)
+
     def post_comment(self, execution, bug_id):
         """
         Directly 'link' BUG and TE objects via their m2m
@@ -61,6 +74,22 @@ class KiwiTCMS(IssueTrackerType):
 
         bug.executions.add(execution)
 
+    def post_comment_text(self, bug_id, text):
+        """
+        Add ``text`` as a comment to the BUG object on behalf of
+        the current user or the reporter of the bug.
+        """
+        try:
+            bug = Bug.objects.get(pk=bug_id)
+        except Bug.DoesNotExist:
+            return
+
+        user = getattr(self.request, "user", None)
+        if user is None or not user.is_authenticated:
+            user = bug.reporter
+
+        add_comment([bug], text, user)
+
     def _report_issue(self, execution, user):
         """
         Create the new bug using internal API instead of
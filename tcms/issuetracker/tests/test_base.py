@@ -0,0 +1,323 @@
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from tcms.issuetracker.base import (
+    CircuitBreaker,
+    CommentQueue,
+    ConnectionCache,
+    HostLimiter,
+    IssueTrackerType,
+)
+from tcms.testcases.models import BugSystem
+from tcms.testruns.models import PendingIssueComment
+from tcms.tests.factories import TestExecutionFactory, TestRunFactory
+
+
+@override_settings(EXTERNAL_ISSUE_RPC_CACHE_SIZE=2, EXTERNAL_ISSUE_RPC_CACHE_TTL=60)
+class TestConnectionCache(SimpleTestCase):
+    def setUp(self):
+        self.cache = ConnectionCache()
+        self.connect = MagicMock(side_effect=object)
+
+    @staticmethod
+    def bug_system(pk, **kwargs):
+        return BugSystem(
+            pk=pk,
+            name=f"Tracker {pk}",
+            tracker_type="tcms.issuetracker.types.JIRA",
+            base_url=f"https://tracker-{pk}.example.com",
+            api_username="kiwi",
+            api_password="secret",  # nosec:B106:hardcoded_password_funcarg
+            **kwargs,
+        )
+
+    def test_connection_is_reused(self):
+        first = self.cache.get(self.bug_system(1), self.connect)
+        second = self.cache.get(self.bug_system(1), self.connect)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.connect.call_count, 1)
+
+    def test_credential_changes_create_new_connection(self):
+        first = self.cache.get(self.bug_system(1), self.connect)
+        second = self.cache.get(
+            self.bug_system(1, api_url="https://api.example.com"), self.connect
+        )
+
+        self.assertIsNot(first, second)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_expired_connections_are_recreated(self):
+        with patch("tcms.issuetracker.base.time.monotonic", return_value=100):
+            first = self.cache.get(self.bug_system(1), self.connect)
+
+        with patch("tcms.issuetracker.base.time.monotonic", return_value=161):
+            second = self.cache.get(self.bug_system(1), self.connect)
+
+        self.assertIsNot(first, second)
+
+    def test_least_recently_used_connection_is_evicted(self):
+        first = self.cache.get(self.bug_system(1), self.connect)
+        self.cache.get(self.bug_system(2), self.connect)
+        # 1 is now more recently used than 2
+        self.cache.get(self.bug_system(1), self.connect)
+        self.cache.get(self.bug_system(3), self.connect)
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIs(first, self.cache.get(self.bug_system(1), self.connect))
+        self.assertEqual(self.connect.call_count, 3)
+
+        self.cache.get(self.bug_system(2), self.connect)
+        self.assertEqual(self.connect.call_count, 4)
+
+
+@override_settings(
+    EXTERNAL_ISSUE_CIRCUIT_BREAKER_THRESHOLD=2,
+    EXTERNAL_ISSUE_CIRCUIT_BREAKER_COOLDOWN=60,
+)
+class TestCircuitBreaker(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.failure(1)
+        self.assertTrue(self.breaker.allow(1))
+
+        self.breaker.failure(1)
+        self.assertFalse(self.breaker.allow(1))
+        # other trackers are not affected
+        self.assertTrue(self.breaker.allow(2))
+
+    def test_success_resets_failures(self):
+        self.breaker.failure(1)
+        self.breaker.success(1)
+        self.breaker.failure(1)
+
+        self.assertTrue(self.breaker.allow(1))
+
+    def test_single_trial_after_cooldown(self):
+        with patch("tcms.issuetracker.base.time.monotonic", return_value=100):
+            self.breaker.failure(1)
+            self.breaker.failure(1)
+
+        with patch("tcms.issuetracker.base.time.monotonic", return_value=161):
+            self.assertTrue(self.breaker.allow(1))
+            self.assertFalse(self.breaker.allow(1))
+
+        self.breaker.success(1)
+        self.assertTrue(self.breaker.allow(1))
+
+
+@override_settings(EXTERNAL_ISSUE_DETAILS_PER_HOST=2)
+class TestHostLimiter(SimpleTestCase):
+    def setUp(self):
+        self.limiter = HostLimiter()
+
+    def test_limit_is_shared_for_the_same_host(self):
+        semaphore = self.limiter.semaphore("bugs.example.com")
+        self.assertIs(self.limiter.semaphore("bugs.example.com"), semaphore)
+
+        self.assertTrue(semaphore.acquire(blocking=False))
+        self.assertTrue(semaphore.acquire(blocking=False))
+        self.assertFalse(
+            self.limiter.semaphore("bugs.example.com").acquire(blocking=False)
+        )
+
+        # other hosts are not affected
+        self.assertTrue(
+            self.limiter.semaphore("issues.example.com").acquire(blocking=False)
+        )
+
+
+class CommentingTracker(IssueTrackerType):  # pylint: disable=abstract-method
+    def __init__(self, bug_system, request):
+        super().__init__(bug_system, request)
+        self.comments = []
+
+    def post_comment_text(self, bug_id, text):
+        self.comments.append((bug_id, text))
+
+
+class LegacyTracker(IssueTrackerType):  # pylint: disable=abstract-method
+    def __init__(self, bug_system, request):
+        super().__init__(bug_system, request)
+        self.commented_executions = []
+
+    def post_comment(self, execution, bug_id):
+        self.commented_executions.append(execution)
+
+
+class CustomizedTracker(CommentingTracker):  # pylint: disable=abstract-method
+    """
+    A plugin which customizes only post_comment() of a built-in tracker
+    """
+
+    def post_comment(self, execution, bug_id):
+        self.comments.append((bug_id, f"customized TE-{execution.pk}"))
+
+
+class TestAddTestExecutionToIssue(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.bug_system = BugSystem.objects.create(
+            name="Tracker",
+            tracker_type="tcms.issuetracker.tests.test_base.CommentingTracker",
+            base_url="https://tracker.example.com",
+        )
+        cls.test_run = TestRunFactory()
+        cls.other_test_run = TestRunFactory()
+        cls.executions = [
+            TestExecutionFactory(run=cls.test_run),
+            TestExecutionFactory(run=cls.test_run),
+            TestExecutionFactory(run=cls.other_test_run),
+        ]
+
+    def setUp(self):
+        super().setUp()
+        self.due_while_posting = []
+
+    def test_single_comment_for_multiple_executions(self):
+        tracker = CommentingTracker(self.bug_system, None)
+
+        tracker.add_testexecution_to_issue(
+            self.executions, "https://tracker.example.com/issues/5"
+        )
+
+        self.assertEqual(len(tracker.comments), 1)
+        bug_id, text = tracker.comments[0]
+        self.assertEqual(bug_id, 5)
+        self.assertIn("Confirmed via 3 test executions", text)
+        self.assertEqual(text.count(f"TR-{self.test_run.pk}:"), 1)
+        self.assertIn(f"TR-{self.other_test_run.pk}:", text)
+        for execution in self.executions:
+            self.assertIn(f"TE-{execution.pk}: {execution.case.summary}", text)
+
+    def test_single_execution(self):
+        tracker = CommentingTracker(self.bug_system, None)
+
+        tracker.add_testexecution_to_issue(
+            self.executions[:1], "https://tracker.example.com/issues/5"
+        )
+
+        self.assertEqual(tracker.comments, [(5, tracker.text(self.executions[0]))])
+
+    def test_fallback_to_comment_per_execution(self):
+        tracker = LegacyTracker(self.bug_system, None)
+
+        tracker.add_testexecution_to_issue(
+            self.executions, "https://tracker.example.com/issues/5"
+        )
+
+        self.assertEqual(tracker.commented_executions, self.executions)
+
+    def test_overridden_post_comment_is_called(self):
+        tracker = CustomizedTracker(self.bug_system, None)
+
+        tracker.add_testexecution_to_issue(
+            self.executions, "https://tracker.example.com/issues/5"
+        )
+
+        expected = []
+        for execution in self.executions:
+            expected.append((5, f"customized TE-{execution.pk}"))
+        self.assertEqual(tracker.comments, expected)
+
+    def test_queue_posts_immediately_without_delay(self):
+        tracker = CommentingTracker(self.bug_system, None)
+
+        CommentQueue().add(
+            tracker, self.executions[0], "https://tracker.example.com/issues/5"
+        )
+
+        self.assertEqual(len(tracker.comments), 1)
+
+    @override_settings(EXTERNAL_ISSUE_COMMENT_DELAY=30)
+    @patch("tcms.issuetracker.base.threading.Timer")
+    def test_queue_batches_comments_per_issue(self, timer):
+        tracker = CommentingTracker(self.bug_system, None)
+        queue = CommentQueue()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for execution in self.executions:
+                queue.add(tracker, execution, "https://tracker.example.com/issues/5")
+            queue.add(
+                tracker, self.executions[0], "https://tracker.example.com/issues/6"
+            )
+
+        # nothing posted until the delay passes
+        self.assertEqual(tracker.comments, [])
+        self.assertEqual(timer.call_count, 1)
+        self.assertEqual(timer.call_args[0][0], 30)
+        self.assertEqual(PendingIssueComment.objects.count(), 4)
+
+        with patch.object(
+            CommentingTracker, "post_comment_text", autospec=True
+        ) as post_comment_text:
+            self.assertEqual(queue.flush(), 2)
+
+        comments = []
+        for call in post_comment_text.call_args_list:
+            comments.append(call.args[1:])
+        self.assertEqual(len(comments), 2)
+        self.assertEqual(comments[0][0], 5)
+        self.assertIn("Confirmed via 3 test executions", comments[0][1])
+        self.assertEqual(comments[1], (6, tracker.text(self.executions[0])))
+        self.assertFalse(PendingIssueComment.objects.exists())
+
+    @override_settings(EXTERNAL_ISSUE_COMMENT_DELAY=30)
+    def test_failed_comments_are_retried(self):
+        tracker = CommentingTracker(self.bug_system, None)
+        queue = CommentQueue()
+        queue.add(tracker, self.executions[0], "https://tracker.example.com/issues/5")
+
+        with patch.object(
+            CommentingTracker,
+            "post_comment_text",
+            side_effect=RuntimeError("tracker is down"),
+        ), self.assertLogs("tcms.issuetracker.base", level="ERROR") as logs:
+            self.assertEqual(queue.flush(), 0)
+
+        self.assertIn(
+            "https://tracker.example.com/issues/5 via Tracker", logs.output[0]
+        )
+        pending = PendingIssueComment.objects.get()
+        self.assertEqual(pending.attempts, 1)
+        self.assertEqual(pending.last_error, "tracker is down")
+
+        # not retried before the back-off has passed
+        self.assertEqual(queue.flush(), 0)
+
+        pending.send_after = timezone.now()
+        pending.save()
+        out = StringIO()
+        with patch.object(CommentingTracker, "post_comment_text", autospec=True):
+            call_command("post_issue_comments", stdout=out)
+
+        self.assertEqual(out.getvalue(), "1 comment(s) posted.\n")
+        self.assertFalse(PendingIssueComment.objects.exists())
+
+    def record_due_comments(self, *_args, **_kwargs):
+        self.due_while_posting.append(
+            PendingIssueComment.objects.filter(send_after__lte=timezone.now()).count()
+        )
+
+    @override_settings(EXTERNAL_ISSUE_COMMENT_DELAY=30)
+    def test_comments_being_posted_are_not_due(self):
+        tracker = CommentingTracker(self.bug_system, None)
+        queue = CommentQueue()
+        queue.add(tracker, self.executions[0], "https://tracker.example.com/issues/5")
+
+        with patch.object(
+            CommentingTracker,
+            "post_comment_text",
+            side_effect=self.record_due_comments,
+        ):
+            self.assertEqual(queue.flush(), 1)
+
+        # other workers skip the comment while it is being posted
+        self.assertEqual(self.due_while_posting, [0])
+        self.assertFalse(PendingIssueComment.objects.exists())
@@ -128,3 +128,10 @@ class TestKiwiTCMSIntegration(APITestCase):
 
         result = self.integration.details(f"{self.base_url}/{non_existing_bug_id}")
         self.assertEqual(result, {})
+
+    def test_post_comment_text_adds_comment_by_reporter(self):
+        self.integration.post_comment_text(self.existing_bug.pk, "Confirmed")
+
+        comment = get_comments(self.existing_bug).last()
+        self.assertEqual(comment.comment, "Confirmed")
+        self.assertEqual(comment.user, self.existing_bug.reporter)
@@ -163,8 +163,8 @@ class JIRA(IssueTrackerType):
             url + "/secure/CreateIssueDetails!init.jspa?" + urlencode(args, True),
         )
 
-    def post_comment(self, execution, bug_id):
-        self.rpc.add_comment(bug_id, self.text(execution))
+    def post_comment_text(self, bug_id, text):
+        self.rpc.add_comment(bug_id, text)
 
 
 class GitHub(IssueTrackerType):
@@ -239,10 +239,10 @@ class GitHub(IssueTrackerType):
         )
         return repo_id
 
-    def post_comment(self, execution, bug_id):
+    def post_comment_text(self, bug_id, text):
         repo = self.rpc.get_repo(self.repo_id)
 
-        repo.get_issue(bug_id).create_comment(self.text(execution))
+        repo.get_issue(bug_id).create_comment(text)
 
 
 class Gitlab(IssueTrackerType):
@@ -303,10 +303,10 @@ class Gitlab(IssueTrackerType):
     def repo_id(self):
         return urlparse(self.bug_system.base_url).path.strip("/")
 
-    def post_comment(self, execution, bug_id):
+    def post_comment_text(self, bug_id, text):
         repo = self.rpc.projects.get(self.repo_id)
 
-        repo.issues.get(bug_id).notes.create({"body": self.text(execution)})
+        repo.issues.get(bug_id).notes.create({"body": text})
 
 
 class Redmine(IssueTrackerType):
@@ -406,5 +406,5 @@ class Redmine(IssueTrackerType):
 
         return (new_issue, new_url)
 
-    def post_comment(self, execution, bug_id):
-        self.rpc.issue.get(bug_id).save(notes=self.text(execution))
+    def post_comment_text(self, bug_id, text):
+        self.rpc.issue.get(bug_id).save(notes=text)
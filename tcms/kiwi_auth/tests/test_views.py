@@ -10,7 +10,7 @@ from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from mock import patch
+from mock import ANY, patch
 
 from tcms import signals
 from tcms.kiwi_auth import forms
@@ -115,18 +115,19 @@ class TestRegistration(TestCase):
 
                 captcha_settings.CAPTCHA_TEST_MODE = True
 
-                response = self.client.post(
-                    self.register_url,
-                    {
-                        "username": username,
-                        "password1": __FOR_TESTING__,
-                        "password2": __FOR_TESTING__,
-                        "email": "new-tester@example.com",
-                        "captcha_0": "PASSED",
-                        "captcha_1": "PASSED",
-                    },
-                    follow=follow,
-                )
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.post(
+                        self.register_url,
+                        {
+                            "username": username,
+                            "password1": __FOR_TESTING__,
+                            "password2": __FOR_TESTING__,
+                            "email": "new-tester@example.com",
+                            "captcha_0": "PASSED",
+                            "captcha_1": "PASSED",
+                        },
+                        follow=follow,
+                    )
             finally:
                 captcha_settings.CAPTCHA_TEST_MODE = False
 
@@ -230,6 +231,7 @@ To activate your account, click this link:
             settings.DEFAULT_FROM_EMAIL,
             ["new-tester@example.com"],
             fail_silently=False,
+            connection=ANY,
         )
 
     @override_settings(
@@ -1,21 +1,50 @@
 # -*- coding: utf-8 -*-
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
 from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
 from modernrpc.auth.basic import http_basic_auth_login_required
 from modernrpc.core import REQUEST_KEY, rpc_method
 
-from tcms.rpc.api.utils import tracker_from_url
+from tcms.issuetracker.base import CircuitBreaker, HostLimiter
+from tcms.rpc.api.utils import TRACKER_INDEX
 from tcms.rpc.decorators import permissions_required
 from tcms.testcases.models import BugSystem
-from tcms.testruns.models import TestExecution
+from tcms.testruns.models import IssueReportJob, TestExecution
 
 __all__ = (
     "details",
+    "details_many",
     "report",
+    "report_async",
+    "report_status",
 )
 
 
+# the time when details were fetched, used to find out if they are stale
+FETCHED_AT_KEY = "bug-details-fetched-at:{}"
+# fetching details failed recently, don't try again
+FAILED_KEY = "bug-details-failed:{}"
+# details are being refreshed in the background
+REFRESHING_KEY = "bug-details-refreshing:{}"
+REFRESHING_TIMEOUT = 60
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_BREAKER = CircuitBreaker()
+HOST_LIMITER = HostLimiter()
+
+
 @http_basic_auth_login_required
 @rpc_method(name="Bug.details")
 def details(url, **kwargs):
@@ -30,20 +59,174 @@ def details(url, **kwargs):
         :param \\**kwargs: Dict providing access to the current request, protocol,
                 entry point name and handler instance from the rpc method
         :return: Detailed information about this URL. Depends on the underlying
-                 issue tracker.
+                 issue tracker. Empty if details can't be fetched at the moment.
         :rtype: dict
     """
-    result = cache.get(url)
-    if result:
-        return result
+    return details_many([url], **kwargs)[url]
 
-    request = kwargs.get(REQUEST_KEY)
-    tracker = tracker_from_url(url, request)
-    if not tracker:
+
+@functools.lru_cache(maxsize=None)
+def _details_executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.EXTERNAL_ISSUE_DETAILS_WORKERS,
+        thread_name_prefix="bug-details",
+    )
+
+
+def _fetch_one(tracker, url):
+    """
+    Fetch details from ``tracker`` unless it has been failing lately.
+    Failures are remembered for ``settings.EXTERNAL_ISSUE_DETAILS_FAILURE_TTL``
+    seconds so the tracker isn't contacted again for the same URL!
+    """
+    if not CIRCUIT_BREAKER.allow(tracker.bug_system.pk):
         return {}
 
-    result = tracker.details(url)
-    cache.set(url, result)
+    try:
+        with HOST_LIMITER.semaphore(urlsplit(url).netloc):
+            result = tracker.details(url)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Fetching details for %s failed", url)
+        CIRCUIT_BREAKER.failure(tracker.bug_system.pk)
+        cache.set(
+            FAILED_KEY.format(url), True, settings.EXTERNAL_ISSUE_DETAILS_FAILURE_TTL
+        )
+        return {}
+
+    CIRCUIT_BREAKER.success(tracker.bug_system.pk)
+    cache.set_many({url: result, FETCHED_AT_KEY.format(url): time.time()})
+    return result
+
+
+def _tracker_for(bug_system_pk):
+    """
+    Trackers and their RPC clients aren't thread-safe so every worker
+    creates its own. The request isn't passed because it may have been
+    finished already!
+    """
+    bug_system = BugSystem.objects.get(pk=bug_system_pk)
+    return import_string(bug_system.tracker_type)(bug_system, None)
+
+
+def _fetch_details(bug_system_pk, urls):
+    """
+    Fetch details for ``urls`` one after another. A failure
+    for one of them doesn't prevent fetching the rest!
+    """
+    result = {}
+    try:
+        tracker = _tracker_for(bug_system_pk)
+        for url in urls:
+            result[url] = _fetch_one(tracker, url)
+    finally:
+        close_old_connections()
+
+    return result
+
+
+def _log_failure(future):
+    if future.exception() is not None:
+        logger.error("Bug tracker task failed", exc_info=future.exception())
+
+
+def _fetch_in_parallel(to_fetch, wait=True):
+    """
+    :param to_fetch: URLs grouped by host and bug tracker
+    :type to_fetch: dict
+    :param wait: Wait for the results, otherwise fetch in the background
+    :type wait: bool
+    """
+    futures = []
+    for (_host, bug_system_pk), urls in to_fetch.items():
+        workers = min(settings.EXTERNAL_ISSUE_DETAILS_PER_HOST, len(urls))
+        for index in range(workers):
+            future = _details_executor().submit(
+                _fetch_details, bug_system_pk, urls[index::workers]
+            )
+            future.add_done_callback(_log_failure)
+            futures.append(future)
+
+    result = {}
+    if not wait:
+        return result
+
+    for future in futures:
+        if future.exception() is None:
+            for url, bug_details in future.result().items():
+                result[url] = bug_details
+    return result
+
+
+def _add_to_fetch(to_fetch, url):
+    """
+    Group ``url`` by host and bug tracker. Returns ``False``
+    if there's no bug tracker configured for it!
+    """
+    bug_system = TRACKER_INDEX.bug_system_for(url)
+    if bug_system is None:
+        return False
+
+    host_urls = to_fetch.setdefault((urlsplit(url).netloc, bug_system.pk), [])
+    if url not in host_urls:
+        host_urls.append(url)
+    return True
+
+
+def _is_stale(fetched_at):
+    # details cached without a timestamp are considered fresh
+    return (
+        fetched_at is not None
+        and time.time() - fetched_at > settings.EXTERNAL_ISSUE_DETAILS_FRESH_FOR
+    )
+
+
+@http_basic_auth_login_required
+@rpc_method(name="Bug.details_many")
+def details_many(urls, **kwargs):
+    """
+    .. function:: RPC Bug.details_many(urls)
+
+        Returns details about multiple bugs. Cached details are returned
+        immediately, the rest are fetched in parallel. No more than
+        ``settings.EXTERNAL_ISSUE_DETAILS_PER_HOST`` requests are made
+        to the same host at a time, even by concurrent calls.
+
+        Cached details older than ``settings.EXTERNAL_ISSUE_DETAILS_FRESH_FOR``
+        seconds are returned as well but refreshed in the background.
+        Bug trackers which fail repeatedly aren't contacted for a while!
+
+        :param urls: URL addresses
+        :type urls: list(str)
+        :param \\**kwargs: Dict providing access to the current request, protocol,
+                entry point name and handler instance from the rpc method
+        :return: Detailed information about each URL, keyed by URL. Unknown URLs
+                 or URLs for which fetching details failed map to an empty dict.
+        :rtype: dict
+    """
+    result = {}
+    keys = []
+    for url in urls:
+        keys.extend([url, FETCHED_AT_KEY.format(url), FAILED_KEY.format(url)])
+    cached = cache.get_many(keys)
+
+    to_fetch = {}
+    to_refresh = {}
+    for url in urls:
+        result[url] = {}
+
+        if cached.get(url):
+            result[url] = cached[url]
+            if _is_stale(cached.get(FETCHED_AT_KEY.format(url))) and cache.add(
+                REFRESHING_KEY.format(url), True, REFRESHING_TIMEOUT
+            ):
+                _add_to_fetch(to_refresh, url)
+        elif not cached.get(FAILED_KEY.format(url)):
+            _add_to_fetch(to_fetch, url)
+
+    _fetch_in_parallel(to_refresh, wait=False)
+    for url, bug_details in _fetch_in_parallel(to_fetch).items():
+        result[url] = bug_details
+
     return result
 
 
@@ -68,6 +251,13 @@ def report(execution_id, tracker_id, **kwargs):
         :rtype: dict
     """
     request = kwargs.get(REQUEST_KEY)
+    execution = TestExecution.objects.get(pk=execution_id)
+    bug_system = BugSystem.objects.get(pk=tracker_id)
+
+    return _report(execution, bug_system, request.user, request)
+
+
+def _report(execution, bug_system, user, request):
     response = {
         "rc": 1,
         "response": _(
@@ -75,11 +265,171 @@ def report(execution_id, tracker_id, **kwargs):
         ),
     }
 
-    execution = TestExecution.objects.get(pk=execution_id)
-    bug_system = BugSystem.objects.get(pk=tracker_id)
     tracker = import_string(bug_system.tracker_type)(bug_system, request)
     if not tracker.is_adding_testcase_to_issue_disabled():
-        url = tracker.report_issue_from_testexecution(execution, request.user)
+        url = tracker.report_issue_from_testexecution(execution, user)
         response = {"rc": 0, "response": url}
 
     return response
+
+
+@functools.lru_cache(maxsize=None)
+def _report_executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.EXTERNAL_ISSUE_REPORT_WORKERS,
+        thread_name_prefix="bug-report",
+    )
+
+
+def _run_report_job(job_pk):
+    """
+    Report the issue for a pending job. Returns ``False`` if the job
+    has been started by another worker already!
+    """
+    # pylint: disable=objects-update-used
+    claimed = IssueReportJob.objects.filter(
+        pk=job_pk, status=IssueReportJob.PENDING
+    ).update(status=IssueReportJob.RUNNING, started_at=timezone.now())
+    if not claimed:
+        return False
+
+    response = {"rc": 1, "response": _("Reporting the issue has been interrupted")}
+    try:
+        job = IssueReportJob.objects.select_related(
+            "execution", "bug_system", "reporter"
+        ).get(pk=job_pk)
+        # the request may have been finished already
+        response = _report(job.execution, job.bug_system, job.reporter, None)
+    except Exception as err:  # pylint: disable=broad-except
+        logger.exception("Reporting issue for job %d failed", job_pk)
+        response = {"rc": 1, "response": str(err)}
+    finally:
+        IssueReportJob.objects.filter(pk=job_pk).update(
+            status=IssueReportJob.FINISHED,
+            rc=response["rc"],
+            response=response["response"],
+        )
+
+    return True
+
+
+def _run_report_job_in_background(job_pk):
+    try:
+        _run_report_job(job_pk)
+    finally:
+        close_old_connections()
+
+
+def _schedule_report_job(job_pk):
+    if not settings.EXTERNAL_ISSUE_REPORT_WORKERS:
+        _run_report_job(job_pk)
+        return
+
+    future = _report_executor().submit(_run_report_job_in_background, job_pk)
+    future.add_done_callback(_log_failure)
+
+
+def run_pending_report_jobs():
+    """
+    Report issues for jobs which are still pending, e.g. because the process
+    which accepted them has been restarted. Jobs which have been running for
+    longer than ``settings.EXTERNAL_ISSUE_REPORT_TIMEOUT`` seconds are finished
+    with ``rc=1``. They aren't repeated because the issue may have been
+    reported already!
+
+    :return: The number of reported and interrupted jobs
+    :rtype: tuple(int, int)
+    """
+    started_before = timezone.now() - timedelta(
+        seconds=settings.EXTERNAL_ISSUE_REPORT_TIMEOUT
+    )
+    # pylint: disable=objects-update-used
+    interrupted = (
+        IssueReportJob.objects.filter(status=IssueReportJob.RUNNING)
+        .filter(
+            Q(started_at__lt=started_before)
+            | Q(started_at__isnull=True, created_at__lt=started_before)
+        )
+        .update(
+            status=IssueReportJob.FINISHED,
+            rc=1,
+            response=_("Reporting the issue has been interrupted"),
+        )
+    )
+
+    reported = 0
+    for job_pk in (
+        IssueReportJob.objects.filter(status=IssueReportJob.PENDING)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    ):
+        reported += int(_run_report_job(job_pk))
+
+    return reported, interrupted
+
+
+def _job_status(job):
+    return {
+        "job_id": job.pk,
+        "status": job.status,
+        "rc": job.rc,
+        "response": job.response,
+    }
+
+
+@permissions_required(
+    ("testruns.view_testexecution", "linkreference.add_linkreference")
+)
+@rpc_method(name="Bug.report_async")
+def report_async(execution_id, tracker_id, **kwargs):
+    """
+    .. function:: RPC Bug.report_async(execution_id, tracker_id)
+
+        Same as :func:`Bug.report` but the issue is reported in the background
+        so slow bug trackers don't block the caller. Use :func:`Bug.report_status`
+        to find out the result!
+
+        :param execution_id: PK for :class:`tcms.testruns.models.TestExecution` object
+        :type execution_id: int
+        :param tracker_id: PK for :class:`tcms.testcases.models.BugSystem` object
+        :type tracker_id: int
+        :param \\**kwargs: Dict providing access to the current request, protocol,
+                entry point name and handler instance from the rpc method
+        :return: Status of the job, see :func:`Bug.report_status`
+        :rtype: dict
+    """
+    request = kwargs.get(REQUEST_KEY)
+    job = IssueReportJob.objects.create(
+        execution=TestExecution.objects.get(pk=execution_id),
+        bug_system=BugSystem.objects.get(pk=tracker_id),
+        reporter=request.user,
+    )
+    transaction.on_commit(functools.partial(_schedule_report_job, job.pk))
+
+    return _job_status(job)
+
+
+@permissions_required("testruns.view_testexecution")
+@rpc_method(name="Bug.report_status")
+def report_status(job_id, **kwargs):
+    """
+    .. function:: RPC Bug.report_status(job_id)
+
+        Returns the status of an issue reported via :func:`Bug.report_async`.
+        Only the user who requested the report can see its status.
+
+        :param job_id: ID returned by :func:`Bug.report_async`
+        :type job_id: int
+        :param \\**kwargs: Dict providing access to the current request, protocol,
+                entry point name and handler instance from the rpc method
+        :return: Dict with ``job_id``, ``status`` (one of pending, running or
+                 finished) and once finished ``rc`` and ``response`` which
+                 have the same meaning as for :func:`Bug.report`
+        :rtype: dict
+        :raises DoesNotExist: if the job doesn't exist or has been requested
+                              by another user
+    """
+    request = kwargs.get(REQUEST_KEY)
+    job = IssueReportJob.objects.get(pk=job_id, reporter=request.user)
+
+    return _job_status(job)
@@ -8,6 +8,7 @@ from django.forms.models import model_to_dict
 from modernrpc.core import REQUEST_KEY, rpc_method
 
 from tcms.core import helpers
+from tcms.core import search as full_text
 from tcms.core.utils import form_errors_to_list
 from tcms.management.models import Component, Tag
 from tcms.rpc import utils
@@ -19,6 +20,7 @@ __all__ = (
     "create",
     "update",
     "filter",
+    "search",
     "history",
     "sortkeys",
     "remove",
@@ -268,30 +270,46 @@ def create(values, **kwargs):
     raise ValueError(form_errors_to_list(form))
 
 
+def _filter_queryset(query):
+    return TestCase.objects.annotate(
+        expected_duration=Coalesce("setup_duration", timedelta(0))
+        + Coalesce("testing_duration", timedelta(0))
+    ).filter(**query)
+
+
 @permissions_required("testcases.view_testcase")
 @rpc_method(name="TestCase.filter")
-def filter(query=None):  # pylint: disable=redefined-builtin
+def filter(  # pylint: disable=redefined-builtin
+    query=None, fields=None, limit=None, after=None
+):
     """
-    .. function:: RPC TestCase.filter(query)
+    .. function:: RPC TestCase.filter(query, fields, limit, after)
 
         Perform a search and return the resulting list of test cases
         augmented with their latest ``text``.
 
         :param query: Field lookups for :class:`tcms.testcases.models.TestCase`
         :type query: dict
+        :param fields: Optional list of field names to return, defaults to all
+                       except ``text_html``, the rendered ``text``. The primary
+                       key is always returned!
+        :type fields: list(str)
+        :param limit: Optional maximum number of records to return
+        :type limit: int
+        :param after: Optional primary key of the last record from the previous
+                      page. When paginating results are ordered by primary key
+        :type after: int
         :return: Serialized list of :class:`tcms.testcases.models.TestCase` objects.
+                 ``text_html`` is ``None`` if ``text`` hasn't been rendered yet.
         :rtype: list(dict)
+        :raises ValueError: if *fields* contains unknown field names
     """
     if query is None:
         query = {}
 
-    qs = (
-        TestCase.objects.annotate(
-            expected_duration=Coalesce("setup_duration", timedelta(0))
-            + Coalesce("testing_duration", timedelta(0))
-        )
-        .filter(**query)
-        .values(
+    return utils.values_page(
+        _filter_queryset(query).distinct(),
+        [
             "id",
             "create_date",
             "is_automated",
@@ -317,11 +335,50 @@ def filter(query=None):  # pylint: disable=redefined-builtin
             "setup_duration",
             "testing_duration",
             "expected_duration",
-        )
-        .distinct()
+        ],
+        fields,
+        limit,
+        after,
+        optional_fields=["text_html"],
     )
 
-    return list(qs)
+
+@permissions_required("testcases.view_testcase")
+@rpc_method(name="TestCase.search")
+def search(text, filters=None, limit=20, fields=None):
+    """
+    .. function:: RPC TestCase.search(text, filters, limit, fields)
+
+        Full-text search in the summary, text and notes of test cases.
+        Uses the search index instead of scanning the test cases table.
+
+        :param text: Words to search for
+        :type text: str
+        :param filters: Optional field lookups for
+                        :class:`tcms.testcases.models.TestCase`
+        :type filters: dict
+        :param limit: Maximum number of records to return, default 20
+        :type limit: int
+        :param fields: Optional list of field names to return, defaults to all.
+                       The primary key and ``rank`` are always returned!
+        :type fields: list(str)
+        :return: Serialized list of :class:`tcms.testcases.models.TestCase`
+                 objects ordered by relevance, most relevant first.
+        :rtype: list(dict)
+        :raises ValueError: if *fields* contains unknown field names
+    """
+    if filters is None:
+        filters = {}
+
+    ranks = dict(full_text.search(_filter_queryset(filters), text, limit))
+    if not ranks:
+        return []
+
+    result = filter({"pk__in": list(ranks)}, fields)
+    for test_case in result:
+        test_case["rank"] = ranks[test_case["id"]]
+    result.sort(key=lambda test_case: (-test_case["rank"], test_case["id"]))
+    return result
 
 
 @permissions_required("testcases.view_testcase")
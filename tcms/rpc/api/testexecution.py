@@ -1,22 +1,30 @@
 # -*- coding: utf-8 -*-
 
+import copy
 from datetime import timedelta
 
 from django.conf import settings
+from django.db import transaction
 from django.db.models import F
 from django.db.models.functions import Coalesce
 from django.forms.models import model_to_dict
 from django.utils import timezone
 from modernrpc.core import REQUEST_KEY, rpc_method
+from simple_history.utils import bulk_update_with_history
 
 from tcms.core.contrib.linkreference.models import LinkReference
 from tcms.core.helpers import comments
+from tcms.core.history import diff_objects
 from tcms.core.utils import form_errors_to_list
+from tcms.issuetracker.base import COMMENT_QUEUE
+from tcms.rpc import utils
 from tcms.rpc.api.forms.testexecution import LinkReferenceForm
 from tcms.rpc.api.forms.testrun import UpdateExecutionForm
 from tcms.rpc.api.utils import tracker_from_url
 from tcms.rpc.decorators import permissions_required
-from tcms.testruns.models import TestExecution, TestExecutionProperty
+from tcms.telemetry import rollups
+from tcms.testcases.models import TestCase
+from tcms.testruns.models import TestExecution, TestExecutionProperty, TestRun
 
 # conditional import b/c this App can be disabled
 if "tcms.bugs.apps.AppConfig" in settings.INSTALLED_APPS:
@@ -29,9 +37,11 @@ else:
 
 __all__ = (
     "update",
+    "bulk_update",
     "filter",
     "history",
     "add_comment",
+    "add_comment_many",
     "remove_comment",
     "add_link",
     "get_links",
@@ -64,6 +74,40 @@ def add_comment(execution_id, comment, **kwargs):
     return model_to_dict(created[0])
 
 
+@permissions_required("django_comments.add_comment")
+@rpc_method(name="TestExecution.add_comment_many")
+def add_comment_many(execution_ids, comment, **kwargs):
+    """
+    .. function:: RPC TestExecution.add_comment_many(execution_ids, comment)
+
+        Add the same comment to multiple test executions, e.g. the
+        reason for which they failed.
+
+        :param execution_ids: PKs of TestExecution objects
+        :type execution_ids: list(int)
+        :param comment: The text to add as a comment
+        :type comment: str
+        :param \\**kwargs: Dict providing access to the current request, protocol,
+                entry point name and handler instance from the rpc method
+        :return: List of serialized :class:`django_comments.models.Comment` objects
+        :rtype: list(dict)
+        :raises PermissionDenied: if missing *django_comments.add_comment* permission
+
+        .. note::
+
+            Non-existing test executions are ignored!
+    """
+    executions = TestExecution.objects.filter(pk__in=execution_ids).order_by("pk")
+    created = comments.add_comment(
+        list(executions), comment, kwargs.get(REQUEST_KEY).user
+    )
+
+    result = []
+    for obj in created:
+        result.append(model_to_dict(obj))
+    return result
+
+
 @permissions_required("django_comments.delete_comment")
 @rpc_method(name="TestExecution.remove_comment")
 def remove_comment(execution_id, comment_id=None):
@@ -107,18 +151,29 @@ def get_comments(execution_id):
 
 @permissions_required("testruns.view_testexecution")
 @rpc_method(name="TestExecution.filter")
-def filter(query):  # pylint: disable=redefined-builtin
+def filter(  # pylint: disable=redefined-builtin
+    query, fields=None, limit=None, after=None
+):
     """
-    .. function:: RPC TestExecution.filter(query)
+    .. function:: RPC TestExecution.filter(query, fields, limit, after)
 
         Perform a search and return the resulting list of test case executions.
 
         :param query: Field lookups for :class:`tcms.testruns.models.TestExecution`
         :type query: dict
+        :param fields: Optional list of field names to return, defaults to all.
+                       The primary key is always returned!
+        :type fields: list(str)
+        :param limit: Optional maximum number of records to return
+        :type limit: int
+        :param after: Optional primary key of the last record from the previous
+                      page. When paginating results are ordered by primary key
+        :type after: int
         :return: List of serialized :class:`tcms.testruns.models.TestExecution` objects
         :rtype: list(dict)
+        :raises ValueError: if *fields* contains unknown field names
     """
-    return list(
+    return utils.values_page(
         TestExecution.objects.annotate(
             expected_duration=(
                 Coalesce("case__setup_duration", timedelta(0))
@@ -127,7 +182,8 @@ def filter(query):  # pylint: disable=redefined-builtin
             actual_duration=F("stop_date") - F("start_date"),
         )
         .filter(**query)
-        .values(
+        .distinct(),
+        [
             "id",
             "assignee",
             "assignee__username",
@@ -146,8 +202,10 @@ def filter(query):  # pylint: disable=redefined-builtin
             "status__name",
             "expected_duration",
             "actual_duration",
-        )
-        .distinct()
+        ],
+        fields,
+        limit,
+        after,
     )
 
 
@@ -252,6 +310,159 @@ def update(execution_id, values, **kwargs):
     return result
 
 
+def _update_runs_stop_date(run_ids, now):
+    """
+    Adjust TR.stop_date for all affected test runs at once:
+    runs without any neutral executions are completed, runs
+    which still have neutral executions are reopened.
+    """
+    not_completed = set(
+        TestExecution.objects.filter(run__in=run_ids, status__weight=0)
+        .values_list("run", flat=True)
+        .distinct()
+    )
+
+    for test_run in TestRun.objects.filter(pk__in=run_ids):
+        if test_run.pk not in not_completed:
+            test_run.stop_date = now
+            test_run.save()
+        elif test_run.stop_date:
+            test_run.stop_date = None
+            test_run.save()
+
+
+def _apply_bulk_changes(executions, changes, now):
+    """
+    Modify executions in memory and calculate their changelog.
+    Values which depend on each individual execution are resolved
+    with a single query for all of them.
+
+    :return: Names of the fields which need to be updated in the DB
+    :rtype: list(str)
+    """
+    update_fields = list(changes)
+    per_execution = {}
+
+    if changes.get("case_text_version") == "latest":
+        del changes["case_text_version"]
+        text_versions = TestCase.latest_text_versions(
+            {execution.case_id for execution in executions}
+        )
+        per_execution["case_text_version"] = lambda te: text_versions[te.case_id]
+
+    if changes.get("status") and "build" not in changes:
+        update_fields.append("build")
+        run_builds = dict(
+            TestRun.objects.filter(
+                pk__in={execution.run_id for execution in executions}
+            ).values_list("pk", "build")
+        )
+        per_execution["build_id"] = lambda te: run_builds[te.run_id]
+
+    if changes.get("status"):
+        if "stop_date" not in update_fields:
+            update_fields.append("stop_date")
+        changes["stop_date"] = now if changes["status"].weight != 0 else None
+
+    fields = []
+    for name in update_fields:
+        fields.append(TestExecution._meta.get_field(name))
+
+    for execution in executions:
+        previous = copy.copy(execution)
+
+        for field_name, value in changes.items():
+            setattr(execution, field_name, value)
+
+        for field_name, get_value in per_execution.items():
+            setattr(execution, field_name, get_value(execution))
+
+        # note: see comment in KiwiHistoricalRecords.post_save()
+        execution._change_reason = diff_objects(  # pylint: disable=protected-access
+            previous, execution, fields
+        )
+
+    return update_fields
+
+
+@permissions_required("testruns.change_testexecution")
+@rpc_method(name="TestExecution.bulk_update")
+def bulk_update(ids_or_query, values, **kwargs):
+    """
+    .. function:: RPC TestExecution.bulk_update(ids_or_query, values)
+
+        Update multiple TestExecution objects with the same values.
+        Input is validated only once, the changes are written with bulk
+        SQL statements inside a single transaction and test run completion
+        is recalculated once per affected run at the end.
+
+        :param ids_or_query: List of TestExecution PKs or field lookups for
+                             :class:`tcms.testruns.models.TestExecution`
+        :type ids_or_query: list(int) or dict
+        :param values: Field values for :class:`tcms.testruns.models.TestExecution`
+        :type values: dict
+        :param \\**kwargs: Dict providing access to the current request, protocol,
+                entry point name and handler instance from the rpc method
+        :return: List of serialized :class:`tcms.testruns.models.TestExecution` objects
+        :rtype: list(dict)
+        :raises ValueError: if data validations fail
+        :raises PermissionDenied: if missing *testruns.change_testexecution* permission
+
+        .. note::
+
+            Post-save signal handlers are not executed for the updated executions!
+    """
+    request = kwargs.get(REQUEST_KEY)
+    query = ids_or_query
+    if not isinstance(ids_or_query, dict):
+        query = {"pk__in": ids_or_query}
+
+    values = values.copy()
+    # resolved individually for each execution, see _apply_bulk_changes()
+    use_latest_text = values.get("case_text_version") == "latest"
+    if use_latest_text:
+        del values["case_text_version"]
+
+    if values.get("status") and not values.get("tested_by"):
+        values["tested_by"] = request.user.id
+
+    form = UpdateExecutionForm(values, instance=TestExecution())
+    if not form.is_valid():
+        raise ValueError(form_errors_to_list(form))
+
+    changes = {}
+    for field_name in values:
+        if field_name in form.fields:
+            changes[field_name] = form.cleaned_data[field_name]
+
+    if use_latest_text:
+        changes["case_text_version"] = "latest"
+
+    now = timezone.now()
+    with transaction.atomic():
+        executions = list(TestExecution.objects.filter(**query).select_for_update())
+        if not executions:
+            return []
+
+        # post_save signal handlers are not executed, see note above
+        removed = rollups.snapshot(executions)
+        update_fields = _apply_bulk_changes(executions, changes, now)
+        bulk_update_with_history(
+            executions,
+            TestExecution,
+            update_fields,
+            batch_size=500,
+            default_user=request.user,
+            default_date=now,
+        )
+        rollups.record_changes(removed, rollups.snapshot(executions))
+
+        if changes.get("status"):
+            _update_runs_stop_date({execution.run_id for execution in executions}, now)
+
+    return filter({"pk__in": {execution.pk for execution in executions}})
+
+
 @permissions_required("linkreference.add_linkreference")
 @rpc_method(name="TestExecution.add_link")
 def add_link(values, update_tracker=False, **kwargs):
@@ -293,13 +504,16 @@ def add_link(values, update_tracker=False, **kwargs):
     request = kwargs.get(REQUEST_KEY)
     tracker = tracker_from_url(link.url, request)
 
-    if (
+    if isinstance(tracker, KiwiTCMS):
+        tracker.add_testexecution_to_issue([link.execution], link.url)
+    elif (
         link.is_defect
         and tracker is not None
         and update_tracker
         and not tracker.is_adding_testcase_to_issue_disabled()
-    ) or isinstance(tracker, KiwiTCMS):
-        tracker.add_testexecution_to_issue([link.execution], link.url)
+    ):
+        # comments for the same defect may be batched
+        COMMENT_QUEUE.add(tracker, link.execution, link.url)
 
     return model_to_dict(link)
 
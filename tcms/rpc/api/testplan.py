@@ -80,24 +80,36 @@ def create(values, **kwargs):
 
 @permissions_required("testplans.view_testplan")
 @rpc_method(name="TestPlan.filter")
-def filter(query=None):  # pylint: disable=redefined-builtin
+def filter(  # pylint: disable=redefined-builtin
+    query=None, fields=None, limit=None, after=None
+):
     """
-    .. function:: RPC TestPlan.filter(query)
+    .. function:: RPC TestPlan.filter(query, fields, limit, after)
 
         Perform a search and return the resulting list of test plans.
 
         :param query: Field lookups for :class:`tcms.testplans.models.TestPlan`
         :type query: dict
+        :param fields: Optional list of field names to return, defaults to all
+                       except ``text_html``, the rendered ``text``. The primary
+                       key is always returned!
+        :type fields: list(str)
+        :param limit: Optional maximum number of records to return
+        :type limit: int
+        :param after: Optional primary key of the last record from the previous
+                      page. When paginating results are ordered by primary key
+        :type after: int
         :return: List of serialized :class:`tcms.testplans.models.TestPlan` objects
         :rtype: list(dict)
+        :raises ValueError: if *fields* contains unknown field names
     """
 
     if query is None:
         query = {}
 
-    return list(
-        TestPlan.objects.filter(**query)
-        .values(
+    return utils.values_page(
+        TestPlan.objects.filter(**query).order_by("product", "id").distinct(),
+        [
             "id",
             "name",
             "text",
@@ -113,9 +125,11 @@ def filter(query=None):  # pylint: disable=redefined-builtin
             "type",
             "type__name",
             "parent",
-        )
-        .order_by("product", "id")
-        .distinct()
+        ],
+        fields,
+        limit,
+        after,
+        optional_fields=["text_html"],
     )
 
 
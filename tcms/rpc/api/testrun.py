@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from django.db import transaction
+from django.db.models import Max
 from django.forms.models import model_to_dict
 from modernrpc.core import REQUEST_KEY, rpc_method
 
@@ -7,15 +9,22 @@ from tcms.management.models import Tag
 from tcms.rpc import utils
 from tcms.rpc.api.forms.testrun import UpdateForm, UserForm
 from tcms.rpc.decorators import permissions_required
+from tcms.telemetry import rollups
 from tcms.testcases.models import TestCase
 from tcms.testruns.forms import NewRunForm
-from tcms.testruns.models import Property, TestExecution, TestRun
+from tcms.testruns.models import (
+    Property,
+    TestExecution,
+    TestExecutionProperty,
+    TestRun,
+)
 
 __all__ = (
     "create",
     "update",
     "filter",
     "add_case",
+    "add_cases",
     "get_cases",
     "remove_case",
     "add_tag",
@@ -65,14 +74,71 @@ def add_case(run_id, case_id):
     )
 
 
+@permissions_required("testruns.add_testexecution")
+@rpc_method(name="TestRun.add_cases")
+def add_cases(run_id, case_ids, matrix_type="full"):
+    """
+    .. function:: RPC TestRun.add_cases(run_id, case_ids, matrix_type)
+
+        Add multiple TestCase objects to the selected test run. Executions
+        and their properties are created in bulk which is much faster than
+        calling ``TestRun.add_case`` for every test case.
+
+        :param run_id: PK of TestRun to modify
+        :type run_id: int
+        :param case_ids: PKs of TestCase objects to be added
+        :type case_ids: list(int)
+        :param matrix_type: Property matrix type, either "full" or "pairwise"
+        :type matrix_type: str
+        :return: A list of serialized :class:`tcms.testruns.models.TestExecution` objects
+        :rtype: list(dict)
+        :raises DoesNotExist: if the test run specified by PK doesn't exist
+        :raises PermissionDenied: if missing *testruns.add_testexecution* permission
+        :raises RuntimeError: if test case status is not CONFIRMED
+    """
+    run = TestRun.objects.get(pk=run_id)
+
+    existing = run.executions.filter(case__in=case_ids)
+    existing_case_ids = set(existing.values_list("case", flat=True))
+    cases = list(
+        TestCase.objects.filter(pk__in=case_ids)
+        .exclude(pk__in=existing_case_ids)
+        .select_related("case_status")
+        .order_by("pk")
+    )
+
+    for case in cases:
+        if not case.case_status.is_confirmed:
+            raise RuntimeError(f"TC-{case.pk} status is not confirmed")
+
+    # always add new TEs at the end of TR
+    sortkey = run.executions.aggregate(Max("sortkey"))["sortkey__max"] or 0
+    sortkeys = {}
+    for case in cases:
+        sortkey += 10
+        sortkeys[case.pk] = sortkey
+
+    return annotate_executions_with_properties(
+        list(existing)
+        + run.create_executions(cases, sortkeys=sortkeys, matrix_type=matrix_type)
+    )
+
+
 def annotate_executions_with_properties(executions_iterable):
-    result = []
+    executions = list(executions_iterable)
 
-    for execution in executions_iterable:
+    execution_properties = {}
+    for prop in (
+        TestExecutionProperty.objects.filter(execution__in=executions)
+        .values("execution", "name", "value")
+        .order_by("pk")
+    ):
+        execution_properties.setdefault(prop.pop("execution"), []).append(prop)
+
+    result = []
+    for execution in executions:
         serialized_execution = model_to_dict(execution)
-        serialized_execution["properties"] = list(
-            execution.properties().values("name", "value")
-        )
+        serialized_execution["properties"] = execution_properties.get(execution.pk, [])
         result.append(serialized_execution)
 
     return result
@@ -92,7 +158,11 @@ def remove_case(run_id, case_id):
         :type case_id: int
         :raises PermissionDenied: if missing *testruns.delete_testexecution* permission
     """
-    TestExecution.objects.filter(run=run_id, case=case_id).delete()
+    executions = TestExecution.objects.filter(run=run_id, case=case_id)
+    with transaction.atomic():
+        # pre_delete signal handlers skip executions deleted in bulk
+        rollups.remove_executions(executions)
+        executions.delete()
 
 
 @permissions_required("testruns.view_testrun")
@@ -239,24 +309,36 @@ def create(values, **kwargs):
 
 @permissions_required("testruns.view_testrun")
 @rpc_method(name="TestRun.filter")
-def filter(query=None):  # pylint: disable=redefined-builtin
+def filter(  # pylint: disable=redefined-builtin
+    query=None, fields=None, limit=None, after=None
+):
     """
-    .. function:: RPC TestRun.filter(query)
+    .. function:: RPC TestRun.filter(query, fields, limit, after)
 
         Perform a search and return the resulting list of test runs.
 
         :param query: Field lookups for :class:`tcms.testruns.models.TestRun`
         :type query: dict
+        :param fields: Optional list of field names to return, defaults to all
+                       except ``notes_html``, the rendered ``notes``. The primary
+                       key is always returned!
+        :type fields: list(str)
+        :param limit: Optional maximum number of records to return
+        :type limit: int
+        :param after: Optional primary key of the last record from the previous
+                      page. When paginating results are ordered by primary key
+        :type after: int
         :return: List of serialized :class:`tcms.testruns.models.TestRun` objects
         :rtype: list(dict)
+        :raises ValueError: if *fields* contains unknown field names
     """
 
     if query is None:
         query = {}
 
-    return list(
-        TestRun.objects.filter(**query)
-        .values(
+    return utils.values_page(
+        TestRun.objects.filter(**query).distinct(),
+        [
             "id",
             "plan__product_version",
             "plan__product_version__value",
@@ -275,8 +357,11 @@ def filter(query=None):  # pylint: disable=redefined-builtin
             "manager__username",
             "default_tester",
             "default_tester__username",
-        )
-        .distinct()
+        ],
+        fields,
+        limit,
+        after,
+        optional_fields=["notes_html"],
     )
 
 
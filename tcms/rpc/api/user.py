@@ -189,7 +189,8 @@ def add_attachment(filename, b64content, **kwargs):
         :return: Information about the attachment
         :rtype: dict
     """
-    user = kwargs.get(REQUEST_KEY).user
+    request = kwargs.get(REQUEST_KEY)
+    user = request.user
     utils.add_attachment(
         user.pk,
         settings.AUTH_USER_MODEL,
@@ -197,6 +198,8 @@ def add_attachment(filename, b64content, **kwargs):
         filename,
         b64content,
     )
+    # see tcms.signals.handle_attachments_post_save()
+    request.session["pending_attachments"] = True
 
     # take the last attachment for this user and return information about it
     attachment = (
@@ -2,10 +2,93 @@
 
 # Licensed under the GPL 2.0: https://www.gnu.org/licenses/old-licenses/gpl-2.0.html
 
+import threading
+import time
+
+from django.db import transaction
 from django.utils.module_loading import import_string
 
 from tcms.testcases.models import BugSystem
 
+# changes made by other processes are picked up after this many seconds
+TRACKER_INDEX_TTL = 60
+
+
+class TrackerIndex:
+    """
+    In-memory index of ``BugSystem.base_url`` used to find which
+    bug tracker a URL belongs to without querying the database.
+    It is rebuilt after a ``BugSystem`` is saved or deleted!
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._index = None
+        self._built_at = 0
+
+    def invalidate(self, **_kwargs):
+        with self._lock:
+            self._generation += 1
+            self._index = None
+
+    def invalidate_on_commit(self, **kwargs):
+        """
+        Signal handler for ``BugSystem`` changes. The index is invalidated
+        again after the transaction commits in case it has been rebuilt
+        from the previous state in the meantime. An index rebuilt from
+        changes which are rolled back expires after ``TRACKER_INDEX_TTL``!
+        """
+        self.invalidate(**kwargs)
+        transaction.on_commit(self.invalidate)
+
+    @staticmethod
+    def _build():
+        by_prefix = {}
+        for row in BugSystem.objects.order_by("pk").values():
+            if row["base_url"]:
+                by_prefix.setdefault(row["base_url"], row)
+
+        prefix_lengths = sorted(
+            set(len(base_url) for base_url in by_prefix), reverse=True
+        )
+        return by_prefix, prefix_lengths
+
+    def _get(self):
+        with self._lock:
+            generation = self._generation
+            if (
+                self._index is not None
+                and time.monotonic() - self._built_at < TRACKER_INDEX_TTL
+            ):
+                return self._index
+
+        index = self._build()
+
+        with self._lock:
+            if generation == self._generation:
+                self._index = index
+                self._built_at = time.monotonic()
+
+        return index
+
+    def bug_system_for(self, url):
+        """
+        Return the ``BugSystem`` with the longest ``base_url`` which
+        is a prefix of ``url`` or ``None``. A new object is returned
+        every time so it isn't shared between threads!
+        """
+        by_prefix, prefix_lengths = self._get()
+        for length in prefix_lengths:
+            row = by_prefix.get(url[:length])
+            if row is not None:
+                return BugSystem(**row)
+
+        return None
+
+
+TRACKER_INDEX = TrackerIndex()
+
 
 def tracker_from_url(url, request):
     """
@@ -13,8 +96,19 @@ def tracker_from_url(url, request):
     where ``base_url`` is part of ``url``. Usually we pass
     URLs to pre-existing defects to this method.
     """
-    for bug_system in BugSystem.objects.all():
-        if bug_system.base_url and url.startswith(bug_system.base_url):
-            return import_string(bug_system.tracker_type)(bug_system, request)
+    bug_system = TRACKER_INDEX.bug_system_for(url)
+    if bug_system is None:
+        return None
+
+    if request is None:
+        return import_string(bug_system.tracker_type)(bug_system, request)
+
+    # many links usually point to the same trackers,
+    # reuse them for the lifetime of the HTTP request
+    cache = request.__dict__.setdefault("issue_trackers_cache", {})
+    if bug_system.pk not in cache:
+        cache[bug_system.pk] = import_string(bug_system.tracker_type)(
+            bug_system, request
+        )
 
-    return None
+    return cache[bug_system.pk]
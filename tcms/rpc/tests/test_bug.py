@@ -1,32 +1,52 @@
 # pylint: disable=attribute-defined-outside-init
 
+import time
 import unittest
+from datetime import timedelta
+from io import StringIO
+from xmlrpc.client import Fault as XmlRPCFault
 
 from django.conf import settings
 from django.core.cache import cache
+from django.core.management import call_command
 from django.test import override_settings
+from django.utils import timezone
 from mock import MagicMock, patch
 
+from tcms.rpc.api.bug import FETCHED_AT_KEY, _fetch_in_parallel
 from tcms.rpc.tests.utils import APITestCase
+from tcms.testcases.models import BugSystem
+from tcms.testruns.models import IssueReportJob
+from tcms.tests.factories import TestExecutionFactory, UserFactory
 
 if "tcms.bugs.apps.AppConfig" not in settings.INSTALLED_APPS:
     raise unittest.SkipTest("tcms.bugs is disabled")
 
 
+def create_bug_systems(*base_urls):
+    for base_url in base_urls:
+        BugSystem.objects.create(
+            name=base_url,
+            tracker_type="tcms.issuetracker.types.JIRA",
+            base_url=base_url,
+        )
+
+
 class TestBug(APITestCase):
     def _fixture_setup(self):
         super()._fixture_setup()
+        create_bug_systems("http://some.url")
         self.url = "http://some.url"
         self.expected_result = {
             "title": "Bug from cache",
             "description": "This bug came from the Django cache",
         }
 
-    @patch("tcms.rpc.api.bug.tracker_from_url")
-    def test_get_details_from_tracker(self, tracker_from_url):
+    @patch("tcms.rpc.api.bug._tracker_for")
+    def test_get_details_from_tracker(self, tracker_for):
         returned_tracker = MagicMock()
         returned_tracker.details.return_value = self.expected_result
-        tracker_from_url.return_value = returned_tracker
+        tracker_for.return_value = returned_tracker
 
         result = self.rpc_client.Bug.details(self.url)
 
@@ -44,17 +64,312 @@ class TestBug(APITestCase):
             }
         }
     )
-    @patch("tcms.rpc.api.bug.tracker_from_url")
-    def test_get_details_from_cache(self, tracker_from_url):
+    @patch("tcms.rpc.api.bug._tracker_for")
+    def test_get_details_from_cache(self, tracker_for):
         cache.set(self.url, self.expected_result)
 
         result = self.rpc_client.Bug.details(self.url)
 
         self.assertEqual(result, self.expected_result)
-        tracker_from_url.assert_not_called()
+        tracker_for.assert_not_called()
 
     def test_empty_details_when_tracker_does_not_exist(self):
         url = "http://unknown-tracker.url"
 
         result = self.rpc_client.Bug.details(url)
         self.assertEqual(result, {})
+
+
+class TestBugDetailsMany(APITestCase):
+    def _fixture_setup(self):
+        super()._fixture_setup()
+        create_bug_systems("http://tracker.example.com", "http://other.example.com")
+        self.cached_url = "http://tracker.example.com/1"
+        self.urls = [
+            self.cached_url,
+            "http://tracker.example.com/2",
+            "http://tracker.example.com/3",
+            "http://other.example.com/4",
+        ]
+
+    @staticmethod
+    def details(url):
+        if url.endswith("3"):
+            raise RuntimeError("Tracker is down")
+        return {"title": f"Bug at {url}", "description": ""}
+
+    # override the cache settings, because by default we are using DummyCache,
+    # which satisfies the interface, but does no caching
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "kiwitcms",
+                "TIMEOUT": 3600,
+            }
+        }
+    )
+    @patch("tcms.rpc.api.bug._tracker_for")
+    def test_cached_and_fetched_details(self, tracker_for):
+        cache.set(self.cached_url, {"title": "From cache", "description": ""})
+        returned_tracker = MagicMock()
+        returned_tracker.details.side_effect = self.details
+        tracker_for.return_value = returned_tracker
+
+        with self.assertLogs("tcms.rpc.api.bug", level="ERROR"):
+            result = self.rpc_client.Bug.details_many(self.urls)
+
+        self.assertEqual(result[self.cached_url]["title"], "From cache")
+        self.assertEqual(
+            result["http://tracker.example.com/2"]["title"],
+            "Bug at http://tracker.example.com/2",
+        )
+        # failure for one URL doesn't fail the rest
+        self.assertEqual(result["http://tracker.example.com/3"], {})
+        self.assertEqual(
+            result["http://other.example.com/4"]["title"],
+            "Bug at http://other.example.com/4",
+        )
+        self.assertEqual(returned_tracker.details.call_count, 3)
+
+        # fetched details are cached, failures are not
+        self.assertIsNotNone(cache.get("http://tracker.example.com/2"))
+        self.assertIsNone(cache.get("http://tracker.example.com/3"))
+        cache.clear()
+
+    def test_unknown_trackers(self):
+        url = "http://unknown-tracker.url"
+
+        result = self.rpc_client.Bug.details_many([url])
+        self.assertEqual(result, {url: {}})
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "kiwitcms",
+            "TIMEOUT": 3600,
+        }
+    },
+    EXTERNAL_ISSUE_DETAILS_PER_HOST=1,
+    EXTERNAL_ISSUE_CIRCUIT_BREAKER_THRESHOLD=2,
+)
+class TestBugDetailsResilience(APITestCase):
+    def _fixture_setup(self):
+        super()._fixture_setup()
+        create_bug_systems("http://down.example.com", "http://tracker.example.com")
+        self.tracker = MagicMock()
+        self.tracker.details.return_value = {
+            "title": "Fresh details",
+            "description": "",
+        }
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    @patch("tcms.rpc.api.bug._tracker_for")
+    def test_failures_are_cached(self, tracker_for):
+        tracker_for.return_value = self.tracker
+        self.tracker.details.side_effect = RuntimeError("Tracker is down")
+
+        with self.assertLogs("tcms.rpc.api.bug", level="ERROR") as logs:
+            self.assertEqual(
+                self.rpc_client.Bug.details("http://down.example.com/1"), {}
+            )
+        self.assertIn("Tracker is down", logs.output[0])
+        self.assertEqual(self.rpc_client.Bug.details("http://down.example.com/1"), {})
+
+        self.assertEqual(self.tracker.details.call_count, 1)
+
+    @patch("tcms.rpc.api.bug._tracker_for")
+    def test_failing_tracker_is_not_contacted(self, tracker_for):
+        tracker_for.return_value = self.tracker
+        self.tracker.details.side_effect = RuntimeError("Tracker is down")
+        urls = [
+            "http://down.example.com/1",
+            "http://down.example.com/2",
+            "http://down.example.com/3",
+        ]
+
+        with self.assertLogs("tcms.rpc.api.bug", level="ERROR"):
+            result = self.rpc_client.Bug.details_many(urls)
+
+        self.assertEqual(result, {url: {} for url in urls})
+        # circuit is open after the 2nd failure
+        self.assertEqual(self.tracker.details.call_count, 2)
+
+    @patch("tcms.rpc.api.bug._tracker_for")
+    def test_worker_failures_are_logged(self, tracker_for):
+        tracker_for.side_effect = BugSystem.DoesNotExist("Deleted in the meantime")
+
+        with self.assertLogs("tcms.rpc.api.bug", level="ERROR"):
+            result = self.rpc_client.Bug.details("http://down.example.com/1")
+
+        self.assertEqual(result, {})
+        tracker_for.assert_called_once_with(
+            BugSystem.objects.get(base_url="http://down.example.com").pk
+        )
+
+    @patch("tcms.rpc.api.bug._fetch_in_parallel", wraps=_fetch_in_parallel)
+    @patch("tcms.rpc.api.bug._tracker_for")
+    def test_stale_details_are_refreshed_in_background(
+        self, tracker_for, fetch_in_parallel
+    ):
+        url = "http://tracker.example.com/1"
+        tracker_for.return_value = self.tracker
+        cache.set(url, {"title": "Stale details", "description": ""})
+        cache.set(FETCHED_AT_KEY.format(url), time.time() - 3000)
+
+        result = self.rpc_client.Bug.details(url)
+
+        self.assertEqual(result["title"], "Stale details")
+        refreshed = False
+        for call in fetch_in_parallel.call_args_list:
+            to_fetch = call[0][0]
+            for urls in to_fetch.values():
+                refreshed |= url in urls and call[1] == {"wait": False}
+        self.assertTrue(refreshed)
+
+        # another request doesn't trigger a second refresh
+        fetch_in_parallel.reset_mock()
+        self.rpc_client.Bug.details(url)
+        self.assertEqual(fetch_in_parallel.call_args_list[0][0][0], {})
+
+
+class TestReportAsync(APITestCase):
+    def _fixture_setup(self):
+        super()._fixture_setup()
+        self.execution = TestExecutionFactory()
+        self.bug_system = BugSystem.objects.create(
+            name="Slow tracker",
+            tracker_type="tcms.issuetracker.types.JIRA",
+            base_url="https://slow.example.com",
+        )
+        self.tracker = MagicMock()
+        self.tracker.is_adding_testcase_to_issue_disabled.return_value = False
+        self.tracker.report_issue_from_testexecution.return_value = (
+            "https://slow.example.com/issues/1"
+        )
+
+    @patch("tcms.rpc.api.bug.import_string")
+    def test_report_async(self, import_string):
+        import_string.return_value.return_value = self.tracker
+
+        job = self.rpc_client.Bug.report_async(self.execution.pk, self.bug_system.pk)
+        self.assertEqual(job["status"], IssueReportJob.PENDING)
+
+        # reported synchronously b/c EXTERNAL_ISSUE_REPORT_WORKERS = 0
+        result = self.rpc_client.Bug.report_status(job["job_id"])
+        self.assertEqual(result["status"], IssueReportJob.FINISHED)
+        self.assertEqual(result["rc"], 0)
+        self.assertEqual(result["response"], "https://slow.example.com/issues/1")
+        self.tracker.report_issue_from_testexecution.assert_called_once_with(
+            self.execution, self.api_user
+        )
+        # the tracker doesn't receive the request
+        import_string.return_value.assert_called_once_with(self.bug_system, None)
+
+    @override_settings(EXTERNAL_ISSUE_REPORT_WORKERS=1)
+    @patch("tcms.rpc.api.bug.import_string")
+    def test_report_in_background(self, import_string):
+        import_string.return_value.return_value = self.tracker
+
+        job = self.rpc_client.Bug.report_async(self.execution.pk, self.bug_system.pk)
+
+        retries = 0
+        result = job
+        while result["status"] != IssueReportJob.FINISHED:
+            retries += 1
+            self.assertLess(retries, 50)
+            time.sleep(0.1)
+            result = self.rpc_client.Bug.report_status(job["job_id"])
+
+        self.assertEqual(result["rc"], 0)
+        self.assertEqual(result["response"], "https://slow.example.com/issues/1")
+
+    @patch("tcms.rpc.api.bug.import_string")
+    def test_failed_report(self, import_string):
+        import_string.return_value.return_value = self.tracker
+        self.tracker.report_issue_from_testexecution.side_effect = RuntimeError(
+            "Tracker is down"
+        )
+
+        with self.assertLogs("tcms.rpc.api.bug", level="ERROR"):
+            job = self.rpc_client.Bug.report_async(
+                self.execution.pk, self.bug_system.pk
+            )
+
+        result = self.rpc_client.Bug.report_status(job["job_id"])
+        self.assertEqual(result["status"], IssueReportJob.FINISHED)
+        self.assertEqual(result["rc"], 1)
+        self.assertEqual(result["response"], "Tracker is down")
+
+    def test_job_is_finished_when_loading_it_fails(self):
+        job = IssueReportJob.objects.create(
+            execution=self.execution,
+            bug_system=self.bug_system,
+            reporter=self.api_user,
+        )
+
+        with patch.object(
+            IssueReportJob.objects,
+            "select_related",
+            side_effect=RuntimeError("Connection lost"),
+        ), self.assertLogs("tcms.rpc.api.bug", level="ERROR"):
+            call_command("report_issues", stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, IssueReportJob.FINISHED)
+        self.assertEqual(job.rc, 1)
+        self.assertEqual(job.response, "Connection lost")
+
+    @patch("tcms.rpc.api.bug.import_string")
+    def test_pending_jobs_are_reported_by_command(self, import_string):
+        import_string.return_value.return_value = self.tracker
+        job = IssueReportJob.objects.create(
+            execution=self.execution,
+            bug_system=self.bug_system,
+            reporter=self.api_user,
+        )
+        output = StringIO()
+
+        call_command("report_issues", stdout=output)
+
+        self.assertIn("1 issue(s) reported, 0 interrupted", output.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, IssueReportJob.FINISHED)
+        self.assertEqual(job.rc, 0)
+        self.assertEqual(job.response, "https://slow.example.com/issues/1")
+
+    @patch("tcms.rpc.api.bug.import_string")
+    def test_interrupted_jobs_are_finished_by_command(self, import_string):
+        import_string.return_value.return_value = self.tracker
+        job = IssueReportJob.objects.create(
+            execution=self.execution,
+            bug_system=self.bug_system,
+            reporter=self.api_user,
+            status=IssueReportJob.RUNNING,
+            started_at=timezone.now() - timedelta(hours=1),
+        )
+        output = StringIO()
+
+        call_command("report_issues", stdout=output)
+
+        self.assertIn("0 issue(s) reported, 1 interrupted", output.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, IssueReportJob.FINISHED)
+        self.assertEqual(job.rc, 1)
+        # may have been reported already, don't try again
+        self.tracker.report_issue_from_testexecution.assert_not_called()
+
+    def test_status_of_jobs_reported_by_others_is_hidden(self):
+        job = IssueReportJob.objects.create(
+            execution=self.execution,
+            bug_system=self.bug_system,
+            reporter=UserFactory(),
+        )
+
+        with self.assertRaisesRegex(XmlRPCFault, "does not exist"):
+            self.rpc_client.Bug.report_status(job.pk)
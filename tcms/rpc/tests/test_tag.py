@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=attribute-defined-outside-init
 
+from unittest.mock import patch
+from xmlrpc.client import Fault as XmlRPCFault
+from xmlrpc.client import MultiCall
+
 from django.conf import settings
+from django.db import transaction
 
 from tcms.rpc.tests.utils import APITestCase
 from tcms.tests.factories import TagFactory
@@ -58,3 +63,20 @@ class Tag(APITestCase):
         self.assertIn("case", test_tag[0])
         self.assertIn("plan", test_tag[0])
         self.assertIn("run", test_tag[0])
+
+    def test_multicall(self):
+        multicall = MultiCall(self.rpc_client)
+        multicall.Tag.filter({"name": "python"})
+        multicall.Tag.filter({"non_existing_field": "python"})
+        multicall.Tag.filter({"name": "db"})
+        with patch(
+            "tcms.handlers.transaction.atomic", wraps=transaction.atomic
+        ) as atomic:
+            results = multicall()
+
+        # the batch and a savepoint for each call
+        self.assertEqual(atomic.call_count, 4)
+        self.assertEqual(results[0][0]["id"], self.tag_python.pk)
+        with self.assertRaises(XmlRPCFault):
+            results[1]  # pylint: disable=pointless-statement
+        self.assertEqual(results[2][0]["id"], self.tag_db.pk)
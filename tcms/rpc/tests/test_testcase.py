@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-# pylint: disable=attribute-defined-outside-init
+# pylint: disable=attribute-defined-outside-init, too-many-lines
 
 import unittest
 from datetime import timedelta
@@ -177,12 +177,30 @@ class TestCaseFilter(APITestCase):
         self.assertIn("setup_duration", result[0])
         self.assertIn("testing_duration", result[0])
         self.assertIn("expected_duration", result[0])
+        self.assertNotIn("text_html", result[0])
+
+    def test_filter_with_optional_fields(self):
+        result = self.rpc_client.TestCase.filter(
+            {"pk": self.cases[0].pk}, ["text_html"]
+        )
+
+        self.assertEqual({"id", "text_html"}, set(result[0].keys()))
 
     def test_filter_by_product_id(self):
         cases = self.rpc_client.TestCase.filter({"category__product": self.product.pk})
         self.assertIsNotNone(cases)
         self.assertEqual(len(cases), self.cases_count)
 
+    def test_filter_with_fields_and_pagination(self):
+        query = {"category__product": self.product.pk}
+        page_1 = self.rpc_client.TestCase.filter(query, ["summary"], 6)
+        last_id = page_1[-1]["id"]
+        page_2 = self.rpc_client.TestCase.filter(query, ["summary"], 6, last_id)
+
+        self.assertEqual((6, 4), (len(page_1), len(page_2)))
+        self.assertEqual({"id", "summary"}, set(page_2[0].keys()))
+        self.assertLess(last_id, page_2[0]["id"])
+
     @parameterized.expand(
         [
             ("both_values_are_not_set", {}, None, None, 0),
@@ -224,6 +242,75 @@ class TestCaseFilter(APITestCase):
         self.assertEqual(result[0]["expected_duration"], expected_duration)
 
 
+class TestCaseSearch(APITestCase):
+    def _fixture_setup(self):
+        super()._fixture_setup()
+
+        self.category = CategoryFactory()
+        self.login_case = TestCaseFactory(
+            summary="Login with valid password",
+            text="Open the login page and enter the password",
+            category=self.category,
+        )
+        self.logout_case = TestCaseFactory(
+            summary="Logout",
+            text="Login first, then press logout",
+            category=self.category,
+        )
+        self.other_case = TestCaseFactory(summary="Login from another product")
+
+        # TestCaseFactory mutes post_save which updates the search index
+        for test_case in (self.login_case, self.logout_case, self.other_case):
+            test_case.save()
+
+    def search_ids(self, *args):
+        ids = []
+        for test_case in self.rpc_client.TestCase.search(*args):
+            ids.append(test_case["id"])
+        return ids
+
+    def test_results_are_ranked(self):
+        result = self.rpc_client.TestCase.search("LOGIN")
+
+        self.assertEqual(
+            [self.login_case.pk, self.other_case.pk, self.logout_case.pk],
+            self.search_ids("LOGIN"),
+        )
+        self.assertGreater(result[0]["rank"], result[2]["rank"])
+        self.assertEqual(result[0]["summary"], "Login with valid password")
+
+    def test_all_words_must_match(self):
+        self.assertEqual([self.login_case.pk], self.search_ids("login password"))
+
+    def test_filters_and_limit(self):
+        result = self.rpc_client.TestCase.search(
+            "login", {"category": self.category.pk}, 1, ["summary"]
+        )
+
+        self.assertEqual(
+            [
+                {
+                    "id": self.login_case.pk,
+                    "summary": self.login_case.summary,
+                    "rank": result[0]["rank"],
+                }
+            ],
+            result,
+        )
+
+    def test_index_follows_changes(self):
+        self.logout_case.summary = "Sign out"
+        self.logout_case.text = "Press the button"
+        self.logout_case.save()
+        self.other_case.delete()
+
+        self.assertEqual([self.login_case.pk], self.search_ids("login"))
+        self.assertEqual([self.logout_case.pk], self.search_ids("sign out"))
+
+    def test_no_words(self):
+        self.assertEqual([], self.rpc_client.TestCase.search("  ?! "))
+
+
 class TestUpdate(APITestCase):
     non_existing_username = "FakeUsername"
     non_existing_user_id = 999
@@ -99,6 +99,32 @@ class TestExecutionAddComment(APITestCase):
         self.assertEqual(created_comment["comment"], first_comment.comment)
 
 
+class TestExecutionAddCommentMany(APITestCase):
+    """Test TestExecution.add_comment_many"""
+
+    def _fixture_setup(self):
+        super()._fixture_setup()
+
+        self.executions = []
+        for _i in range(3):
+            self.executions.append(TestExecutionFactory())
+
+    def test_add_comment_many(self):
+        execution_ids = []
+        for execution in self.executions:
+            execution_ids.append(execution.pk)
+
+        created = self.rpc_client.TestExecution.add_comment_many(
+            execution_ids + [-1], "Same failure"
+        )
+
+        self.assertEqual(3, len(created))
+        for execution in self.executions:
+            execution_comments = comments.get_comments(execution)
+            self.assertEqual(1, execution_comments.count())
+            self.assertEqual("Same failure", execution_comments.first().comment)
+
+
 class TestExecutionRemoveComment(APITestCase):
     """Test TestExecution.remove_comment"""
 
@@ -818,3 +844,97 @@ class TestExecutionUpdateStatus(APITestCase):
 
         run.refresh_from_db()
         self.assertIsNone(run.stop_date)
+
+
+@override_settings(LANGUAGE_CODE="en")
+class TestExecutionBulkUpdate(APITestCase):
+    def _fixture_setup(self):
+        super()._fixture_setup()
+
+        self.test_run = TestRunFactory(stop_date=None)
+        self.status_positive = TestExecutionStatus.objects.filter(weight__gt=0).last()
+        self.status_in_progress = TestExecutionStatus.objects.filter(weight=0).last()
+        self.execution_1 = TestExecutionFactory(
+            run=self.test_run, tested_by=None, status=self.status_in_progress
+        )
+        self.execution_2 = TestExecutionFactory(
+            run=self.test_run, tested_by=None, status=self.status_in_progress
+        )
+
+    def test_update_status_by_ids(self):
+        result = self.rpc_client.TestExecution.bulk_update(
+            [self.execution_1.pk, self.execution_2.pk],
+            {"status": self.status_positive.pk},
+        )
+
+        self.assertEqual(2, len(result))
+        for execution in [self.execution_1, self.execution_2]:
+            execution.refresh_from_db()
+            self.assertEqual(execution.status, self.status_positive)
+            self.assertEqual(execution.tested_by, self.api_user)
+            self.assertEqual(execution.build, self.test_run.build)
+            self.assertIsNotNone(execution.stop_date)
+
+        # all executions are completed
+        self.test_run.refresh_from_db()
+        self.assertIsNotNone(self.test_run.stop_date)
+
+    def test_update_by_query(self):
+        self.rpc_client.TestExecution.bulk_update(
+            {"run": self.test_run.pk}, {"assignee": self.api_user.username}
+        )
+
+        for execution in [self.execution_1, self.execution_2]:
+            execution.refresh_from_db()
+            self.assertEqual(execution.assignee, self.api_user)
+            self.assertEqual(execution.status, self.status_in_progress)
+
+    def test_update_writes_history(self):
+        self.rpc_client.TestExecution.bulk_update(
+            [self.execution_1.pk], {"status": self.status_positive.pk}
+        )
+
+        self.assertEqual(2, self.execution_1.history.count())
+        latest = self.execution_1.history.latest()
+        self.assertEqual(latest.history_user, self.api_user)
+        self.assertEqual(latest.history_type, "~")
+        self.assertIn(f"+{self.status_positive.pk}", latest.history_change_reason)
+        # the other execution was not modified
+        self.assertEqual(1, self.execution_2.history.count())
+
+    def test_update_case_text_version_to_latest(self):
+        self.execution_1.case.text = "Text Updated"
+        self.execution_1.case.save()
+
+        self.rpc_client.TestExecution.bulk_update(
+            [self.execution_1.pk], {"case_text_version": "latest"}
+        )
+
+        self.execution_1.refresh_from_db()
+        self.assertEqual(
+            self.execution_1.case.history.latest().history_id,
+            self.execution_1.case_text_version,
+        )
+
+    def test_neutral_status_reopens_run(self):
+        self.test_run.stop_date = timezone.now()
+        self.test_run.save()
+
+        self.rpc_client.TestExecution.bulk_update(
+            [self.execution_1.pk], {"status": self.status_in_progress.pk}
+        )
+
+        self.test_run.refresh_from_db()
+        self.assertIsNone(self.test_run.stop_date)
+
+    def test_update_with_invalid_values(self):
+        with self.assertRaisesRegex(XmlRPCFault, "Select a valid choice"):
+            self.rpc_client.TestExecution.bulk_update(
+                [self.execution_1.pk], {"build": 1111111}
+            )
+
+    def test_update_with_non_existing_ids(self):
+        result = self.rpc_client.TestExecution.bulk_update(
+            [-1], {"status": self.status_positive.pk}
+        )
+        self.assertEqual([], result)
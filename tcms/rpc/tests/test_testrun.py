@@ -85,6 +85,82 @@ class TestAddCase(APITestCase):
         self.assertFalse(exists)
 
 
+class TestAddCases(APITestCase):
+    def _fixture_setup(self):
+        super()._fixture_setup()
+
+        self.plan = TestPlanFactory(author=self.api_user)
+        self.test_run = TestRunFactory(plan=self.plan)
+
+        confirmed = TestCaseStatus.objects.filter(is_confirmed=True).first()
+        self.test_cases = []
+        for _i in range(3):
+            test_case = TestCaseFactory(case_status=confirmed)
+            test_case.save()  # generate history object
+            self.plan.add_case(test_case)
+            self.test_cases.append(test_case)
+
+        # the first test case is already part of the run
+        self.existing = TestExecutionFactory(
+            run=self.test_run, case=self.test_cases[0], sortkey=50
+        )
+
+    def test_add_cases(self):
+        case_ids = []
+        for test_case in self.test_cases:
+            case_ids.append(test_case.pk)
+
+        executions = self.rpc_client.TestRun.add_cases(self.test_run.pk, case_ids)
+
+        self.assertEqual(3, len(executions))
+        self.assertEqual(3, self.test_run.executions.count())
+        self.assertEqual(self.existing.pk, executions[0]["id"])
+
+        for result, test_case in zip(executions, self.test_cases):
+            self.assertEqual(result["run"], self.test_run.pk)
+            self.assertEqual(result["case"], test_case.pk)
+            self.assertEqual(
+                result["case_text_version"], test_case.history.latest().history_id
+            )
+            self.assertEqual(result["properties"], [])
+
+        # new executions are added at the end of the run
+        self.assertEqual(60, executions[1]["sortkey"])
+        self.assertEqual(70, executions[2]["sortkey"])
+
+    def test_add_cases_with_properties(self):
+        self.test_run.property_set.create(name="os", value="Linux")
+        self.test_run.property_set.create(name="os", value="Windows")
+
+        executions = self.rpc_client.TestRun.add_cases(
+            self.test_run.pk, [self.test_cases[1].pk]
+        )
+
+        # 1 execution for each value in the property matrix
+        self.assertEqual(2, len(executions))
+        values = set()
+        for result in executions:
+            self.assertEqual(1, len(result["properties"]))
+            self.assertEqual("os", result["properties"][0]["name"])
+            values.add(result["properties"][0]["value"])
+            self.assertEqual(
+                1, TestExecution.objects.get(pk=result["id"]).history.count()
+            )
+        self.assertEqual({"Linux", "Windows"}, values)
+
+    def test_add_cases_with_unconfirmed_case_fails(self):
+        test_case = TestCaseFactory(
+            case_status=TestCaseStatus.objects.filter(is_confirmed=False).first()
+        )
+
+        with self.assertRaisesRegex(XmlRPCFault, "status is not confirmed"):
+            self.rpc_client.TestRun.add_cases(
+                self.test_run.pk, [self.test_cases[1].pk, test_case.pk]
+            )
+
+        self.assertEqual(1, self.test_run.executions.count())
+
+
 class TestRemovesCase(APITestCase):
     def _fixture_setup(self):
         super()._fixture_setup()
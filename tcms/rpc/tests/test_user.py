@@ -1,14 +1,18 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=attribute-defined-outside-init, invalid-name, objects-update-used
 
+from base64 import b64encode
 from xmlrpc.client import Fault as XmlRPCFault
 
+from attachments.models import Attachment
+from django.conf import settings
 from django.test import TestCase
 
+from tcms.rpc import utils
 from tcms.rpc.api.user import _get_user_dict
 from tcms.rpc.tests.utils import APITestCase
 from tcms.tests import user_should_have_perm
-from tcms.tests.factories import GroupFactory, UserFactory
+from tcms.tests.factories import GroupFactory, TestCaseFactory, UserFactory
 
 
 class TestUserSerializer(TestCase):
@@ -201,3 +205,54 @@ class TestUserUpdate(APITestCase):
             XmlRPCFault, "Password updates for other users are not allowed via RPC!"
         ):
             self.rpc_client.User.update(self.another_user.pk, user_new_attrs)
+
+
+class TestUserAddAttachment(APITestCase):
+    """Test User.add_attachment"""
+
+    def _fixture_setup(self):
+        super()._fixture_setup()
+        self.test_case = TestCaseFactory()
+
+    def test_pending_attachments_are_moved_on_save(self):
+        self.rpc_client.User.add_attachment(
+            "screenshot.png", b64encode(b"image").decode()
+        )
+        self.assertEqual(
+            Attachment.objects.attachments_for_object(self.api_user).count(), 1
+        )
+
+        self.rpc_client.TestCase.update(self.test_case.pk, {"summary": "Updated"})
+
+        self.assertEqual(
+            Attachment.objects.attachments_for_object(self.api_user).count(), 0
+        )
+        self.assertEqual(
+            Attachment.objects.attachments_for_object(self.test_case).count(), 1
+        )
+
+        # only files uploaded after the last save are pending
+        test_case = TestCaseFactory()
+        self.rpc_client.TestCase.update(test_case.pk, {"summary": "Updated"})
+        self.assertEqual(
+            Attachment.objects.attachments_for_object(test_case).count(), 0
+        )
+
+    def test_attachments_without_pending_flag_are_moved(self):
+        # e.g. uploaded before the session flag was introduced
+        utils.add_attachment(
+            self.api_user.pk,
+            settings.AUTH_USER_MODEL,
+            self.api_user,
+            "screenshot.png",
+            b64encode(b"image").decode(),
+        )
+
+        self.rpc_client.TestCase.update(self.test_case.pk, {"summary": "Updated"})
+
+        self.assertEqual(
+            Attachment.objects.attachments_for_object(self.api_user).count(), 0
+        )
+        self.assertEqual(
+            Attachment.objects.attachments_for_object(self.test_case).count(), 1
+        )
@@ -0,0 +1,136 @@
+import json
+import time
+from unittest.mock import patch
+
+from django import test
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from tcms.issuetracker.types import GitHub, Redmine
+from tcms.rpc.api.utils import TRACKER_INDEX, TRACKER_INDEX_TTL, tracker_from_url
+from tcms.testcases.models import BugSystem
+from tcms.tests.factories import UserFactory
+
+
+class TestTrackerFromUrl(test.TransactionTestCase):
+    serialized_rollback = True
+
+    def setUp(self):
+        super().setUp()
+        self.redmine = BugSystem.objects.create(
+            name="Redmine",
+            tracker_type="tcms.issuetracker.types.Redmine",
+            base_url="https://tcms.example.com",
+        )
+        self.github = BugSystem.objects.create(
+            name="GitHub",
+            tracker_type="tcms.issuetracker.types.GitHub",
+            base_url="https://tcms.example.com/github/",
+        )
+
+    def tearDown(self):
+        # flushing the database doesn't send post_delete
+        TRACKER_INDEX.invalidate()
+        super().tearDown()
+
+    def test_longest_base_url_wins(self):
+        tracker = tracker_from_url("https://tcms.example.com/github/1", None)
+        self.assertIsInstance(tracker, GitHub)
+        self.assertEqual(tracker.bug_system, self.github)
+
+        tracker = tracker_from_url("https://tcms.example.com/bugs/1", None)
+        self.assertIsInstance(tracker, Redmine)
+        self.assertEqual(tracker.bug_system, self.redmine)
+
+    def test_unknown_url(self):
+        self.assertIsNone(tracker_from_url("https://unknown.example.com/1", None))
+
+    def test_index_is_reused(self):
+        tracker_from_url("https://tcms.example.com/bugs/1", None)
+
+        with self.assertNumQueries(0):
+            tracker_from_url("https://tcms.example.com/bugs/2", None)
+
+    def test_index_is_reused_inside_transaction(self):
+        with transaction.atomic():
+            tracker_from_url("https://tcms.example.com/bugs/1", None)
+
+            with self.assertNumQueries(0):
+                tracker_from_url("https://tcms.example.com/bugs/2", None)
+
+    def test_rolled_back_changes_expire(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.github.base_url = "https://github.com/"
+                self.github.save()
+                tracker = tracker_from_url("https://github.com/kiwitcms/1", None)
+                self.assertEqual(tracker.bug_system, self.github)
+
+                raise RuntimeError("roll back")
+
+        with patch(
+            "tcms.rpc.api.utils.time.monotonic",
+            return_value=time.monotonic() + TRACKER_INDEX_TTL,
+        ):
+            self.assertIsNone(tracker_from_url("https://github.com/kiwitcms/1", None))
+            tracker = tracker_from_url("https://tcms.example.com/github/1", None)
+        self.assertEqual(tracker.bug_system, self.github)
+
+    def test_bug_systems_are_not_shared(self):
+        first = tracker_from_url("https://tcms.example.com/bugs/1", None)
+        second = tracker_from_url("https://tcms.example.com/bugs/2", None)
+
+        self.assertEqual(first.bug_system, second.bug_system)
+        self.assertIsNot(first.bug_system, second.bug_system)
+
+    def bug_system_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                "/json-rpc/",
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "Bug.details",
+                        "params": ["https://tcms.example.com/github/1"],
+                        "id": 1,
+                    }
+                ),
+                content_type="application/json",
+            )
+        self.assertEqual(json.loads(response.content)["result"], {})
+
+        queries = []
+        for query in context.captured_queries:
+            if BugSystem._meta.db_table in query["sql"]:
+                queries.append(query)
+        return queries
+
+    def test_index_is_reused_by_rpc_methods(self):
+        self.client.force_login(UserFactory())
+
+        with patch("tcms.rpc.api.bug._fetch_one", return_value={}):
+            self.assertEqual(len(self.bug_system_queries()), 1)
+            self.assertEqual(len(self.bug_system_queries()), 0)
+
+    def test_index_is_rebuilt_on_changes(self):
+        tracker_from_url("https://tcms.example.com/github/1", None)
+
+        self.github.base_url = "https://github.com/"
+        self.github.save()
+        tracker = tracker_from_url("https://github.com/kiwitcms/Kiwi/issues/1", None)
+        self.assertEqual(tracker.bug_system, self.github)
+
+        self.redmine.delete()
+        self.assertIsNone(tracker_from_url("https://tcms.example.com/bugs/1", None))
+
+    def test_trackers_are_reused_during_request(self):
+        request = RequestFactory().get("/")
+
+        first = tracker_from_url("https://tcms.example.com/bugs/1", request)
+        second = tracker_from_url("https://tcms.example.com/bugs/2", request)
+
+        self.assertIs(first, second)
+        self.assertIsNot(
+            first, tracker_from_url("https://tcms.example.com/bugs/3", None)
+        )
@@ -95,3 +95,43 @@ def add_attachment(obj_id, app_model, user, filename, b64content):
     response = attachment_views.add_attachment(request, app, model, obj_id)
     if response.status_code == 404:
         raise RuntimeError(f"Adding attachment to {app_model}({obj_id}) failed")
+
+
+def values_page(  # pylint: disable=too-many-arguments
+    queryset, fields, projection=None, limit=None, after=None, optional_fields=()
+):
+    """
+    Serialize ``queryset`` into a list of dictionaries containing ``fields``.
+
+    ``projection`` is an optional subset of ``fields`` to return. The primary key,
+    which must be the first item in ``fields``, is always included! A ValueError
+    is raised for unknown field names.
+
+    ``optional_fields`` are returned only when they are part of ``projection``,
+    e.g. large columns which most callers don't need.
+
+    ``limit`` and ``after`` enable keyset pagination, where ``after`` is the
+    primary key of the last row from the previous page. When paginating results
+    are always ordered by primary key.
+    """
+    if projection:
+        unknown = set(projection) - set(fields) - set(optional_fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        pk_field = fields[0]
+        fields = [pk_field]
+        for field in projection:
+            if field not in fields:
+                fields.append(field)
+
+    queryset = queryset.values(*fields)
+
+    if limit or after:
+        queryset = queryset.order_by("pk")
+    if after:
+        queryset = queryset.filter(pk__gt=after)
+    if limit:
+        queryset = queryset[:limit]
+
+    return list(queryset)
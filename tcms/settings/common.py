@@ -73,6 +73,22 @@ EMAIL_SUBJECT_PREFIX = "[Kiwi-TCMS] "
 #  EMAIL_HOST_USER = 'smtp_username'
 #  EMAIL_HOST_PASSWORD = 'smtp_password'
 
+# Notifications are stored in the database and delivered by this many
+# background threads after the transaction commits. When set to 0 they are
+# sent synchronously instead. Failed messages are retried up to
+# EMAIL_OUTBOX_MAX_ATTEMPTS times, also see `manage.py send_emails`
+EMAIL_OUTBOX_WORKERS = 1
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+# When > 0 notifications about updated test plans, test cases and
+# test runs are buffered for this many minutes and combined into a
+# single email per recipient
+EMAIL_DIGEST_MINUTES = 0
+
+# Dotted path to the full-text search backend, see tcms.core.search.
+# When None it is chosen based on the database vendor
+SEARCH_BACKEND = None
+
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # ~~ You may want to override the following settings as well
@@ -148,6 +164,12 @@ CACHES = {
     }
 }
 
+# Up to MARKDOWN_CACHE_SIZE recently rendered Markdown texts are kept in memory
+# by each process, all of them are kept in the cache above for
+# MARKDOWN_CACHE_TIMEOUT seconds
+MARKDOWN_CACHE_SIZE = 1024
+MARKDOWN_CACHE_TIMEOUT = 86400
+
 # Absolute path to the directory static files should be collected to.
 # Don't put anything in this directory yourself; store your static files
 # in apps' "static/" subdirectories and in STATICFILES_DIRS.
@@ -185,6 +207,47 @@ AZURE_BOARDS_API_VERSION = os.environ.get("AZURE_BOARDS_API_VERSION", "6.0")
 # tcms.issuetracker.tests.redmine_post_processing for hints!
 EXTERNAL_ISSUE_POST_PROCESSORS = []
 
+# Connections to external bug trackers are reused across requests. At most
+# EXTERNAL_ISSUE_RPC_CACHE_SIZE of them are kept and each one is re-created
+# after EXTERNAL_ISSUE_RPC_CACHE_TTL seconds.
+# See tcms.issuetracker.base.ConnectionCache
+EXTERNAL_ISSUE_RPC_CACHE_SIZE = 32
+EXTERNAL_ISSUE_RPC_CACHE_TTL = 3600
+
+# When > 0 test executions which are linked to the same defect within
+# EXTERNAL_ISSUE_COMMENT_DELAY seconds are added to the issue tracker with a
+# single comment from a background thread. Pending comments are stored in the
+# database and failed ones are retried up to EXTERNAL_ISSUE_COMMENT_MAX_ATTEMPTS
+# times, also see `manage.py post_issue_comments`.
+# See tcms.issuetracker.base.CommentQueue
+EXTERNAL_ISSUE_COMMENT_DELAY = 0
+EXTERNAL_ISSUE_COMMENT_MAX_ATTEMPTS = 5
+
+# Number of background threads which report issues requested via the
+# Bug.report_async RPC method. When 0 issues are reported synchronously!
+# Jobs which are still running after EXTERNAL_ISSUE_REPORT_TIMEOUT seconds
+# are considered interrupted, also see `manage.py report_issues`.
+EXTERNAL_ISSUE_REPORT_WORKERS = 2
+EXTERNAL_ISSUE_REPORT_TIMEOUT = 600
+
+# Bug.details_many() fetches the details for up to EXTERNAL_ISSUE_DETAILS_WORKERS
+# URLs in parallel but not more than EXTERNAL_ISSUE_DETAILS_PER_HOST from the
+# same host at a time, this limit is shared by all calls in the same process
+EXTERNAL_ISSUE_DETAILS_WORKERS = 8
+EXTERNAL_ISSUE_DETAILS_PER_HOST = 2
+
+# Bug details older than EXTERNAL_ISSUE_DETAILS_FRESH_FOR seconds are refreshed
+# in the background while the cached version is still shown. Failures to fetch
+# details are remembered for EXTERNAL_ISSUE_DETAILS_FAILURE_TTL seconds.
+EXTERNAL_ISSUE_DETAILS_FRESH_FOR = 600
+EXTERNAL_ISSUE_DETAILS_FAILURE_TTL = 300
+
+# After EXTERNAL_ISSUE_CIRCUIT_BREAKER_THRESHOLD consecutive failures a bug tracker
+# isn't contacted for EXTERNAL_ISSUE_CIRCUIT_BREAKER_COOLDOWN seconds.
+# See tcms.issuetracker.base.CircuitBreaker
+EXTERNAL_ISSUE_CIRCUIT_BREAKER_THRESHOLD = 5
+EXTERNAL_ISSUE_CIRCUIT_BREAKER_COOLDOWN = 60
+
 # Controls the default issue type for newly created issues in Jira.
 # See JIRA.get_issue_from_jira() method
 JIRA_ISSUE_TYPE = "Bug"
@@ -474,6 +537,15 @@ SET_ADMIN_AS_SUPERUSER = False
 # depend on this setting!
 SIMPLE_HISTORY_HISTORY_CHANGE_REASON_USE_TEXT_FIELD = True
 
+# Calculate history_change_reason in the background after the historical
+# record has been saved. Makes saving objects with large text fields faster.
+HISTORY_DIFF_ASYNC = False
+
+# Dotted path to a callable which returns a concurrent.futures.Executor
+# used when HISTORY_DIFF_ASYNC is enabled, e.g. a pool of worker processes.
+# Defaults to a single background thread inside the current process!
+HISTORY_DIFF_EXECUTOR = None
+
 # Default page size when paginating queries
 DEFAULT_PAGE_SIZE = 100
 
@@ -30,6 +30,12 @@ DATABASES = {
 }
 
 
+# deliver email notifications without background threads
+EMAIL_OUTBOX_WORKERS = 0
+# same for issues reported via Bug.report_async
+EXTERNAL_ISSUE_REPORT_WORKERS = 0
+
+
 # for running localized tests, see f74c3c1
 # See https://code.djangoproject.com/ticket/29713
 LANGUAGE_CODE = os.environ.get("LANG", "en-us").lower().replace("_", "-").split(".")[0]
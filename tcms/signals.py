@@ -28,6 +28,7 @@ __all__ = [
     "USER_REGISTERED_SIGNAL",
     "notify_admins",
     "pre_save_clean",
+    "pre_save_render_markdown",
     "handle_attachments_pre_delete",
     "handle_attachments_post_save",
     "handle_comments_pre_delete",
@@ -36,6 +37,9 @@ __all__ = [
     "handle_emails_post_plan_save",
     "handle_emails_post_run_save",
     "handle_emails_post_bug_save",
+    "handle_rollups_post_execution_save",
+    "handle_rollups_pre_delete",
+    "handle_rollups_post_run_save",
 ]
 
 
@@ -131,6 +135,17 @@ def pre_save_clean(sender, **kwargs):
     instance.clean()
 
 
+def pre_save_render_markdown(sender, **kwargs):
+    """
+    Store the sanitized HTML of Markdown fields so that it
+    isn't rendered every time an object is displayed!
+    """
+    if kwargs.get("raw", False):
+        return
+
+    kwargs["instance"].render_markdown(kwargs.get("update_fields"))
+
+
 def handle_emails_post_plan_save(sender, instance, created=False, **kwargs):
     """
     Send email updates after a TestPlan has been updated!
@@ -148,8 +163,10 @@ def handle_emails_post_run_save(sender, *_args, **kwargs):
     """
     Send email updates after a TestRus has been created or updated!
     """
+    from django.conf import settings
+
     from tcms.core.history import history_email_for
-    from tcms.core.utils.mailto import mailto
+    from tcms.core.utils.mailto import mail_digest, mailto
 
     if kwargs.get("raw", False):
         return
@@ -167,6 +184,11 @@ def handle_emails_post_run_save(sender, *_args, **kwargs):
         template_name = None
         subject, context = history_email_for(instance, instance.summary)
 
+    # recipients are resolved when the digest is sent
+    if settings.EMAIL_DIGEST_MINUTES:
+        mail_digest(instance, "get_notify_addrs", template_name, subject, context)
+        return
+
     mailto(template_name, subject, instance.get_notify_addrs(), context)
 
 
@@ -236,18 +258,15 @@ def handle_emails_post_bug_save(sender, instance, created=False, **kwargs):
     )
 
 
-def _introspect_request():
+def _current_request():
     """
-    Introspect the current thread b/c signals are executed synchronously
-    after .save() and find out the `request` variable.
+    Return the request being processed by the current thread, if any.
+    Signals are executed synchronously after .save() and the request is
+    exposed by simple_history.middleware.HistoryRequestMiddleware!
     """
-    import inspect
-
-    for frame_record in inspect.stack():
-        if frame_record[3] == "get_response":
-            return frame_record[0].f_locals["request"]
+    from simple_history.models import HistoricalRecords
 
-    return None
+    return getattr(HistoricalRecords.context, "request", None)
 
 
 def handle_attachments_post_save(sender, instance, created=False, **kwargs):
@@ -261,9 +280,85 @@ def handle_attachments_post_save(sender, instance, created=False, **kwargs):
     if kwargs.get("raw", False):
         return
 
-    request = _introspect_request()
+    request = _current_request()
     if not request:
         return
 
+    # set by User.add_attachment(). Sessions which don't have the flag,
+    # e.g. started before it was introduced, are checked once
+    session = getattr(request, "session", {})
+    if not session.get("pending_attachments", True):
+        return
+
     for attachment in Attachment.objects.attachments_for_object(request.user):
         attachment.attach_to(instance)
+    session["pending_attachments"] = False
+
+
+def handle_recipients_post_save(sender, instance, **kwargs):
+    """
+    Forget notification recipients cached during the current request
+    after email settings or test case authors and default testers,
+    which are notified about changes to test plans, may have changed!
+    """
+    from tcms.core.helpers import recipients
+
+    request = _current_request()
+    if request is not None:
+        recipients.clear_request_cache(request)
+
+
+def handle_rollups_post_execution_save(sender, instance, created=False, **kwargs):
+    """
+    Update pre-aggregated telemetry counts after a TestExecution
+    has been created or updated!
+    """
+    from tcms.telemetry import rollups
+
+    if kwargs.get("raw", False) or kwargs.get("called_from_add_comment", False):
+        return
+
+    if created:
+        rollups.record_changes(added=rollups.snapshot([instance]))
+        return
+
+    # loaded by KiwiHistoricalRecords.pre_save()
+    previous = getattr(instance, "previous", None)
+    if previous:
+        keys = rollups.snapshot([previous, instance])
+        rollups.record_changes(keys[:1], keys[1:])
+        # signals sent without saving again don't apply the same change twice
+        instance.previous = None
+
+
+def handle_rollups_pre_delete(sender, instance, origin=None, **kwargs):
+    """
+    Update pre-aggregated telemetry counts before the executions of
+    a TestRun or a TestCase are deleted, with a single aggregate query!
+    Individual TestExecution objects are handled only when deleted
+    directly, not as part of a cascade or a queryset.
+    """
+    from tcms.telemetry import rollups
+    from tcms.testruns.models import TestExecution
+
+    if sender is TestExecution:
+        if origin is instance:
+            rollups.remove_executions(sender.objects.filter(pk=instance.pk))
+        return
+
+    rollups.remove_executions(instance.executions.all())
+
+
+def handle_rollups_post_run_save(sender, instance, created=False, **kwargs):
+    """
+    Update pre-aggregated telemetry counts after a TestRun
+    has been moved to another TestPlan!
+    """
+    from tcms.telemetry import rollups
+
+    if kwargs.get("raw", False) or created:
+        return
+
+    previous = getattr(instance, "previous", None)
+    if previous and previous.plan_id != instance.plan_id:
+        rollups.run_plan_changed(instance.pk, previous.plan_id, instance.plan_id)
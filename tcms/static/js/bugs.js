@@ -32,6 +32,8 @@ export function loadBugs (selector, filter) {
     })
 
     $(selector).on('draw.dt', () => {
+        prefetchBugDetails($(selector).find('.bug-url').toArray().map(link => link.href))
+
         $(selector).find('[data-toggle=popover]')
             .popovers()
             .on('show.bs.popover', (element) => {
@@ -58,11 +60,33 @@ export function fetchBugDetails (source, popover, cache = bugDetailsCache) {
     }
 
     jsonRPC('Bug.details', [source.href], data => {
+        // empty when details can't be fetched at the moment, try again later
+        if (!Object.keys(data).length) {
+            return
+        }
+
         cache[source.href] = data
         assignPopoverData(source, popover, data)
     }, true)
 }
 
+// fetch details for many bugs with a single request
+// so that popovers don't need to wait for them
+export function prefetchBugDetails (urls, cache = bugDetailsCache) {
+    const missing = urls.filter(url => !(url in cache))
+    if (!missing.length) {
+        return
+    }
+
+    jsonRPC('Bug.details_many', [missing], data => {
+        Object.entries(data).forEach(([url, details]) => {
+            if (Object.keys(details).length) {
+                cache[url] = details
+            }
+        })
+    })
+}
+
 export function assignPopoverData (source, popover, data) {
     source.title = data.title
     $(popover).attr('data-original-title', data.title)
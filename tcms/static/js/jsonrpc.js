@@ -33,6 +33,46 @@ export function jsonRPC (rpcMethod, rpcParams, callback, isSync) {
     })
 }
 
+// executes multiple RPC methods with a single HTTP request.
+// calls is a list of [rpcMethod, rpcParams, callback]
+export function jsonRPCBatch (calls) {
+    const payload = []
+
+    calls.forEach(([rpcMethod, rpcParams], index) => {
+        if (!Array.isArray(rpcParams)) {
+            rpcParams = [rpcParams]
+        }
+
+        // ids start from 1 b/c the server treats 0 as missing
+        payload.push({
+            jsonrpc: '2.0',
+            method: rpcMethod,
+            params: rpcParams,
+            id: index + 1
+        })
+    })
+
+    $.ajax({
+        url: '/json-rpc/',
+        data: JSON.stringify(payload),
+        type: 'POST',
+        dataType: 'json',
+        contentType: 'application/json',
+        success: function (results) {
+            results.forEach(result => {
+                if (result.error) {
+                    alert(result.error.message)
+                } else {
+                    calls[result.id - 1][2](result.result)
+                }
+            })
+        },
+        error: function (err, status, thrown) {
+            console.log('*** jsonRPCBatch ERROR: ' + err + ' STATUS: ' + status + ' ' + thrown)
+        }
+    })
+}
+
 // used by DataTables to convert a list of objects to a dict
 // suitable for loading data into the table
 export function dataTableJsonRPC (rpcMethod, rpcParams, callbackF, preProcessData) {
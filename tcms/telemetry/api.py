@@ -1,9 +1,10 @@
-from django.db.models import CharField, Count, Value
+from django.db.models import CharField, Count, Q, Value
 from django.db.models.functions import Concat
 from django.utils.translation import gettext_lazy as _
 from modernrpc.auth.basic import http_basic_auth_login_required
 from modernrpc.core import rpc_method
 
+from tcms.telemetry import rollups
 from tcms.testcases.models import TestCase
 from tcms.testruns.models import TestExecution, TestExecutionStatus
 
@@ -68,15 +69,20 @@ def _map_query_set(query_set, field):
 
 @http_basic_auth_login_required
 @rpc_method(name="Testing.status_matrix")
-def status_matrix(query=None):
+def status_matrix(query=None, compact=False):
     """
-    .. function:: RPC Testing.status_matrix(query)
+    .. function:: RPC Testing.status_matrix(query, compact)
 
         Perform a search and return data_set needed to visualize the status matrix
         of test plans, test cases and test executions
 
         :param query: Field lookups for :class:`tcms.testcases.models.TestPlan`
         :type query: dict
+        :param compact: Return parallel arrays instead of a dictionary of
+                        executions keyed by ``"case_id-run_id"``. Executions
+                        refer to cases and runs by their index in the
+                        respective arrays
+        :type compact: bool
         :return: A dictionary, containing the information about test executions
         :rtype: dict
     """
@@ -85,6 +91,9 @@ def status_matrix(query=None):
 
     base_query = TestExecution.objects.filter(**query)
 
+    if compact:
+        return _compact_status_matrix(base_query)
+
     test_cases = list(
         base_query.values("case_id", "case__summary").order_by("case_id").distinct()
     )
@@ -116,61 +125,100 @@ def status_matrix(query=None):
     }
 
 
+def _compact_status_matrix(base_query):
+    cases = {"id": [], "summary": []}
+    case_index = {}
+    for case_id, summary in (
+        base_query.values_list("case_id", "case__summary")
+        .order_by("case_id")
+        .distinct()
+    ):
+        case_index[case_id] = len(cases["id"])
+        cases["id"].append(case_id)
+        cases["summary"].append(summary)
+
+    runs = {"id": [], "summary": [], "plan": []}
+    run_index = {}
+    for run_id, summary, plan_id in (
+        base_query.values_list("run_id", "run__summary", "run__plan")
+        .order_by("run_id")
+        .distinct()
+    ):
+        run_index[run_id] = len(runs["id"])
+        runs["id"].append(run_id)
+        runs["summary"].append(summary)
+        runs["plan"].append(plan_id)
+
+    executions = {"id": [], "case": [], "run": [], "status": []}
+    for pk, case_id, run_id, status_id in base_query.values_list(
+        "pk", "case_id", "run_id", "status_id"
+    ).order_by("pk"):
+        executions["id"].append(pk)
+        executions["case"].append(case_index[case_id])
+        executions["run"].append(run_index[run_id])
+        executions["status"].append(status_id)
+
+    return {
+        "cases": cases,
+        "executions": executions,
+        "runs": runs,
+        "statusColors": dict(TestExecutionStatus.objects.values_list("pk", "color")),
+    }
+
+
 @http_basic_auth_login_required
 @rpc_method(name="Testing.execution_trends")
 def execution_trends(query=None):
     if query is None:
         query = {}
 
+    counts = rollups.run_status_counts(query)
+    if counts is None:
+        counts = (
+            TestExecution.objects.filter(**query)
+            .values("run_id", "status_id")
+            .annotate(total=Count("pk"))
+            .order_by("run_id")
+        )
+
+    # status_id -> total, for every test run
+    run_counts = {}
+    status_totals = {}
+    for row in counts:
+        per_status = run_counts.setdefault(row["run_id"], {})
+        per_status[row["status_id"]] = (
+            per_status.get(row["status_id"], 0) + row["total"]
+        )
+        status_totals[row["status_id"]] = (
+            status_totals.get(row["status_id"], 0) + row["total"]
+        )
+    categories = sorted(run_counts)
+
     data_set = {}
-    categories = []
     colors = []
-    counts = {}
-
-    for status in TestExecutionStatus.objects.all():
-        data_set[status.name] = []
-        colors.append(status.color)
-    data_set[str(_("TOTAL"))] = []
-    colors.append("black")
-
     status_count = {
         "positive": 0,
         "negative": 0,
         "neutral": 0,
     }
-    run_id = 0
-    for test_execution in (
-        TestExecution.objects.filter(**query)
-        .select_related("status")
-        .order_by("run_id")
-    ):
-        status = test_execution.status
+
+    for status in TestExecutionStatus.objects.all():
+        colors.append(status.color)
+        data_set[status.name] = []
+        for run_id in categories:
+            data_set[status.name].append(run_counts[run_id].get(status.pk, 0))
 
         if status.weight > 0:
-            status_count["positive"] += 1
+            status_count["positive"] += status_totals.get(status.pk, 0)
         elif status.weight < 0:
-            status_count["negative"] += 1
+            status_count["negative"] += status_totals.get(status.pk, 0)
         else:
-            status_count["neutral"] += 1
+            status_count["neutral"] += status_totals.get(status.pk, 0)
 
-        if test_execution.run_id == run_id:
-            if status.name in counts:
-                counts[status.name] += 1
-            else:
-                counts[status.name] = 1
-
-        else:
-            _append_status_counts_to_result(counts, data_set)
-
-            counts = {status.name: 1}
-            run_id = test_execution.run_id
-            categories.append(run_id)
-
-    # append the last result
-    _append_status_counts_to_result(counts, data_set)
-
-    for _key, value in data_set.items():
-        del value[0]
+    data_set[str(_("TOTAL"))] = []
+    colors.append("black")
+    for run_id in categories:
+        data_set[str(_("TOTAL"))].append(sum(run_counts[run_id].values()))
 
     return {
         "categories": categories,
@@ -180,44 +228,38 @@ def execution_trends(query=None):
     }
 
 
-def _append_status_counts_to_result(counts, result):
-    total = 0
-    for status_name in filter(lambda x: x != _("TOTAL"), result.keys()):
-        status_count = counts.get(status_name, 0)
-        result.get(status_name).append(status_count)
-
-        total += status_count
-
-    result.get(str(_("TOTAL"))).append(total)
-
-
 @http_basic_auth_login_required
 @rpc_method(name="Testing.test_case_health")
 def test_case_health(query=None):
     if query is None:
         query = {}
 
-    all_test_executions = TestExecution.objects.filter(**query)
-
-    test_executions = _get_count_for(all_test_executions)
-    failed_test_executions = _get_count_for(
-        all_test_executions.filter(status__weight__lt=0)
-    )
-
-    data = {}
-    for value in test_executions:
-        data[value["case_id"]] = {
-            "case_id": value["case_id"],
-            "case_summary": value["case__summary"],
-            "count": {"all": value["count"], "fail": 0},
-        }
-
-    _count_test_executions(data, failed_test_executions, "fail")
+    counts = rollups.case_status_counts(query)
+    if counts is None:
+        counts = (
+            TestExecution.objects.filter(**query)
+            .values("case_id", "case__summary")
+            .annotate(
+                total=Count("case_id"),
+                fail=Count("case_id", filter=Q(status__weight__lt=0)),
+            )
+            .order_by("case_id")
+        )
+
+    data = []
+    for value in counts:
+        # skip all with 100% success rate, because they are not interesting
+        if not value["fail"]:
+            continue
+
+        data.append(
+            {
+                "case_id": value["case_id"],
+                "case_summary": value["case__summary"],
+                "count": {"all": value["total"], "fail": value["fail"]},
+            }
+        )
 
-    # remove all with 100% success rate, because they are not interesting
-    _remove_all_excellent_executions(data)
-
-    data = list(data.values())
     data.sort(key=_sort_by_failing_rate, reverse=True)
 
     if len(data) > 30:
@@ -241,24 +283,5 @@ def individual_test_case_health_simple(query=None):
     return list(res)
 
 
-def _remove_all_excellent_executions(data):
-    for key in dict.fromkeys(data):
-        if data[key]["count"]["fail"] == 0:
-            data.pop(key)
-
-
-def _count_test_executions(data, test_executions, status):
-    for value in test_executions:
-        data[value["case_id"]]["count"][status] = value["count"]
-
-
 def _sort_by_failing_rate(element):
     return element["count"]["fail"] / element["count"]["all"]
-
-
-def _get_count_for(test_executions):
-    return (
-        test_executions.values("case_id", "case__summary")
-        .annotate(count=Count("case_id"))
-        .order_by("case_id")
-    )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tcms.telemetry import rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate the pre-aggregated execution counts used by telemetry. "
+        "Counts are updated automatically, use this only for repairs."
+    )
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            rollups.rebuild()
+        self.stdout.write("Telemetry counts refreshed successfully.")
@@ -0,0 +1,165 @@
+# Generated by Django 4.1.7 on 2026-10-17 05:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+
+
+def _populate(execution_model, model, expressions):
+    fields = list(expressions)
+    aliases = {}
+    for field, expression in expressions.items():
+        aliases[f"rollup_{field}"] = expression
+
+    rows = []
+    for row in (
+        execution_model.objects.values(**aliases)
+        .annotate(count=Count("pk"))
+        .values_list(*aliases, "count")
+        .order_by()
+        .iterator()
+    ):
+        rows.append(model(**dict(zip(fields + ["count"], row))))
+
+        if len(rows) >= 1000:
+            model.objects.bulk_create(rows)  # pylint: disable=bulk-create-used
+            rows = []
+    model.objects.bulk_create(rows)  # pylint: disable=bulk-create-used
+
+
+def forward_populate_counts(apps, schema_editor):
+    execution_model = apps.get_model("testruns", "TestExecution")
+
+    _populate(
+        execution_model,
+        apps.get_model("telemetry", "RunStatusCount"),
+        {
+            "run_id": F("run_id"),
+            "build_id": F("build_id"),
+            "status_id": F("status_id"),
+            "stop_date": TruncDate("stop_date"),
+        },
+    )
+    _populate(
+        execution_model,
+        apps.get_model("telemetry", "CaseStatusCount"),
+        {
+            "case_id": F("case_id"),
+            "plan_id": F("run__plan_id"),
+            "build_id": F("build_id"),
+            "status_id": F("status_id"),
+            "stop_date": TruncDate("stop_date"),
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("testplans", "0010_alter_historicaltestplan_options_and_more"),
+        ("testruns", "0018_alter_historicaltestexecution_options_and_more"),
+        ("management", "0010_alter_meta"),
+        ("testcases", "0022_alter_historicaltemplate_options_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RunStatusCount",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("stop_date", models.DateField(blank=True, null=True)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "build",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="management.build",
+                    ),
+                ),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="testruns.testrun",
+                    ),
+                ),
+                (
+                    "status",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="testruns.testexecutionstatus",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="CaseStatusCount",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("stop_date", models.DateField(blank=True, null=True)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "build",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="management.build",
+                    ),
+                ),
+                (
+                    "case",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="testcases.testcase",
+                    ),
+                ),
+                (
+                    "plan",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="testplans.testplan",
+                    ),
+                ),
+                (
+                    "status",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="testruns.testexecutionstatus",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="runstatuscount",
+            index=models.Index(
+                fields=["run", "build", "status", "stop_date"],
+                name="telemetry_r_run_id_31f8a5_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="casestatuscount",
+            index=models.Index(
+                fields=["case", "plan", "build", "status", "stop_date"],
+                name="telemetry_c_case_id_b1d7c5_idx",
+            ),
+        ),
+        migrations.RunPython(forward_populate_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import models
+
+
+class RunStatusCount(models.Model):
+    """
+    Number of test executions per test run, build, status and
+    day of completion. Keys aren't unique, always ``Sum()`` the ``count``
+    column! Maintained by :mod:`tcms.telemetry.rollups`.
+    """
+
+    run = models.ForeignKey("testruns.TestRun", on_delete=models.CASCADE)
+    build = models.ForeignKey("management.Build", on_delete=models.CASCADE)
+    status = models.ForeignKey("testruns.TestExecutionStatus", on_delete=models.CASCADE)
+    stop_date = models.DateField(null=True, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["run", "build", "status", "stop_date"])]
+
+
+class CaseStatusCount(models.Model):
+    """
+    Number of test executions per test case, test plan, build, status
+    and day of completion. Keys aren't unique, always ``Sum()`` the ``count``
+    column! Maintained by :mod:`tcms.telemetry.rollups`.
+    """
+
+    case = models.ForeignKey("testcases.TestCase", on_delete=models.CASCADE)
+    plan = models.ForeignKey("testplans.TestPlan", on_delete=models.CASCADE)
+    build = models.ForeignKey("management.Build", on_delete=models.CASCADE)
+    status = models.ForeignKey("testruns.TestExecutionStatus", on_delete=models.CASCADE)
+    stop_date = models.DateField(null=True, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["case", "plan", "build", "status", "stop_date"])
+        ]
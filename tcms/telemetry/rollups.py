@@ -0,0 +1,342 @@
+"""
+Pre-aggregated execution counts used by the telemetry pages.
+
+:class:`tcms.telemetry.models.RunStatusCount` and
+:class:`tcms.telemetry.models.CaseStatusCount` are updated incrementally
+whenever test executions change so that telemetry doesn't need to scan the
+entire executions table. Rows are never unique, readers always ``Sum()``
+their ``count`` column!
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, time
+
+from django.apps import apps
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from tcms.telemetry.models import CaseStatusCount, RunStatusCount
+
+RUN_FIELDS = ("run_id", "build_id", "status_id", "stop_date")
+CASE_FIELDS = ("case_id", "plan_id", "build_id", "status_id", "stop_date")
+
+logger = logging.getLogger(__name__)
+
+# TestExecution field lookups which can be answered by the rollup tables,
+# mapped to the names of the corresponding rollup fields
+RUN_LOOKUPS = {
+    "run": "run",
+    "build": "build",
+    "status": "status",
+}
+CASE_LOOKUPS = {
+    "run__plan": "plan",
+    "case": "case",
+    "build": "build",
+    "status": "status",
+}
+
+# stop_date values are stored with a granularity of 1 day
+DAY_BOUNDARIES = {
+    "gte": time.min,
+    "lt": time.min,
+    "lte": time(23, 59, 59),
+    "gt": time(23, 59, 59),
+}
+
+
+def _day(value):
+    if value is None:
+        return None
+
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date()
+
+
+def snapshot(executions):
+    """
+    Return the rollup keys for ``executions``. Take a snapshot before
+    modifying objects in memory and pass it to :func:`record_changes` afterwards.
+    """
+    plans = dict(
+        apps.get_model("testruns", "TestRun")
+        .objects.filter(pk__in={execution.run_id for execution in executions})
+        .values_list("pk", "plan_id")
+    )
+
+    keys = []
+    for execution in executions:
+        keys.append(
+            (
+                execution.case_id,
+                execution.run_id,
+                plans.get(execution.run_id),
+                execution.build_id,
+                execution.status_id,
+                _day(execution.stop_date),
+            )
+        )
+    return keys
+
+
+def record_changes(removed=(), added=()):
+    """
+    Subtract the ``removed`` keys and add the ``added`` keys, both
+    produced by :func:`snapshot`, to the rollup tables.
+    """
+    changes = Counter()
+    for key in removed:
+        changes[key] -= 1
+    for key in added:
+        changes[key] += 1
+
+    _record(changes)
+
+
+def remove_executions(executions):
+    """
+    Subtract ``executions``, a queryset which is about to be deleted,
+    from the rollup tables using a single aggregate query!
+    """
+    changes = Counter()
+    for row in (
+        executions.values(
+            "case_id",
+            "run_id",
+            "run__plan_id",
+            "build_id",
+            "status_id",
+            rollup_day=TruncDate("stop_date"),
+        )
+        .annotate(count=Count("pk"))
+        .values_list(
+            "case_id",
+            "run_id",
+            "run__plan_id",
+            "build_id",
+            "status_id",
+            "rollup_day",
+            "count",
+        )
+        .order_by()
+    ):
+        changes[row[:-1]] -= row[-1]
+
+    _record(changes)
+
+
+def _record(changes):
+    run_deltas = Counter()
+    case_deltas = Counter()
+
+    for (case_id, run_id, plan_id, build_id, status_id, day), delta in changes.items():
+        run_deltas[(run_id, build_id, status_id, day)] += delta
+        case_deltas[(case_id, plan_id, build_id, status_id, day)] += delta
+
+    _apply(RunStatusCount, RUN_FIELDS, run_deltas)
+    _apply(CaseStatusCount, CASE_FIELDS, case_deltas)
+
+
+def _apply(model, fields, deltas):
+    for key in list(deltas):
+        # nothing changed or the object isn't fully saved yet
+        if not deltas[key] or None in key[:-1]:
+            del deltas[key]
+
+    if not deltas:
+        return
+
+    lookups = {}
+    for index, field in enumerate(fields[:-1]):
+        lookups[f"{field}__in"] = {key[index] for key in deltas}
+
+    existing = {}
+    for row in model.objects.filter(**lookups).values_list("pk", *fields):
+        existing.setdefault(row[1:], row[0])
+
+    pks_by_delta = {}
+    new_rows = []
+    missing = 0
+    for key, delta in deltas.items():
+        if key in existing:
+            pks_by_delta.setdefault(delta, []).append(existing[key])
+        elif delta > 0:
+            new_rows.append(model(count=delta, **dict(zip(fields, key))))
+        else:
+            missing += 1
+
+    if missing:
+        logger.warning(
+            "%d %s row(s) to subtract from are missing, "
+            "use `manage.py refresh_telemetry` to rebuild them",
+            missing,
+            model.__name__,
+        )
+
+    # F() expressions make increments safe for concurrent requests. Rows
+    # created concurrently for the same key are harmless b/c readers use Sum()
+    for delta, pks in pks_by_delta.items():
+        model.objects.filter(pk__in=pks).update(  # pylint: disable=objects-update-used
+            count=F("count") + delta
+        )
+    model.objects.bulk_create(new_rows)  # pylint: disable=bulk-create-used
+
+
+def run_plan_changed(run_id, old_plan_id, new_plan_id):
+    """
+    Move the executions of a test run under its new test plan.
+    """
+    executions = apps.get_model("testruns", "TestExecution").objects.filter(
+        run_id=run_id
+    )
+
+    removed = []
+    added = []
+    for case_id, build_id, status_id, stop_date in executions.values_list(
+        "case_id", "build_id", "status_id", "stop_date"
+    ):
+        day = _day(stop_date)
+        removed.append((case_id, run_id, old_plan_id, build_id, status_id, day))
+        added.append((case_id, run_id, new_plan_id, build_id, status_id, day))
+
+    # per-run counts cancel out, only per-case counts are keyed by test plan
+    record_changes(removed, added)
+
+
+def _rebuild(model, expressions):
+    model.objects.all().delete()
+
+    fields = list(expressions)
+    aliases = {}
+    for field, expression in expressions.items():
+        aliases[f"rollup_{field}"] = expression
+
+    rows = []
+    for row in (
+        apps.get_model("testruns", "TestExecution")
+        .objects.values(**aliases)
+        .annotate(count=Count("pk"))
+        .values_list(*aliases, "count")
+        .order_by()
+        .iterator()
+    ):
+        rows.append(model(**dict(zip(fields + ["count"], row))))
+
+        if len(rows) >= 1000:
+            model.objects.bulk_create(rows)  # pylint: disable=bulk-create-used
+            rows = []
+    model.objects.bulk_create(rows)  # pylint: disable=bulk-create-used
+
+
+def rebuild():
+    """
+    Recalculate the rollup tables from scratch.
+    """
+    _rebuild(
+        RunStatusCount,
+        {
+            "run_id": F("run_id"),
+            "build_id": F("build_id"),
+            "status_id": F("status_id"),
+            "stop_date": TruncDate("stop_date"),
+        },
+    )
+    _rebuild(
+        CaseStatusCount,
+        {
+            "case_id": F("case_id"),
+            "plan_id": F("run__plan_id"),
+            "build_id": F("build_id"),
+            "status_id": F("status_id"),
+            "stop_date": TruncDate("stop_date"),
+        },
+    )
+
+
+def _translate_date_lookup(lookup, value):
+    if lookup == "stop_date__isnull":
+        return value
+
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if not isinstance(value, datetime):
+        return None
+
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+
+    operator = lookup.replace("stop_date__", "", 1)
+    if DAY_BOUNDARIES.get(operator) != value.time():
+        return None
+
+    return value.date()
+
+
+def translate_query(query, lookups):
+    """
+    Translate field lookups for :class:`tcms.testruns.models.TestExecution`
+    into lookups for a rollup table. Return None if the query can't be
+    answered from the rollup table.
+    """
+    result = {}
+
+    for lookup, value in query.items():
+        if lookup.startswith("stop_date__"):
+            value = _translate_date_lookup(lookup, value)
+            if value is None:
+                return None
+
+            result[lookup] = value
+            continue
+
+        for prefix, replacement in lookups.items():
+            if lookup == prefix or lookup.startswith((f"{prefix}__", f"{prefix}_id")):
+                result[replacement + lookup[len(prefix) :]] = value
+                break
+        else:
+            return None
+
+    return result
+
+
+def run_status_counts(query):
+    """
+    Number of executions grouped by test run and status, ordered by test run.
+    Return None if ``query`` can't be answered from the rollup table.
+    """
+    rollup_query = translate_query(query, RUN_LOOKUPS)
+    if rollup_query is None:
+        return None
+
+    return (
+        RunStatusCount.objects.filter(**rollup_query)
+        .values("run_id", "status_id")
+        .annotate(total=Sum("count"))
+        .filter(total__gt=0)
+        .order_by("run_id")
+    )
+
+
+def case_status_counts(query):
+    """
+    Number of all and failed executions grouped by test case.
+    Return None if ``query`` can't be answered from the rollup table.
+    """
+    rollup_query = translate_query(query, CASE_LOOKUPS)
+    if rollup_query is None:
+        return None
+
+    return (
+        CaseStatusCount.objects.filter(**rollup_query)
+        .values("case_id", "case__summary")
+        .annotate(
+            total=Sum("count"),
+            fail=Sum("count", filter=Q(status__weight__lt=0)),
+        )
+        .filter(total__gt=0)
+        .order_by("case_id")
+    )
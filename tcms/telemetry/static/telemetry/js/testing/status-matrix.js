@@ -83,17 +83,29 @@ export function drawTable () {
         query.stop_date__gte = dateAfter.data('DateTimePicker').date().format('YYYY-MM-DD 00:00:00')
     }
 
-    jsonRPC('Testing.status_matrix', query, data => {
+    jsonRPC('Testing.status_matrix', [query, true], data => {
         const tableColumns = [initialColumn]
-        const testRunIds = Object.keys(data.runs)
+        const runIndexes = Object.keys(data.runs.id)
 
         // reverse the TR-xy order to show newest ones first
         if (!$('#id_order').is(':checked')) {
-            testRunIds.reverse()
+            runIndexes.reverse()
         }
 
-        testRunIds.forEach(testRunId => {
-            const testRunSummary = data.runs[testRunId]
+        // execution index, keyed by "caseIndex-runIndex"
+        const cells = {}
+        data.executions.case.forEach((caseIndex, index) => {
+            cells[`${caseIndex}-${data.executions.run[index]}`] = index
+        })
+
+        const rows = []
+        data.cases.id.forEach((caseId, index) => {
+            rows.push({ case_id: caseId, case__summary: data.cases.summary[index], index })
+        })
+
+        runIndexes.forEach(runIndex => {
+            const testRunId = data.runs.id[runIndex]
+            const testRunSummary = data.runs.summary[runIndex]
             $('.table > thead > tr').append(`
             <th class="header-test-run">
                 <a href="/runs/${testRunId}/">TR-${testRunId}</a>
@@ -103,13 +115,13 @@ export function drawTable () {
             tableColumns.push({
                 data: null,
                 sortable: false,
-                render: renderData(testRunId, testPlanIds, includeChildTPs, data)
+                render: renderData(runIndex, testPlanIds, includeChildTPs, data, cells)
             })
         })
 
         table = $('#table').DataTable({
             columns: tableColumns,
-            data: data.cases,
+            data: rows,
             paging: false,
             ordering: false,
             dom: 't',
@@ -120,8 +132,8 @@ export function drawTable () {
             }
         })
 
-        const cells = $('.table > tbody > tr > td:has(.execution-status)')
-        Object.entries(cells).forEach(applyStyleToCell)
+        const statusCells = $('.table > tbody > tr > td:has(.execution-status)')
+        Object.entries(statusCells).forEach(applyStyleToCell)
 
         // initialize the tooltips by hand, because they are dinamically inserted
         // and not handled by Bootstrap itself
@@ -148,13 +160,15 @@ function applyStyleToCell (cell) {
     }
 }
 
-function renderData (testRunId, testPlanIds, includeChildTPs, apiData) {
+function renderData (runIndex, testPlanIds, includeChildTPs, apiData, cells) {
     return (data, type, row, meta) => {
-        const execution = apiData.executions[`${data.case_id}-${testRunId}`]
+        const index = cells[`${row.index}-${runIndex}`]
 
-        if (execution) {
-            const statusColor = apiData.statusColors[execution.status_id]
-            const planId = apiData.plans[testRunId]
+        if (index !== undefined) {
+            const executionId = apiData.executions.id[index]
+            const testRunId = apiData.runs.id[runIndex]
+            const statusColor = apiData.statusColors[apiData.executions.status[index]]
+            const planId = apiData.runs.plan[runIndex]
             const fromParentTP = includeChildTPs && testPlanIds.includes(planId)
             let iconClass = ''
 
@@ -163,7 +177,7 @@ function renderData (testRunId, testPlanIds, includeChildTPs, apiData) {
             }
 
             return `<span class="execution-status ${iconClass}" color="${statusColor}" from-parent="${fromParentTP}"> ` +
-                `<a href="/runs/${execution.run_id}/#test-execution-${execution.pk}">TE-${execution.pk}</a>` +
+                `<a href="/runs/${testRunId}/#test-execution-${executionId}">TE-${executionId}</a>` +
                 '</span>'
         }
         return ''
@@ -0,0 +1,72 @@
+from tcms.telemetry import api
+from tcms.testruns.models import TestExecutionStatus
+from tcms.tests import BaseCaseRun
+from tcms.tests.factories import TestExecutionFactory
+
+
+class TestExecutionTrends(BaseCaseRun):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.status_failed = TestExecutionStatus.objects.filter(weight__lt=0).first()
+        cls.status_passed = TestExecutionStatus.objects.filter(weight__gt=0).first()
+
+        for status in (cls.status_failed, cls.status_passed, cls.status_passed):
+            TestExecutionFactory(
+                run=cls.test_run_1, build=cls.build, case=cls.case_1, status=status
+            )
+
+    def test_counts_per_run_and_status(self):
+        result = api.execution_trends({"run__plan": self.plan.pk})
+
+        self.assertEqual(result["categories"], [self.test_run.pk, self.test_run_1.pk])
+        self.assertEqual(result["data_set"][self.status_idle.name], [3, 3])
+        self.assertEqual(result["data_set"][self.status_passed.name], [0, 2])
+        self.assertEqual(result["data_set"][self.status_failed.name], [0, 1])
+        self.assertEqual(result["data_set"]["TOTAL"], [3, 6])
+        self.assertEqual(
+            result["status_count"], {"positive": 2, "negative": 1, "neutral": 6}
+        )
+
+    def test_query_not_supported_by_rollups(self):
+        query = {"run__plan": self.plan.pk}
+        # assignee isn't part of the rollup tables
+        self.assertEqual(
+            api.execution_trends(dict(query, assignee__isnull=False)),
+            api.execution_trends(query),
+        )
+
+    def test_without_results(self):
+        result = api.execution_trends({"run__plan": -1})
+
+        self.assertEqual(result["categories"], [])
+        self.assertEqual(result["data_set"]["TOTAL"], [])
+        self.assertEqual(
+            result["status_count"], {"positive": 0, "negative": 0, "neutral": 0}
+        )
+
+
+class TestStatusMatrix(BaseCaseRun):
+    def test_compact_format(self):
+        query = {"run__plan": self.plan.pk}
+        expanded = api.status_matrix(query)
+        result = api.status_matrix(query, compact=True)
+
+        self.assertEqual(
+            result["cases"]["id"],
+            [self.case_1.pk, self.case_2.pk, self.case_3.pk]
+            + [self.case_4.pk, self.case_5.pk, self.case_6.pk],
+        )
+        self.assertEqual(result["runs"]["id"], [self.test_run.pk, self.test_run_1.pk])
+        self.assertEqual(result["runs"]["plan"], [self.plan.pk, self.plan.pk])
+        self.assertEqual(result["statusColors"], expanded["statusColors"])
+
+        executions = result["executions"]
+        self.assertEqual(len(executions["id"]), len(expanded["executions"]))
+        for index, execution_id in enumerate(executions["id"]):
+            case_id = result["cases"]["id"][executions["case"][index]]
+            run_id = result["runs"]["id"][executions["run"][index]]
+            execution = expanded["executions"][f"{case_id}-{run_id}"]
+
+            self.assertEqual(execution["pk"], execution_id)
+            self.assertEqual(execution["status_id"], executions["status"][index])
@@ -0,0 +1,163 @@
+# pylint: disable=attribute-defined-outside-init
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Sum
+
+from tcms.core.helpers.comments import add_comment
+from tcms.telemetry import api, rollups
+from tcms.telemetry.models import CaseStatusCount, RunStatusCount
+from tcms.testruns.models import TestExecutionStatus
+from tcms.tests import BaseCaseRun
+from tcms.tests.factories import TestExecutionFactory, TestPlanFactory
+
+
+class TestRollups(BaseCaseRun):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.status_failed = TestExecutionStatus.objects.filter(weight__lt=0).first()
+        cls.status_passed = TestExecutionStatus.objects.filter(weight__gt=0).first()
+
+    @staticmethod
+    def counts(model, **lookups):
+        return model.objects.filter(**lookups).aggregate(total=Sum("count"))["total"]
+
+    def assert_same_as_rebuild(self):
+        incremental = {
+            "runs": api.execution_trends({}),
+            "cases": api.test_case_health({}),
+        }
+
+        rollups.rebuild()
+        self.assertEqual(api.execution_trends({}), incremental["runs"])
+        self.assertEqual(api.test_case_health({}), incremental["cases"])
+
+    def test_counts_follow_execution_changes(self):
+        self.assertEqual(
+            self.counts(RunStatusCount, run=self.test_run, status=self.status_idle), 3
+        )
+
+        self.execution_1.status = self.status_failed
+        self.execution_1.save()
+
+        self.assertEqual(
+            self.counts(RunStatusCount, run=self.test_run, status=self.status_idle), 2
+        )
+        self.assertEqual(
+            self.counts(CaseStatusCount, case=self.case_1, status=self.status_failed),
+            1,
+        )
+
+        self.execution_2.delete()
+        self.assertEqual(
+            self.counts(RunStatusCount, run=self.test_run, status=self.status_idle), 1
+        )
+        self.assert_same_as_rebuild()
+
+    def test_counts_follow_run_plan_changes(self):
+        self.execution_4.status = self.status_failed
+        self.execution_4.save()
+
+        self.test_run_1.plan = TestPlanFactory(
+            product=self.product, product_version=self.version
+        )
+        self.test_run_1.save()
+
+        self.assertEqual(self.counts(CaseStatusCount, plan=self.test_run_1.plan), 3)
+        self.assertEqual(self.counts(CaseStatusCount, plan=self.plan), 3)
+        self.assert_same_as_rebuild()
+
+    def test_counts_follow_run_and_case_deletion(self):
+        TestExecutionFactory(
+            run=self.test_run,
+            build=self.build,
+            case=self.case_4,
+            status=self.status_idle,
+        )
+
+        self.test_run_1.delete()
+
+        self.assertEqual(self.counts(CaseStatusCount, case=self.case_4), 1)
+        self.assertFalse(self.counts(CaseStatusCount, case=self.case_5))
+        self.assert_same_as_rebuild()
+
+        self.case_4.delete()
+
+        self.assertEqual(
+            self.counts(RunStatusCount, run=self.test_run, status=self.status_idle), 3
+        )
+        self.assert_same_as_rebuild()
+
+    def test_comment_signal_does_not_repeat_changes(self):
+        self.execution_1.status = self.status_failed
+        self.execution_1.save()
+
+        add_comment([self.execution_1], "Failed again", self.tester)
+
+        self.assertEqual(
+            self.counts(RunStatusCount, run=self.test_run, status=self.status_idle), 2
+        )
+        self.assert_same_as_rebuild()
+
+    def test_missing_rows_are_logged(self):
+        RunStatusCount.objects.filter(run=self.test_run).delete()
+
+        with self.assertLogs("tcms.telemetry.rollups", level="WARNING") as logs:
+            self.execution_1.delete()
+
+        self.assertIn("1 RunStatusCount row(s)", logs.output[0])
+
+    def test_test_case_health_from_rollups(self):
+        for status in (self.status_failed, self.status_passed, self.status_failed):
+            TestExecutionFactory(
+                run=self.test_run, build=self.build, case=self.case_1, status=status
+            )
+
+        query = {"run__plan__in": [self.plan.pk], "build_id__in": [self.build.pk]}
+        self.assertIsNotNone(rollups.case_status_counts(query))
+
+        health = api.test_case_health(query)
+        self.assertEqual(health[0]["case_id"], self.case_1.pk)
+        self.assertEqual(health[0]["count"], {"all": 4, "fail": 2})
+
+        # a lookup which isn't supported by the rollups returns the same result
+        health = api.test_case_health(dict(query, sortkey__gte=0))
+        self.assertEqual(health[0]["count"], {"all": 4, "fail": 2})
+
+    def test_translate_query(self):
+        self.assertEqual(
+            rollups.translate_query(
+                {
+                    "run__plan__product__in": [1],
+                    "build_id__in": [2],
+                    "stop_date__gte": "2020-01-01 00:00:00",
+                    "stop_date__lte": "2020-01-31 23:59:59",
+                },
+                rollups.CASE_LOOKUPS,
+            ),
+            {
+                "plan__product__in": [1],
+                "build_id__in": [2],
+                "stop_date__gte": rollups.parse_datetime("2020-01-01 00:00").date(),
+                "stop_date__lte": rollups.parse_datetime("2020-01-31 00:00").date(),
+            },
+        )
+
+        for query in (
+            {"stop_date__lte": "2020-01-31 12:00:00"},
+            {"run__manager": 1},
+            {"assignee": 1},
+        ):
+            self.assertIsNone(rollups.translate_query(query, rollups.CASE_LOOKUPS))
+
+    def test_refresh_telemetry_command(self):
+        RunStatusCount.objects.all().delete()
+
+        out = StringIO()
+        call_command("refresh_telemetry", stdout=out)
+
+        self.assertIn("refreshed successfully", out.getvalue())
+
+        self.assertEqual(self.counts(RunStatusCount), 6)
+        self.assertEqual(self.counts(CaseStatusCount), 6)
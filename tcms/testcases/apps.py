@@ -7,15 +7,31 @@ class AppConfig(DjangoAppConfig):
     name = "tcms.testcases"
 
     def ready(self):
-        from django.db.models.signals import post_save, pre_delete, pre_save
+        from django.db.models.signals import (
+            post_delete,
+            post_migrate,
+            post_save,
+            pre_delete,
+            pre_save,
+        )
 
         from tcms import signals
+        from tcms.rpc.api.utils import TRACKER_INDEX
 
-        from .models import TestCase
+        from .models import BugSystem, TestCase, TestCaseEmailSettings
 
         pre_save.connect(signals.pre_save_clean, TestCase)
+        pre_save.connect(signals.pre_save_render_markdown, TestCase)
         post_save.connect(signals.handle_emails_post_case_save, TestCase)
         post_save.connect(signals.handle_attachments_post_save, sender=TestCase)
         pre_delete.connect(signals.handle_emails_pre_case_delete, TestCase)
         pre_delete.connect(signals.handle_attachments_pre_delete, sender=TestCase)
         pre_delete.connect(signals.handle_comments_pre_delete, TestCase)
+        pre_delete.connect(signals.handle_rollups_pre_delete, sender=TestCase)
+        post_save.connect(signals.handle_recipients_post_save, TestCase)
+        post_save.connect(signals.handle_recipients_post_save, TestCaseEmailSettings)
+
+        post_save.connect(TRACKER_INDEX.invalidate_on_commit, sender=BugSystem)
+        post_delete.connect(TRACKER_INDEX.invalidate_on_commit, sender=BugSystem)
+        # `manage.py flush` doesn't send post_delete
+        post_migrate.connect(TRACKER_INDEX.invalidate)
@@ -1,11 +1,25 @@
 # -*- coding: utf-8 -*-
+from django.conf import settings
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
+from tcms.core.helpers.recipients import cached_per_request, notification_recipients
 from tcms.core.history import history_email_for
-from tcms.core.utils.mailto import mailto
+from tcms.core.utils.mailto import mail_digest, mailto
 
 
 def email_case_update(case):
+    if settings.EMAIL_DIGEST_MINUTES:
+        subject, body = history_email_for(case, case.summary)
+        mail_digest(
+            case,
+            "tcms.testcases.helpers.email.get_case_update_recipients",
+            None,
+            subject,
+            body,
+        )
+        return
+
     recipients = get_case_notification_recipients(case)
     if not recipients:
         return
@@ -27,29 +41,30 @@ def email_case_deletion(case):
     mailto("email/post_case_delete/email.txt", subject, recipients, context, cc=cc_list)
 
 
+def get_case_update_recipients(case):
+    recipients = get_case_notification_recipients(case)
+    if not recipients:
+        return []
+    return recipients + case.emailing.get_cc_list()
+
+
+@cached_per_request("author_id", "default_tester_id")
 def get_case_notification_recipients(case):
-    recipients = set()
+    conditions = []
 
     if case.emailing.auto_to_case_author:
-        recipients.add(case.author.email)
+        conditions.append(Q(pk=case.author_id))
 
-    if case.emailing.auto_to_case_tester and case.default_tester:
-        recipients.add(case.default_tester.email)
+    if case.emailing.auto_to_case_tester and case.default_tester_id:
+        conditions.append(Q(pk=case.default_tester_id))
 
     if case.emailing.auto_to_run_manager:
-        managers = case.executions.values_list("run__manager__email", flat=True)
-        recipients.update(managers)  # pylint: disable=objects-update-used
+        conditions.append(Q(pk__in=case.executions.values("run__manager")))
 
     if case.emailing.auto_to_run_tester:
-        run_testers = case.executions.values_list(
-            "run__default_tester__email", flat=True
-        )
-        recipients.update(run_testers)  # pylint: disable=objects-update-used
+        conditions.append(Q(pk__in=case.executions.values("run__default_tester")))
 
     if case.emailing.auto_to_execution_assignee:
-        assignees = case.executions.values_list("assignee__email", flat=True)
-        recipients.update(assignees)  # pylint: disable=objects-update-used
+        conditions.append(Q(pk__in=case.executions.values("assignee")))
 
-    # don't email author of last change
-    recipients.discard(getattr(case.history.latest().history_user, "email", ""))
-    return list(filter(None, recipients))
+    return notification_recipients(case, conditions)
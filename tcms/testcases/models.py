@@ -10,7 +10,7 @@ from django.utils.translation import gettext_lazy as _
 
 from tcms.core.history import KiwiHistoricalRecords
 from tcms.core.models import abstract
-from tcms.core.models.base import UrlMixin
+from tcms.core.models.base import RenderedMarkdownMixin, UrlMixin
 from tcms.testcases.fields import MultipleEmailField
 
 
@@ -46,8 +46,9 @@ class Category(models.Model, UrlMixin):
         return self.name
 
 
-class TestCase(models.Model, UrlMixin):
-    history = KiwiHistoricalRecords()
+class TestCase(models.Model, UrlMixin, RenderedMarkdownMixin):
+    history = KiwiHistoricalRecords(excluded_fields=["text_html"])
+    html_fields = {"text": "text_html"}
 
     create_date = models.DateTimeField(auto_now_add=True)
     is_automated = models.BooleanField(default=False)
@@ -58,6 +59,8 @@ class TestCase(models.Model, UrlMixin):
     requirement = models.CharField(max_length=255, blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
     text = models.TextField(blank=True)
+    # None until rendered, see manage.py render_markdown
+    text_html = models.TextField(blank=True, null=True, editable=False)
     setup_duration = models.DurationField(db_index=True, null=True, blank=True)
     testing_duration = models.DurationField(db_index=True, null=True, blank=True)
 
@@ -117,6 +120,19 @@ class TestCase(models.Model, UrlMixin):
     def add_tag(self, tag):
         return TestCaseTag.objects.get_or_create(case=self, tag=tag)
 
+    @classmethod
+    def latest_text_versions(cls, case_ids):
+        """
+        Return a dict mapping TestCase PKs to the ID of their latest
+        historical record, fetched with a single query.
+        """
+        return dict(
+            cls.history.filter(id__in=case_ids)  # pylint: disable=no-member
+            .values("id")
+            .annotate(latest=models.Max("history_id"))
+            .values_list("id", "latest")
+        )
+
     def get_text_with_version(self, case_text_version=None):
         if case_text_version:
             try:
@@ -6,10 +6,11 @@ from django.conf import settings
 from django.template.loader import render_to_string
 from django.test import TestCase
 from django.utils.translation import gettext_lazy as _
-from mock import patch
+from mock import ANY, patch
 from parameterized import parameterized
 
 from tcms.core.history import history_email_for
+from tcms.core.models import OutgoingEmail
 from tcms.testcases.helpers.email import get_case_notification_recipients
 from tcms.tests import BasePlanCase
 from tcms.tests.factories import (
@@ -105,8 +106,12 @@ class TestSendMailOnCaseIsUpdated(BasePlanCase):
 
     @patch("tcms.core.utils.mailto.send_mail")
     def test_send_mail_to_case_author(self, send_mail):
+        # notifications queued while creating test data
+        OutgoingEmail.objects.all().delete()
+
         self.case.summary = "New summary for running test"
-        self.case.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.save()
 
         expected_subject, expected_body = history_email_for(
             self.case, self.case.summary
@@ -120,6 +125,7 @@ class TestSendMailOnCaseIsUpdated(BasePlanCase):
             settings.DEFAULT_FROM_EMAIL,
             recipients,
             fail_silently=False,
+            connection=ANY,
         )
 
 
@@ -145,7 +151,11 @@ class TestSendMailOnCaseIsDeleted(BasePlanCase):
         )
         recipients = get_case_notification_recipients(self.case)
 
-        self.case.delete()
+        # notifications queued while creating test data
+        OutgoingEmail.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.delete()
 
         # Verify notification mail
         send_mail.assert_called_once_with(
@@ -154,6 +164,7 @@ class TestSendMailOnCaseIsDeleted(BasePlanCase):
             settings.DEFAULT_FROM_EMAIL,
             recipients,
             fail_silently=False,
+            connection=ANY,
         )
 
 
@@ -10,9 +10,11 @@ class AppConfig(DjangoAppConfig):
 
         from tcms import signals
 
-        from .models import TestPlan
+        from .models import TestPlan, TestPlanEmailSettings
 
         pre_save.connect(signals.pre_save_clean, TestPlan)
+        pre_save.connect(signals.pre_save_render_markdown, TestPlan)
         post_save.connect(signals.handle_emails_post_plan_save, TestPlan)
         post_save.connect(signals.handle_attachments_post_save, sender=TestPlan)
         pre_delete.connect(signals.handle_attachments_pre_delete, sender=TestPlan)
+        post_save.connect(signals.handle_recipients_post_save, TestPlanEmailSettings)
@@ -1,9 +1,24 @@
 # -*- coding: utf-8 -*-
+from django.conf import settings
+from django.db.models import Q
+
+from tcms.core.helpers.recipients import cached_per_request, notification_recipients
 from tcms.core.history import history_email_for
-from tcms.core.utils.mailto import mailto
+from tcms.core.utils.mailto import mail_digest, mailto
 
 
 def email_plan_update(plan):
+    if settings.EMAIL_DIGEST_MINUTES:
+        subject, body = history_email_for(plan, plan.name)
+        mail_digest(
+            plan,
+            "tcms.testplans.helpers.email.get_plan_notification_recipients",
+            None,
+            subject,
+            body,
+        )
+        return
+
     recipients = get_plan_notification_recipients(plan)
     if not recipients:
         return
@@ -11,20 +26,17 @@ def email_plan_update(plan):
     mailto(None, subject, recipients, body)
 
 
+@cached_per_request("author_id")
 def get_plan_notification_recipients(plan):  # pylint: disable=invalid-name
-    recipients = set()
+    conditions = []
 
-    if plan.author and plan.emailing.auto_to_plan_author:
-        recipients.add(plan.author.email)
+    if plan.author_id and plan.emailing.auto_to_plan_author:
+        conditions.append(Q(pk=plan.author_id))
 
     if plan.emailing.auto_to_case_owner:
-        case_authors = plan.cases.values_list("author__email", flat=True)
-        recipients.update(case_authors)  # pylint: disable=objects-update-used
+        conditions.append(Q(pk__in=plan.cases.values("author")))
 
     if plan.emailing.auto_to_case_default_tester:
-        case_testers = plan.cases.values_list("default_tester__email", flat=True)
-        recipients.update(case_testers)  # pylint: disable=objects-update-used
+        conditions.append(Q(pk__in=plan.cases.values("default_tester")))
 
-    # don't email author of last change
-    recipients.discard(getattr(plan.history.latest().history_user, "email", ""))
-    return list(filter(bool, recipients))
+    return notification_recipients(plan, conditions)
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-17 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("testplans", "0010_alter_historicaltestplan_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testplan",
+            name="text_html",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+    ]
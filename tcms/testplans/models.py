@@ -8,7 +8,7 @@ from tree_queries.models import TreeNode
 from uuslug import slugify
 
 from tcms.core.history import KiwiHistoricalRecords
-from tcms.core.models.base import UrlMixin
+from tcms.core.models.base import RenderedMarkdownMixin, UrlMixin
 from tcms.management.models import Version
 from tcms.testcases.models import TestCasePlan
 
@@ -24,13 +24,16 @@ class PlanType(models.Model, UrlMixin):
         ordering = ["name"]
 
 
-class TestPlan(TreeNode, UrlMixin):
+class TestPlan(TreeNode, UrlMixin, RenderedMarkdownMixin):
     """A plan within the TCMS"""
 
-    history = KiwiHistoricalRecords()
+    history = KiwiHistoricalRecords(excluded_fields=["text_html"])
+    html_fields = {"text": "text_html"}
 
     name = models.CharField(max_length=255, db_index=True)
     text = models.TextField(blank=True)
+    # None until rendered, see manage.py render_markdown
+    text_html = models.TextField(blank=True, null=True, editable=False)
     create_date = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True, db_index=True)
     extra_link = models.CharField(max_length=1024, default=None, blank=True, null=True)
@@ -5,7 +5,7 @@ import {
     advancedSearchAndAddTestCases,
     bindDeleteCommentButton,
     markdown2HTML, renderCommentsForObject, renderCommentHTML,
-    treeViewBind, quickSearchAndAddTestCase
+    treeViewBind, quickSearchAndAddTestCase, unescapeHTML
 } from '../../../../static/js/utils'
 import { initSimpleMDE } from '../../../../static/js/simplemde_security_override'
 
@@ -17,6 +17,15 @@ const autocompleteCache = {}
 
 const confirmedStatuses = []
 
+// fields used to display, filter and sort test cases. The rendered text is
+// loaded together with the test cases instead of once per expanded test case
+const testCaseFields = [
+    'id', 'summary', 'notes', 'text_html', 'is_automated',
+    'case_status', 'case_status__name', 'priority', 'priority__value',
+    'category', 'category__name', 'author', 'author__username',
+    'default_tester', 'default_tester__username', 'reviewer', 'reviewer__username'
+]
+
 export function pageTestplansGetReadyHandler () {
     const testPlanDataElement = $('#test_plan_pk')
     const testPlanId = testPlanDataElement.data('testplan-pk')
@@ -40,7 +49,7 @@ export function pageTestplansGetReadyHandler () {
         }
 
         jsonRPC('TestCase.sortkeys', { plan: testPlanId }, function (sortkeys) {
-            jsonRPC('TestCase.filter', { plan: testPlanId }, function (data) {
+            jsonRPC('TestCase.filter', [{ plan: testPlanId }, testCaseFields], function (data) {
                 for (let i = 0; i < data.length; i++) {
                     const testCase = data[i]
 
@@ -217,7 +226,19 @@ function getTestCaseRowContent (rowContent, testCase, permissions) {
 }
 
 function getTestCaseExpandArea (row, testCase, permissions) {
-    markdown2HTML(testCase.text, row.find('.js-test-case-expand-text'))
+    const textElement = row.find('.js-test-case-expand-text')
+
+    // text_html is null for test cases which haven't been rendered yet and
+    // undefined for test cases which weren't loaded together with the plan
+    if (testCase.text_html != null) {
+        textElement.html(unescapeHTML(testCase.text_html))
+    } else if (testCase.text !== undefined) {
+        markdown2HTML(testCase.text, textElement)
+    } else {
+        jsonRPC('TestCase.filter', [{ pk: testCase.id }, ['text']], function (data) {
+            markdown2HTML(data[0].text, textElement)
+        })
+    }
     if (testCase.notes.trim().length > 0) {
         row.find('.js-test-case-expand-notes').html(testCase.notes)
     }
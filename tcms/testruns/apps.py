@@ -15,8 +15,15 @@ class AppConfig(DjangoAppConfig):
         post_save.connect(signals.handle_emails_post_run_save, sender=TestRun)
         post_save.connect(signals.handle_attachments_post_save, sender=TestRun)
         pre_save.connect(signals.pre_save_clean, sender=TestRun)
+        pre_save.connect(signals.pre_save_render_markdown, sender=TestRun)
         pre_delete.connect(signals.handle_attachments_pre_delete, TestRun)
+        post_save.connect(signals.handle_rollups_post_run_save, sender=TestRun)
+        pre_delete.connect(signals.handle_rollups_pre_delete, sender=TestRun)
 
         post_save.connect(signals.handle_attachments_post_save, sender=TestExecution)
         pre_delete.connect(signals.handle_attachments_pre_delete, TestExecution)
         pre_delete.connect(signals.handle_comments_pre_delete, TestExecution)
+        post_save.connect(
+            signals.handle_rollups_post_execution_save, sender=TestExecution
+        )
+        pre_delete.connect(signals.handle_rollups_pre_delete, sender=TestExecution)
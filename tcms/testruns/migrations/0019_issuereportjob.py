@@ -0,0 +1,55 @@
+# Generated by Django 4.1.7 on 2026-10-17 08:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("testcases", "0022_alter_historicaltemplate_options_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("testruns", "0018_alter_historicaltestexecution_options_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueReportJob",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("status", models.CharField(default="pending", max_length=16)),
+                ("rc", models.IntegerField(blank=True, null=True)),
+                ("response", models.TextField(blank=True)),
+                (
+                    "bug_system",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="testcases.bugsystem",
+                    ),
+                ),
+                (
+                    "execution",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="testruns.testexecution",
+                    ),
+                ),
+                (
+                    "reporter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
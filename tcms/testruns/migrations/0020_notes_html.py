@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-17 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("testruns", "0019_issuereportjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="testrun",
+            name="notes_html",
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-17 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("testruns", "0021_pendingissuecomment"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issuereportjob",
+            name="started_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
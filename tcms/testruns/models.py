@@ -6,15 +6,20 @@ import vinaigrette
 from allpairspy import AllPairs
 from colorfield.fields import ColorField
 from django.conf import settings
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Q
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import override
+from simple_history.utils import bulk_create_with_history
 
 from tcms.core.contrib.linkreference.models import LinkReference
+from tcms.core.helpers import recipients
 from tcms.core.history import KiwiHistoricalRecords
 from tcms.core.models import abstract
-from tcms.core.models.base import UrlMixin
+from tcms.core.models.base import RenderedMarkdownMixin, UrlMixin
+from tcms.telemetry import rollups
 
 TestExecutionStatusSubtotal = namedtuple(
     "TestExecutionStatusSubtotal",
@@ -26,8 +31,9 @@ TestExecutionStatusSubtotal = namedtuple(
 )
 
 
-class TestRun(models.Model, UrlMixin):
-    history = KiwiHistoricalRecords()
+class TestRun(models.Model, UrlMixin, RenderedMarkdownMixin):
+    history = KiwiHistoricalRecords(excluded_fields=["notes_html"])
+    html_fields = {"notes": "notes_html"}
 
     start_date = models.DateTimeField(db_index=True, null=True, blank=True)
     stop_date = models.DateTimeField(null=True, blank=True, db_index=True)
@@ -36,6 +42,8 @@ class TestRun(models.Model, UrlMixin):
 
     summary = models.TextField()
     notes = models.TextField(blank=True)
+    # None until rendered, see manage.py render_markdown
+    notes_html = models.TextField(blank=True, null=True, editable=False)
 
     plan = models.ForeignKey(
         "testplans.TestPlan", related_name="run", on_delete=models.CASCADE
@@ -74,29 +82,20 @@ class TestRun(models.Model, UrlMixin):
     def get_absolute_url(self):
         return self._get_absolute_url()
 
+    @recipients.cached_per_request("manager_id", "default_tester_id")
     def get_notify_addrs(self):
         """
         Get the all related mails from the run
         """
-        send_to = [self.manager.email]
-        send_to.extend(self.cc.values_list("email", flat=True))
+        conditions = [
+            Q(pk=self.manager_id),
+            Q(pk__in=self.cc.values("pk")),
+            Q(pk__in=self.executions.filter(assignee__isnull=False).values("assignee")),
+        ]
         if self.default_tester_id:
-            send_to.append(self.default_tester.email)
-
-        for execution in self.executions.select_related("assignee").all():
-            if execution.assignee_id:
-                send_to.append(execution.assignee.email)
-
-        send_to = set(send_to)
-        # don't email author of last change
-        send_to.discard(
-            getattr(
-                self.history.latest().history_user,  # pylint: disable=no-member
-                "email",
-                "",
-            )
-        )
-        return list(send_to)
+            conditions.append(Q(pk=self.default_tester_id))
+
+        return recipients.notification_recipients(self, conditions)
 
     def _create_single_execution(self, case, assignee, build, sortkey):
         return self.executions.create(
@@ -150,13 +149,131 @@ class TestRun(models.Model, UrlMixin):
 
         return executions
 
+    @transaction.atomic
+    def create_executions(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        cases,
+        assignee=None,
+        build=None,
+        sortkeys=None,
+        matrix_type="full",
+    ):
+        """
+        Bulk version of :meth:`create_execution`. Information about all
+        test cases is fetched with a few queries and executions together
+        with their properties are stored with bulk INSERT statements,
+        all of them in a single transaction.
+
+        .. warning::
+
+            ``pre_save`` and ``post_save`` are not sent for the new executions:
+
+            - historical records are written by ``bulk_create_with_history()``
+              without sending the ``pre/post_create_historical_record`` signals
+            - telemetry rollups are updated explicitly
+            - pending attachments of the current user are not re-attached to
+              the new executions, they stay pending for the next saved object
+            - handlers connected by plugins are not called
+
+            Test executions aren't part of the search index so nothing
+            is left to re-index.
+
+        :param cases: TestCase objects to create executions for
+        :type cases: iterable
+        :param assignee: Assignee for all executions, defaults to
+                         TestCase.default_tester or TestRun.default_tester
+        :type assignee: User
+        :param build: Build for all executions, defaults to TestRun.build
+        :type build: Build
+        :param sortkeys: Mapping of TestCase PK to TestExecution.sortkey, default 0
+        :type sortkeys: dict
+        :param matrix_type: Property matrix type, either "full" or "pairwise"
+        :type matrix_type: str
+        :return: List of the created :class:`TestExecution` objects
+        :rtype: list
+        """
+        # pylint: disable=import-outside-toplevel
+        from tcms.testcases.models import Property as TestCaseProperty
+        from tcms.testcases.models import TestCase
+
+        cases = list(cases)
+        sortkeys = sortkeys or {}
+
+        # PKs are needed to create properties and history
+        if not connection.features.can_return_rows_from_bulk_insert:
+            executions = []
+            for case in cases:
+                executions.extend(
+                    self.create_execution(
+                        case, assignee, build, sortkeys.get(case.pk, 0), matrix_type
+                    )
+                )
+            return executions
+
+        # usually IDLE but users can customize statuses
+        status = TestExecutionStatus.objects.filter(weight=0).first()
+        text_versions = TestCase.latest_text_versions({case.pk for case in cases})
+        run_properties = list(self.property_set.all())
+        case_properties = {}
+        for prop in TestCaseProperty.objects.filter(case__in=cases):
+            case_properties.setdefault(prop.case_id, []).append(prop)
+
+        executions = []
+        property_tuples = []
+        for case in cases:
+            properties = run_properties + case_properties.get(case.pk, [])
+            if properties:
+                matrix = self.property_matrix(properties, matrix_type)
+            else:
+                matrix = [()]
+
+            for prop_tuple in matrix:
+                executions.append(
+                    TestExecution(
+                        run=self,
+                        case=case,
+                        assignee_id=(
+                            assignee.pk
+                            if assignee
+                            else case.default_tester_id or self.default_tester_id
+                        ),
+                        tested_by=None,
+                        status=status,
+                        case_text_version=text_versions[case.pk],
+                        build=build or self.build,
+                        sortkey=sortkeys.get(case.pk, 0),
+                        stop_date=None,
+                        start_date=None,
+                    )
+                )
+                property_tuples.append(prop_tuple)
+
+        executions = bulk_create_with_history(executions, TestExecution, batch_size=500)
+        # post_save signal handlers are not executed
+        rollups.record_changes(added=rollups.snapshot(executions))
+
+        execution_properties = []
+        for execution, prop_tuple in zip(executions, property_tuples):
+            for prop in prop_tuple:
+                execution_properties.append(
+                    TestExecutionProperty(
+                        execution=execution, name=prop.name, value=prop.value
+                    )
+                )
+        # properties don't keep history
+        TestExecutionProperty.objects.bulk_create(  # pylint: disable=bulk-create-used
+            execution_properties, batch_size=500
+        )
+
+        return executions
+
     @staticmethod
     def property_matrix(properties, _type="full"):
         """
         Return a sequence of tuples representing the property matrix!
         """
         property_groups = OrderedDict()
-        for prop in properties.order_by("name", "value"):
+        for prop in sorted(properties, key=lambda prop: (prop.name, prop.value)):
             if prop.name in property_groups:
                 property_groups[prop.name].append(prop)
             else:
@@ -180,6 +297,7 @@ class TestRun(models.Model, UrlMixin):
         return TestRunTag.objects.get_or_create(run=self, tag=tag)
 
     def add_cc(self, user):
+        recipients.forget(self)
         return TestRunCC.objects.get_or_create(
             run=self,
             user=user,
@@ -189,6 +307,7 @@ class TestRun(models.Model, UrlMixin):
         TestRunTag.objects.filter(run=self, tag=tag).delete()
 
     def remove_cc(self, user):
+        recipients.forget(self)
         TestRunCC.objects.filter(run=self, user=user).delete()
 
     @override("en")
@@ -332,3 +451,45 @@ class EnvironmentProperty(abstract.Property):
 
 class Property(abstract.Property):
     run = models.ForeignKey(TestRun, on_delete=models.CASCADE)
+
+
+class IssueReportJob(models.Model):
+    """
+    Issue reported to an external bug tracker in the background.
+    See the ``Bug.report_async`` RPC method!
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+
+    execution = models.ForeignKey(TestExecution, on_delete=models.CASCADE)
+    bug_system = models.ForeignKey("testcases.BugSystem", on_delete=models.CASCADE)
+    reporter = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=16, default=PENDING)
+    # same as the result of Bug.report, available once finished
+    rc = models.IntegerField(null=True, blank=True)  # pylint: disable=invalid-name
+    response = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"TE-{self.execution_id} -> {self.bug_system_id}: {self.status}"
+
+
+class PendingIssueComment(models.Model):
+    """
+    Test execution waiting to be added to an existing defect in an
+    external bug tracker. See :class:`tcms.issuetracker.base.CommentQueue`!
+    """
+
+    execution = models.ForeignKey(TestExecution, on_delete=models.CASCADE)
+    bug_system = models.ForeignKey("testcases.BugSystem", on_delete=models.CASCADE)
+    issue_url = models.URLField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    send_after = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"TE-{self.execution_id} -> {self.issue_url}"
@@ -1,5 +1,5 @@
-import { fetchBugDetails } from '../../../../static/js/bugs'
-import { jsonRPC } from '../../../../static/js/jsonrpc'
+import { fetchBugDetails, prefetchBugDetails } from '../../../../static/js/bugs'
+import { jsonRPC, jsonRPCBatch } from '../../../../static/js/jsonrpc'
 import { propertiesCard } from '../../../../static/js/properties'
 import { tagsCard } from '../../../../static/js/tags'
 import {
@@ -432,16 +432,6 @@ function getExpandArea (testExecution) {
     container.find('.test-execution-information .build').html(testExecution.build__name)
     container.find('.test-execution-information .text-version').html(testExecution.case_text_version)
 
-    jsonRPC('TestCase.history',
-        [testExecution.case, {
-            history_id: testExecution.case_text_version
-        }], (data) => {
-            data.forEach((entry) => {
-                markdown2HTML(entry.text, container.find('.test-execution-text')[0])
-                container.find('.test-execution-notes').append(entry.notes)
-            })
-        })
-
     const commentsRow = container.find('.comments')
     const simpleMDEinitialized = container.find('.comment-form').data('simple-mde-initialized')
     if (!simpleMDEinitialized) {
@@ -501,38 +491,47 @@ function getExpandArea (testExecution) {
         commentsRow
     )
 
-    jsonRPC('TestExecution.get_links', { execution_id: testExecution.id }, links => {
-        const ul = container.find('.test-execution-hyperlinks')
-        ul.innerHTML = ''
-        links.forEach(link => ul.append(renderLink(link)))
-    })
-
-    jsonRPC('TestCase.list_attachments', [testExecution.case], attachments => {
-        const ul = container.find('.test-case-attachments')
-
-        if (!attachments.length) {
-            ul.find('.hidden').removeClass('hidden')
-            return
-        }
-
-        const liTemplate = $('#attachments-list-item')[0].content
+    jsonRPCBatch([
+        ['TestCase.history', [testExecution.case, {
+            history_id: testExecution.case_text_version
+        }], (data) => {
+            data.forEach((entry) => {
+                markdown2HTML(entry.text, container.find('.test-execution-text')[0])
+                container.find('.test-execution-notes').append(entry.notes)
+            })
+        }],
+        ['TestExecution.get_links', { execution_id: testExecution.id }, links => {
+            const ul = container.find('.test-execution-hyperlinks')
+            ul.innerHTML = ''
+            links.forEach(link => ul.append(renderLink(link)))
+            prefetchBugDetails(links.filter(link => link.is_defect).map(link => link.url))
+        }],
+        ['TestCase.list_attachments', [testExecution.case], attachments => {
+            const ul = container.find('.test-case-attachments')
+
+            if (!attachments.length) {
+                ul.find('.hidden').removeClass('hidden')
+                return
+            }
 
-        attachments.forEach(attachment => {
-            const li = liTemplate.cloneNode(true)
-            const attachmentLink = $(li).find('a')[0]
+            const liTemplate = $('#attachments-list-item')[0].content
 
-            attachmentLink.href = attachment.url
-            attachmentLink.innerText = attachment.url.split('/').slice(-1)[0]
-            ul.append(li)
-        })
-    })
+            attachments.forEach(attachment => {
+                const li = liTemplate.cloneNode(true)
+                const attachmentLink = $(li).find('a')[0]
 
-    jsonRPC('TestExecution.history', testExecution.id, history => {
-        const historyContainer = container.find('.history-container')
-        history.forEach(h => {
-            historyContainer.append(renderHistoryEntry(h))
-        })
-    })
+                attachmentLink.href = attachment.url
+                attachmentLink.innerText = attachment.url.split('/').slice(-1)[0]
+                ul.append(li)
+            })
+        }],
+        ['TestExecution.history', testExecution.id, history => {
+            const historyContainer = container.find('.history-container')
+            history.forEach(h => {
+                historyContainer.append(renderHistoryEntry(h))
+            })
+        }]
+    ])
 }
 
 function addCommentToExecution (testExecution, input, handler) {
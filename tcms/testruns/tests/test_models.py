@@ -8,6 +8,7 @@ from django.utils.translation import gettext_lazy as _
 from mock import patch
 from parameterized import parameterized
 
+from tcms.core.models import OutgoingEmail
 from tcms.tests import BaseCaseRun
 from tcms.tests.factories import TestCaseFactory, TestExecutionFactory, TestRunFactory
 
@@ -25,7 +26,11 @@ class Test_TestRun(BaseCaseRun):  # pylint: disable=invalid-name
 
     @patch("tcms.core.utils.mailto.send_mail")
     def test_send_mail_after_test_run_creation(self, send_mail):
-        test_run = TestRunFactory(plan=self.plan)
+        # notifications queued while creating test data
+        OutgoingEmail.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            test_run = TestRunFactory(plan=self.plan)
 
         recipients = test_run.get_notify_addrs()
 
@@ -54,6 +59,27 @@ class TestRunMethods(test.TestCase):
             self.assertEqual(execution.status.weight, 0)
             self.assertEqual(execution.status.name, _("IDLE"))
 
+    def test_create_executions_in_bulk(self):
+        test_case = TestCaseFactory()
+        test_case.save()
+
+        executions = self.test_run.create_executions(
+            [self.test_case, test_case], sortkeys={test_case.pk: 20}
+        )
+
+        self.assertEqual(2, len(executions))
+        for execution, case, sortkey in zip(
+            executions, [self.test_case, test_case], [0, 20]
+        ):
+            execution.refresh_from_db()
+            self.assertEqual(execution.case, case)
+            self.assertEqual(execution.sortkey, sortkey)
+            self.assertEqual(execution.status.weight, 0)
+            self.assertEqual(
+                execution.case_text_version, case.history.latest().history_id
+            )
+            self.assertEqual(1, execution.history.count())
+
 
 class TestExecutionActualDuration(TestCase):
     @parameterized.expand(
@@ -2,7 +2,6 @@
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import permission_required
-from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpResponseRedirect
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
@@ -80,24 +79,23 @@ class NewTestRunView(View):
             ):
                 test_run.property_set.create(name=prop.name, value=prop.value)
 
-            loop = 1
-
-            for case in form.cleaned_data["case"]:
-                try:
-                    tcp = TestCasePlan.objects.get(
-                        plan=form.cleaned_data["plan"], case=case
-                    )
-                    sortkey = tcp.sortkey
-                except ObjectDoesNotExist:
-                    sortkey = loop * 10
-
-                test_run.create_execution(
-                    case=case,
-                    assignee=form.cleaned_data["default_tester"],
-                    sortkey=sortkey,
-                    matrix_type=form.cleaned_data["matrix_type"],
-                )
-                loop += 1
+            cases = list(form.cleaned_data["case"])
+            plan_sortkeys = dict(
+                TestCasePlan.objects.filter(
+                    plan=form.cleaned_data["plan"], case__in=cases
+                ).values_list("case", "sortkey")
+            )
+
+            sortkeys = {}
+            for loop, case in enumerate(cases, 1):
+                sortkeys[case.pk] = plan_sortkeys.get(case.pk, loop * 10)
+
+            test_run.create_executions(
+                cases,
+                assignee=form.cleaned_data["default_tester"],
+                sortkeys=sortkeys,
+                matrix_type=form.cleaned_data["matrix_type"],
+            )
 
             return HttpResponseRedirect(
                 reverse(
@@ -1,11 +1,25 @@
 import html
+import json
 from datetime import timedelta
 from unittest import TestCase
 from unittest.mock import patch
 
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.test import RequestFactory
+from modernrpc.exceptions import RPCInternalError
 
+from tcms.core.models import OutgoingEmail
 from tcms.handlers import KiwiTCMSJsonRpcHandler, KiwiTCMSXmlRpcHandler
+from tcms.tests import LoggedInTestCase, user_should_have_perm
+from tcms.tests.factories import (
+    BuildFactory,
+    TagFactory,
+    TestPlanFactory,
+    TestRunFactory,
+    UserFactory,
+)
 
 
 class TestKiwiTCMSJsonRpcHandler(TestCase):
@@ -71,6 +85,137 @@ class TestKiwiTCMSJsonRpcHandler(TestCase):
                 [{"duration": 3600.0}],
             )
 
+    def test_long_list_result_is_streamed(self):
+        self.rpc_handler.request_id = 7
+        rows = []
+        for pk in range(250):
+            rows.append({"id": pk, "summary": f"<b>{pk}</b>"})
+
+        with patch(self.base_exec_procedure, return_value=rows):
+            response = self.rpc_handler.result_success(
+                self.rpc_handler.execute_procedure("method_name")
+            )
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "application/json")
+        payload = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(payload["id"], 7)
+        self.assertEqual(payload["jsonrpc"], "2.0")
+        self.assertEqual(len(payload["result"]), 250)
+        self.assertEqual(
+            payload["result"][249], {"id": 249, "summary": "&lt;b&gt;249&lt;/b&gt;"}
+        )
+
+    def test_short_list_result_is_not_streamed(self):
+        self.rpc_handler.request_id = 1
+        response = self.rpc_handler.result_success([])
+
+        self.assertNotIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(
+            json.loads(response.content),
+            {"id": 1, "jsonrpc": "2.0", "result": []},
+        )
+
+    def test_error_before_first_chunk_is_raised(self):
+        self.rpc_handler.request_id = 1
+        rows = [object()] + list(range(200))
+
+        # reported as a JSON-RPC error by the view
+        with self.assertRaisesRegex(RPCInternalError, "Unable to serialize"):
+            self.rpc_handler.result_success(rows)
+
+    def test_error_while_streaming_truncates_payload(self):
+        self.rpc_handler.request_id = 1
+        rows = list(range(150)) + [object()] + list(range(100))
+        response = self.rpc_handler.result_success(rows)
+
+        with self.assertLogs("tcms.handlers", level="ERROR"):
+            content = b"".join(response.streaming_content)
+
+        with self.assertRaises(ValueError):
+            json.loads(content)
+        self.assertNotIn(b'"error"', content)
+
+
+class TestJsonRpcBatchRequest(LoggedInTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        user_should_have_perm(cls.tester, "management.view_tag")
+        cls.tag = TagFactory(name="<batch>")
+
+    def post_batch(self, calls):
+        payload = []
+        for index, (method, params) in enumerate(calls):
+            payload.append(
+                {"jsonrpc": "2.0", "method": method, "params": params, "id": index + 1}
+            )
+
+        response = self.client.post(
+            "/json-rpc/", json.dumps(payload), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        results = {}
+        for result in json.loads(response.content):
+            results[result["id"]] = result
+        return results
+
+    def test_batch_results_match_request_ids(self):
+        results = self.post_batch(
+            [
+                ("Tag.filter", [{"pk": self.tag.pk}]),
+                ("Tag.filter", [{"non_existing_field": 1}]),
+                ("KiwiTCMS.version", []),
+                ("Tag.filter", [{"name": "<batch>"}]),
+            ]
+        )
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[1]["result"][0]["name"], "&lt;batch&gt;")
+        self.assertIn("error", results[2])
+        self.assertIn("result", results[3])
+        self.assertEqual(results[4]["result"][0]["id"], self.tag.pk)
+
+    def test_only_batches_are_atomic(self):
+        with patch(
+            "tcms.handlers.transaction.atomic", wraps=transaction.atomic
+        ) as atomic:
+            response = self.client.post(
+                "/json-rpc/",
+                json.dumps({"jsonrpc": "2.0", "method": "KiwiTCMS.version", "id": 1}),
+                content_type="application/json",
+            )
+            self.assertIn("result", json.loads(response.content))
+            atomic.assert_not_called()
+
+            self.post_batch([("KiwiTCMS.version", []), ("KiwiTCMS.version", [])])
+            # the batch and a savepoint for each call
+            self.assertEqual(atomic.call_count, 3)
+
+    def test_recipients_are_not_cached_across_calls(self):
+        plan = TestPlanFactory()
+        test_run = TestRunFactory(
+            plan=plan, build=BuildFactory(version=plan.product_version)
+        )
+        cc_user = UserFactory()
+
+        with patch.object(get_user_model(), "has_perms", return_value=True):
+            results = self.post_batch(
+                [
+                    ("TestRun.update", [test_run.pk, {"summary": "First"}]),
+                    ("TestRun.add_cc", [test_run.pk, cc_user.username]),
+                    ("TestRun.update", [test_run.pk, {"summary": "Second"}]),
+                ]
+            )
+
+        for result in results.values():
+            self.assertNotIn("error", result)
+
+        emails = OutgoingEmail.objects.order_by("pk")
+        self.assertNotIn(cc_user.email, emails.first().recipients)
+        self.assertIn(cc_user.email, emails.last().recipients)
+
 
 class TestKiwiTCMSXmlRpcHandler(TestCase):
     @classmethod